@@ -0,0 +1,35 @@
+"""
+Serial vs. concurrent per-symbol fetching in `BinanceDataLoader.load_data`
+against a fake exchange client with injected latency.
+
+    python -m benchmarks.binance_fetch
+"""
+import time
+
+from binance import enums
+
+import constants
+from src.dataloaders.exchange import BinanceDataLoader
+from tests.fakes import FakeExchangeClient
+
+LATENCY = 0.25  # seconds per request
+START = 1672531200000  # 2023-01-01
+END = START + 24 * 60 * 60 * 1000  # One day
+
+
+def run(max_workers: int) -> float:
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=[constants.ASSET_TO_TRADE] + constants.PREDICTOR_ASSETS,
+        fiat=constants.FIAT_TO_TRADE,
+        exchange_client=FakeExchangeClient(latency=LATENCY),
+        max_workers=max_workers,
+    )
+    start_time = time.perf_counter()
+    dataloader.load_data(START, END)
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    for max_workers in (1, 2, 5):
+        print(f"max_workers={max_workers}: {run(max_workers):.2f}s")
@@ -0,0 +1,39 @@
+"""
+Catch-up throughput of `FeatureService`, e.g. after a restart: adding the
+missed rows one by one with `add_value` vs. at once with `add_values`.
+
+    python -m benchmarks.catch_up
+"""
+import time
+
+import numpy as np
+
+from benchmarks.latest_values import build_feature_service, generate_data
+
+N_HISTORY = 10_000
+
+if __name__ == "__main__":
+    for n_rows in (100, 1_000, 10_000):
+        data = generate_data(N_HISTORY + n_rows)
+        history, missed = data.iloc[:N_HISTORY], data.iloc[N_HISTORY:]
+        one_by_one = build_feature_service()
+        one_by_one.initialize(history)
+        at_once = build_feature_service()
+        at_once.initialize(history)
+
+        start_time = time.perf_counter()
+        for _, row in missed.iterrows():
+            one_by_one.add_value(row, purging=True)
+        one_by_one_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        at_once.add_values(missed, purging=True)
+        at_once_time = time.perf_counter() - start_time
+
+        np.testing.assert_allclose(
+            at_once.to_array(np.float64), one_by_one.to_array(np.float64)
+        )
+        print(
+            f"rows={n_rows:>7,}: add_value "
+            f"{n_rows / one_by_one_time:>11,.0f} rows/s | add_values "
+            f"{n_rows / at_once_time:>11,.0f} rows/s"
+        )
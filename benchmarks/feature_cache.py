@@ -0,0 +1,38 @@
+"""
+`FeatureService.initialize` of 60 generators over 5 symbols without a cache,
+with an empty `FeatureCache`, with a filled one, and with new rows without
+and with the cache.
+
+    python -m benchmarks.feature_cache
+"""
+import tempfile
+import time
+
+from benchmarks.parallel_initialize import (
+    N_ROWS,
+    build_feature_generators,
+    generate_data,
+)
+from src.features.feature_cache import FeatureCache
+from src.features.feature_service import FeatureService
+
+N_NEW_ROWS = 1_440
+
+
+def time_initialize(data, cache=None) -> float:
+    feature_service = FeatureService(*build_feature_generators(), cache=cache)
+    start_time = time.perf_counter()
+    feature_service.initialize(data)
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    data = generate_data(N_ROWS + N_NEW_ROWS)
+    history = data.iloc[:N_ROWS]
+    print(f"no cache:  {time_initialize(history):6.2f}s")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = FeatureCache(tmp_dir)
+        print(f"first run: {time_initialize(history, cache):6.2f}s")
+        print(f"same data: {time_initialize(history, cache):6.2f}s")
+        print(f"new rows:  {time_initialize(data, cache):6.2f}s")
+    print(f"new rows without cache: {time_initialize(data):6.2f}s")
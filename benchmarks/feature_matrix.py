@@ -0,0 +1,43 @@
+"""
+Building the feature matrix for training: `FeatureService.output_values`
+through a data frame vs. `FeatureService.to_array()`, by time and peak
+memory.
+
+    python -m benchmarks.feature_matrix
+"""
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.latest_values import build_feature_service, generate_data
+
+
+def measure(build):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    output = build()
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, elapsed, peak
+
+
+if __name__ == "__main__":
+    for n_rows in (10_000, 100_000):
+        feature_service = build_feature_service()
+        feature_service.initialize(generate_data(n_rows))
+        from_frame, frame_time, frame_peak = measure(
+            lambda: pd.DataFrame(feature_service.output_values).to_numpy(
+                dtype=np.float32
+            )
+        )
+        array, array_time, array_peak = measure(feature_service.to_array)
+        np.testing.assert_array_equal(array, from_frame)
+        print(
+            f"rows={n_rows:>9,}: matrix {array.nbytes / 2**20:6.1f}MiB | "
+            f"data frame {frame_time:6.2f}s, peak "
+            f"{frame_peak / 2**20:7.1f}MiB | to_array {array_time:6.2f}s, "
+            f"peak {array_peak / 2**20:7.1f}MiB"
+        )
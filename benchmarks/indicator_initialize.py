@@ -0,0 +1,90 @@
+"""
+Initializing the technical indicators on a long history: feeding it through
+talipp one value at a time, as `initialize` used to, vs. the vectorized
+`initialize` of the feature generators.
+
+    python -m benchmarks.indicator_initialize [n_rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from talipp.ohlcv import OHLCVFactory
+
+from src.features.feature_generators.technical_indicators import (
+    ATR,
+    BB,
+    BBP,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+    VWAP,
+)
+
+N_ROWS = 1_000_000
+
+GENERATORS = [
+    EMA(input_col="close", period=50),
+    SMA(input_col="close", period=50),
+    RSI(input_col="close"),
+    MACD(input_col="close"),
+    BB(input_col="close"),
+    BBP(input_col="close"),
+    ATR(high_col="high", low_col="low", close_col="close"),
+    OBV(close_col="close", volume_col="volume"),
+    VWAP(
+        high_col="high",
+        low_col="low",
+        close_col="close",
+        volume_col="volume",
+    ),
+]
+
+
+def generate_data(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 1000 + rng.normal(size=n_rows).cumsum()
+    return pd.DataFrame(
+        {
+            "high": close + rng.uniform(0, 1, size=n_rows),
+            "low": close - rng.uniform(0, 1, size=n_rows),
+            "close": close,
+            "volume": rng.uniform(0, 10, size=n_rows),
+        }
+    )
+
+
+def initialize_with_talipp(generator, data: pd.DataFrame) -> None:
+    """The former `initialize`: feed all rows through the talipp indicator."""
+    generator.initialize(data.iloc[:0])
+    if hasattr(generator, "input_col"):
+        input_values = data[generator.input_col]
+    else:
+        input_values = OHLCVFactory.from_dict(
+            {col: data[col] for col in ("high", "low", "close", "volume")}
+        )
+    generator.talipp_instance.initialize(input_values)
+
+
+def timed(func) -> float:
+    start_time = time.perf_counter()
+    func()
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    data = generate_data(n_rows)
+    print(f"{n_rows:,} rows")
+    for generator in GENERATORS:
+        talipp_time = timed(lambda: initialize_with_talipp(generator, data))
+        generator.talipp_instance = None  # Not to time freeing it
+        vectorized_time = timed(lambda: generator.initialize(data))
+        print(
+            f"{generator.name:<45} talipp: {talipp_time:7.2f}s  "
+            f"vectorized: {vectorized_time:6.2f}s  "
+            f"({talipp_time / vectorized_time:.0f}x)"
+        )
@@ -0,0 +1,97 @@
+"""
+Per-tick cost of reading the newest feature vector after `add_value`: the
+last row of `FeatureService.output_values` vs. `latest_values()`, for
+growing history lengths.
+
+    python -m benchmarks.latest_values
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.feature_generators.datetime import DateTime
+from src.features.feature_generators.technical_indicators import (
+    ATR,
+    BB,
+    BBP,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+    VWAP,
+)
+from src.features.feature_service import FeatureService
+
+N_TICKS = 20
+START = 1672531200000  # 2023-01-01
+
+
+def generate_data(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 1000 + rng.normal(size=n_rows).cumsum()
+    return pd.DataFrame(
+        {
+            "open_timestamp": START + 60_000 * np.arange(n_rows),
+            "high": close + rng.uniform(0, 1, size=n_rows),
+            "low": close - rng.uniform(0, 1, size=n_rows),
+            "close": close,
+            "volume": rng.uniform(0, 10, size=n_rows),
+        }
+    )
+
+
+def build_feature_service() -> FeatureService:
+    return FeatureService(
+        *[EMA(input_col="close", period=p) for p in (9, 21, 50)],
+        *[SMA(input_col="close", period=p) for p in (9, 21, 50)],
+        RSI(input_col="close"),
+        MACD(input_col="close"),
+        BB(input_col="close"),
+        BBP(input_col="close"),
+        ATR(high_col="high", low_col="low", close_col="close"),
+        OBV(close_col="close", volume_col="volume"),
+        VWAP(
+            high_col="high",
+            low_col="low",
+            close_col="close",
+            volume_col="volume",
+        ),
+        DateTime(timestamp_col="open_timestamp"),
+    )
+
+
+def time_per_tick(feature_service, rows, read) -> float:
+    elapsed = 0.0
+    for _, row in rows.iterrows():
+        feature_service.add_value(row, purging=True)
+        start_time = time.perf_counter()
+        read()
+        elapsed += time.perf_counter() - start_time
+    return elapsed / len(rows)
+
+
+if __name__ == "__main__":
+    for n_rows in (1_000, 10_000, 100_000):
+        data = generate_data(n_rows + 2 * N_TICKS)
+        history = data.iloc[:n_rows]
+        feature_service = build_feature_service()
+        feature_service.initialize(history)
+        full = time_per_tick(
+            feature_service,
+            data.iloc[n_rows : n_rows + N_TICKS],
+            lambda: {
+                name: values[-1]
+                for name, values in feature_service.output_values.items()
+            },
+        )
+        latest = time_per_tick(
+            feature_service,
+            data.iloc[n_rows + N_TICKS :],
+            feature_service.latest_values,
+        )
+        print(
+            f"history={n_rows:>7,}: output_values {full * 1000:8.2f}ms, "
+            f"latest_values {latest * 1000:6.3f}ms per tick"
+        )
@@ -0,0 +1,81 @@
+"""
+Throughput of `MediaStackNewsClient` against a local stub of the MediaStack
+API with injected latency: a new connection per request, as the client used
+to do, vs. pooled keep-alive connections, serially and from several threads.
+
+    python -m benchmarks.mediastack_client
+"""
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from clients.news import MediaStackNewsClient
+
+LATENCY = 0.005  # seconds per request
+N_REQUESTS = 400
+BODY = json.dumps({"data": [{"title": "News"}] * 100}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send the headers and body in one go, like a real server
+    wbufsize = -1
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def get_data(client: MediaStackNewsClient, i: int) -> list:
+    return client.get_data(
+        date=f"2023-01-{i % 28 + 1:02}",
+        keywords=["bitcoin"],
+        limit=100,
+        language="en",
+        sort_by="popularity",
+    )
+
+
+def run_unpooled(port: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(N_REQUESTS):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", "/v1/news")
+        json.loads(connection.getresponse().read())
+        connection.close()
+    return time.perf_counter() - start_time
+
+
+def run_pooled(port: int, n_threads: int) -> float:
+    client = MediaStackNewsClient(
+        access_key="key", host="127.0.0.1", port=port, pool_size=n_threads
+    )
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list(executor.map(lambda i: get_data(client, i), range(N_REQUESTS)))
+    elapsed = time.perf_counter() - start_time
+    client.pool.close()
+    return elapsed
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    elapsed = run_unpooled(port)
+    print(f"new connection per request: {N_REQUESTS / elapsed:.0f} req/s")
+    for n_threads in (1, 4, 8):
+        elapsed = run_pooled(port, n_threads)
+        print(f"pooled, {n_threads} threads: {N_REQUESTS / elapsed:.0f} req/s")
+    server.shutdown()
@@ -0,0 +1,81 @@
+"""
+`FeatureService.initialize` of 60 generators over 5 symbols, serial vs. in a
+process pool of growing size.
+
+    python -m benchmarks.parallel_initialize
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features.feature_generators.technical_indicators import (
+    ATR,
+    BB,
+    BBP,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+)
+from src.features.feature_service import FeatureService
+
+N_ROWS = 200_000
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT"]
+
+
+def generate_data(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    columns = {}
+    for symbol in SYMBOLS:
+        close = 1000 + rng.normal(size=n_rows).cumsum()
+        columns[f"{symbol}_high"] = close + rng.uniform(0, 1, size=n_rows)
+        columns[f"{symbol}_low"] = close - rng.uniform(0, 1, size=n_rows)
+        columns[f"{symbol}_close"] = close
+        columns[f"{symbol}_volume"] = rng.uniform(0, 10, size=n_rows)
+    return pd.DataFrame(columns)
+
+
+def build_feature_generators():
+    for symbol in SYMBOLS:
+        close = f"{symbol}_close"
+        for period in (9, 21, 50):
+            yield EMA(input_col=close, period=period)
+            yield SMA(input_col=close, period=period)
+        yield MACD(input_col=close)
+        yield RSI(input_col=close)
+        yield BB(input_col=close)
+        yield BBP(input_col=close)
+        yield ATR(
+            high_col=f"{symbol}_high", low_col=f"{symbol}_low", close_col=close
+        )
+        yield OBV(close_col=close, volume_col=f"{symbol}_volume")
+
+
+def time_initialize(data: pd.DataFrame, max_workers: int) -> float:
+    feature_service = FeatureService(
+        *build_feature_generators(), max_workers=max_workers
+    )
+    start_time = time.perf_counter()
+    feature_service.initialize(data)
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    data = generate_data(N_ROWS)
+    n_cpus = os.cpu_count()
+    print(
+        f"{len(list(build_feature_generators()))} generators, {N_ROWS:,} rows"
+    )
+    serial = time_initialize(data, max_workers=1)
+    print(f"serial: {serial:6.2f}s")
+    for max_workers in sorted({2, 4, 8, n_cpus} - {1}):
+        if max_workers > n_cpus:
+            continue
+        elapsed = time_initialize(data, max_workers)
+        print(
+            f"max_workers={max_workers}: {elapsed:6.2f}s, "
+            f"{serial / elapsed:4.1f}x"
+        )
@@ -0,0 +1,88 @@
+"""
+Per-(column, symbol) pivots vs. the single wide pivot of
+`BinanceDataLoader.pivot_price_data` on multi-year 1-minute data.
+
+    python -m benchmarks.pivot_price_data [n_days]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from binance import enums
+
+import constants
+from src.dataloaders.exchange import BinanceDataLoader
+from tests.fakes import FakeExchangeClient
+
+N_DAYS = 2 * 365
+START = 1546300800000  # 2019-01-01
+
+
+def generate_long_data(
+    dataloader: BinanceDataLoader, n_rows: int
+) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    open_timestamps = START + 60_000 * np.arange(n_rows)
+    data = []
+    for symbol in dataloader.symbols:
+        data_for_symbol = pd.DataFrame(
+            {
+                col: rng.uniform(size=n_rows).astype(dtype)
+                for col, dtype in dataloader.exchange_client.dtypes.items()
+            }
+        )
+        data_for_symbol["open_timestamp"] = open_timestamps
+        data_for_symbol["symbol"] = symbol
+        data.append(data_for_symbol)
+    return pd.concat(data, ignore_index=True)
+
+
+def pivot_per_column(
+    dataloader: BinanceDataLoader, data: pd.DataFrame
+) -> pd.DataFrame:
+    # What `pivot_price_data` did before
+    cols = [
+        col
+        for col in dataloader.exchange_client.dtypes.keys()
+        if col not in ("open_timestamp", "close_timestamp")
+    ]
+    return pd.concat(
+        {
+            f"{asset}_{col}": data.pivot(
+                index="open_timestamp", columns="symbol", values=col
+            )[asset]
+            for col in cols
+            for asset in data["symbol"].unique()
+        },
+        axis=1,
+    ).reset_index()
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    output = fn(*args)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, elapsed, peak / 2**20
+
+
+if __name__ == "__main__":
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else N_DAYS
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=[constants.ASSET_TO_TRADE] + constants.PREDICTOR_ASSETS,
+        fiat=constants.FIAT_TO_TRADE,
+        exchange_client=FakeExchangeClient(),
+    )
+    data = generate_long_data(dataloader, n_rows=n_days * 24 * 60)
+    print(f"{n_days} days, {len(data):,} rows")
+
+    expected, old_time, old_peak = measure(pivot_per_column, dataloader, data)
+    output, new_time, new_peak = measure(dataloader.pivot_price_data, data)
+    pd.testing.assert_frame_equal(output, expected)
+    print(f"per column:   {old_time:.2f}s, peak {old_peak:,.0f} MiB")
+    print(f"single pivot: {new_time:.2f}s, peak {new_peak:,.0f} MiB")
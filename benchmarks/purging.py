@@ -0,0 +1,27 @@
+"""
+Per-tick cost of `FeatureService.add_value(row, purging=True)` on a rolling
+window, for growing window lengths. Rows are converted to dicts beforehand,
+so that only the generators are timed.
+
+    python -m benchmarks.purging
+"""
+import time
+
+from benchmarks.latest_values import build_feature_service, generate_data
+
+N_TICKS = 2_000
+
+if __name__ == "__main__":
+    for n_rows in (1_000, 10_000, 100_000):
+        data = generate_data(n_rows + N_TICKS)
+        feature_service = build_feature_service()
+        feature_service.initialize(data.iloc[:n_rows])
+        rows = data.iloc[n_rows:].to_dict("records")
+        start_time = time.perf_counter()
+        for row in rows:
+            feature_service.add_value(row, purging=True)
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"window={n_rows:>9,}: "
+            f"{1e6 * elapsed / len(rows):8.1f}us per tick"
+        )
@@ -0,0 +1,62 @@
+"""
+String-array parsing vs. typed column parsing of one day of raw klines in
+`BinanceDataLoader.read_raw_input_data`.
+
+    python -m benchmarks.read_raw_input_data
+"""
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from binance import enums
+
+from src.dataloaders.exchange import BinanceDataLoader
+from tests.fakes import FakeExchangeClient, generate_klines
+
+START = 1672531200000  # 2023-01-01
+END = START + 24 * 60 * 60 * 1000 - 1  # One day
+N_REPEATS = 20
+
+
+def read_via_string_array(
+    dataloader: BinanceDataLoader, input_data
+) -> pd.DataFrame:
+    # What `read_raw_input_data` did before
+    input_data = np.array(input_data)[:, :-1]
+    data = pd.DataFrame(
+        input_data, columns=dataloader.exchange_client.dtypes.keys()
+    )
+    return data.astype(dataloader.exchange_client.dtypes)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start_time = time.perf_counter()
+    for _ in range(N_REPEATS):
+        fn(*args)
+    return (time.perf_counter() - start_time) / N_REPEATS, peak / 2**20
+
+
+if __name__ == "__main__":
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["ETH"],
+        fiat="USDT",
+        exchange_client=FakeExchangeClient(),
+    )
+    input_data = generate_klines(START, END)
+
+    pd.testing.assert_frame_equal(
+        dataloader.read_raw_input_data(input_data),
+        read_via_string_array(dataloader, input_data),
+    )
+    for name, fn, args in (
+        ("string array", read_via_string_array, (dataloader, input_data)),
+        ("typed columns", dataloader.read_raw_input_data, (input_data,)),
+    ):
+        elapsed, peak = measure(fn, *args)
+        print(f"{name}: {elapsed * 1000:.1f}ms per day, peak {peak:.2f} MiB")
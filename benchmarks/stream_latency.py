@@ -0,0 +1,80 @@
+"""
+End-to-end latency of streaming ingestion: from the last kline event of an
+interval arriving to `FeatureService.add_value` returning, with stored
+candles replayed by a local `KlineReplayServer`.
+
+    python -m benchmarks.stream_latency [speed]
+"""
+import asyncio
+import sys
+import time
+
+import numpy as np
+from binance import enums
+
+import constants
+from clients.exchange import KlineReplayServer
+from src.dataloaders.exchange import BinanceDataLoader
+from src.features.feature_generators.technical_indicators import EMA, MACD, RSI
+from src.features.feature_service import FeatureService
+from tests.fakes import FakeExchangeClient
+
+START = 1672531200000  # 2023-01-01
+N_HISTORY = 2000
+N_STREAMED = 500
+
+
+class TimedFeatureService(FeatureService):
+    def __init__(self, *feature_generators):
+        super().__init__(*feature_generators)
+        self.last_event_time = None
+        self.latencies = []
+
+    def add_value(self, data_row, purging=False):
+        super().add_value(data_row, purging)
+        self.latencies.append(time.perf_counter() - self.last_event_time)
+
+
+async def timed(source, feature_service: TimedFeatureService):
+    async for message in source:
+        feature_service.last_event_time = time.perf_counter()
+        yield message
+
+
+if __name__ == "__main__":
+    speed = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=[constants.ASSET_TO_TRADE] + constants.PREDICTOR_ASSETS,
+        fiat=constants.FIAT_TO_TRADE,
+        exchange_client=FakeExchangeClient(),
+    )
+    data = dataloader.load_data(
+        START, START + (N_HISTORY + N_STREAMED) * 60 * 1000
+    )
+    feature_service = TimedFeatureService(
+        *[
+            generator(input_col=f"{symbol}_close")
+            for symbol in dataloader.symbols
+            for generator in (
+                lambda input_col: EMA(input_col=input_col, period=21),
+                RSI,
+                MACD,
+            )
+        ]
+    )
+    feature_service.initialize(data.iloc[:N_HISTORY])
+    server = KlineReplayServer(
+        data.iloc[N_HISTORY:], dataloader.symbols, speed=speed
+    )
+
+    asyncio.run(
+        dataloader.stream_data(timed(server, feature_service), feature_service)
+    )
+
+    latencies = np.array(feature_service.latencies) * 1000
+    print(f"{len(latencies)} candles streamed")
+    print(
+        f"latency: median {np.median(latencies):.2f}ms, "
+        f"p99 {np.percentile(latencies, 99):.2f}ms"
+    )
@@ -1,3 +1,5 @@
 from clients.exchange.binance import BinanceClient
+from clients.exchange.rate_limiter import RequestWeightLimiter
+from clients.exchange.replay import KlineReplayServer
 
-__all__ = ["BinanceClient"]
+__all__ = ["BinanceClient", "KlineReplayServer", "RequestWeightLimiter"]
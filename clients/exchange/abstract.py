@@ -7,3 +7,14 @@ class ExchangeClient(ABC):
     @abstractmethod
     def get_historic_prices(self, **kwargs):
         raise NotImplementedError()
+
+
+class StreamingExchangeClient(ExchangeClient):
+    """Abstract class for ExchangeClients that also stream klines, as
+    `BinanceDataLoader.stream_data` needs."""
+
+    @abstractmethod
+    def stream_klines(self, source, **kwargs):
+        """Asynchronously yield `(symbol, kline)` for every closed kline in
+        a stream of events."""
+        raise NotImplementedError()
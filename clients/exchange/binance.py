@@ -1,14 +1,40 @@
+import json
+import random
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    List,
+    Optional,
+    Tuple,
+)
+
+import requests
 from binance import enums
 from binance.client import Client
+from binance.exceptions import BinanceAPIException
+
+from clients.exchange.abstract import StreamingExchangeClient
+from clients.exchange.rate_limiter import RequestWeightLimiter
 
-from clients.exchange.abstract import ExchangeClient
+# Max number of klines per request, and its request weight
+KLINES_LIMIT = 1000
+KLINES_WEIGHT = 2
 
 
-class BinanceClient(ExchangeClient):
+class BinanceClient(StreamingExchangeClient):
     def __init__(
         self,
         api_key: str,
         api_secret: str,
+        rate_limiter: Optional[RequestWeightLimiter] = None,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        client: Optional[Client] = None,
     ):
         """
         Initialize BinanceClient instance.
@@ -19,8 +45,29 @@ class BinanceClient(ExchangeClient):
             API key for Binance.
         api_secret : str
             API secret for Binance.
+        rate_limiter : RequestWeightLimiter, optional
+            Limiter of the request weight. Pass the same instance to clients
+            that share an API key. By default, each client gets its own.
+        max_retries : int
+            How many times to retry a request that was throttled (HTTP
+            429/418), failed on the server (HTTP 5xx) or on the network.
+        backoff : float
+            Base delay in seconds of the exponential backoff between retries.
+            Every retry waits a random time up to `backoff * 2 ** attempt`.
+        max_backoff : float
+            Upper bound of the delay between retries, in seconds.
+        client : Client, optional
+            Preconfigured python-binance client, e.g. for the testnet.
         """
-        self.client = Client(api_key=api_key, api_secret=api_secret)
+        self.client = client or Client(api_key=api_key, api_secret=api_secret)
+        # python-binance keeps the last response of any thread, so keep the
+        # last one of every thread to read its headers
+        self.local = threading.local()
+        self.client.session.hooks["response"].append(self.record_response)
+        self.rate_limiter = rate_limiter or RequestWeightLimiter()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
         self.dtypes = {
             "open_timestamp": int,
             "open": float,
@@ -78,9 +125,116 @@ class BinanceClient(ExchangeClient):
         list
             Historical exchange rates for the given currency pair.
         """
-        return self.client.get_historical_klines(
-            symbol=symbol,
-            interval=interval,
-            start_str=start,
-            end_str=end,
+        klines = []
+        # Page through the klines, so that a failure only retries one page
+        while start <= end:
+            page = self.request(
+                self.client.get_klines,
+                weight=KLINES_WEIGHT,
+                symbol=symbol,
+                interval=interval,
+                startTime=start,
+                endTime=end,
+                limit=KLINES_LIMIT,
+            )
+            klines.extend(page)
+            if len(page) < KLINES_LIMIT:
+                break
+            start = page[-1][0] + 1
+        return klines
+
+    def record_response(
+        self, response: requests.Response, *args, **kwargs
+    ) -> None:
+        self.local.response = response
+
+    def request(self, method: Callable, weight: int, **params) -> Any:
+        """Call a python-binance `method` within the request weight limit,
+        retrying with jittered exponential backoff on throttling, server and
+        network errors."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(weight)
+            try:
+                response = method(**params)
+            except BinanceAPIException as e:
+                if e.status_code in (418, 429):
+                    retry_after = e.response.headers.get("Retry-After")
+                    self.rate_limiter.on_throttled(
+                        float(retry_after) if retry_after else None
+                    )
+                elif e.status_code < 500:
+                    raise
+                if attempt == self.max_retries:
+                    raise
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ):
+                if attempt == self.max_retries:
+                    raise
+            else:
+                used_weight = self.local.response.headers.get(
+                    "X-MBX-USED-WEIGHT-1M"
+                )
+                self.rate_limiter.on_success(
+                    int(used_weight) if used_weight else None
+                )
+                return response
+            self.rate_limiter.on_retry()
+            time.sleep(
+                random.uniform(
+                    0, min(self.max_backoff, self.backoff * 2**attempt)
+                )
+            )
+
+    async def stream_klines(
+        self, source: AsyncIterable[Any]
+    ) -> AsyncIterator[Tuple[str, List]]:
+        """
+        Yield every closed kline from a stream of Binance kline events, such
+        as a websocket connection to
+        `wss://stream.binance.com:9443/stream?streams=ethusdt@kline_1m`.
+
+        Parameters
+        ----------
+        source : AsyncIterable
+            Kline events, as JSON strings or already decoded dicts.
+
+        Yields
+        ------
+        Tuple with the symbol, like `ETHUSDT`, and the kline in the same
+        format as the ones returned by `get_historic_prices`.
+        """
+        async for message in source:
+            kline = self.parse_kline_event(message)
+            if kline is not None:
+                yield kline
+
+    @staticmethod
+    def parse_kline_event(message: Any) -> Optional[Tuple[str, List]]:
+        """Parse a kline event into `(symbol, kline)`. Returns `None` for
+        klines that have not closed yet."""
+        event = (
+            json.loads(message)
+            if isinstance(message, (str, bytes))
+            else message
         )
+        # Combined streams wrap the event as {"stream": ..., "data": event}
+        event = event.get("data", event)
+        kline = event["k"]
+        if not kline["x"]:
+            return None
+        return event["s"], [
+            kline["t"],
+            kline["o"],
+            kline["h"],
+            kline["l"],
+            kline["c"],
+            kline["v"],
+            kline["T"],
+            kline["q"],
+            kline["n"],
+            kline["V"],
+            kline["Q"],
+            kline["B"],
+        ]
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RequestWeightLimiter:
+    def __init__(
+        self,
+        weight_per_minute: int = 6000,
+        safety_margin: float = 0.9,
+        min_rate_fraction: float = 0.05,
+    ):
+        """
+        Thread-safe token bucket over the request weight that Binance allows
+        per minute. Share one instance between all the callers that use the
+        same API key.
+
+        The bucket refills at `weight_per_minute` per minute. When the server
+        throttles (HTTP 429/418), the refill rate is halved and no request is
+        let through until the `Retry-After` delay has passed. Every
+        successful request then recovers the rate additively.
+
+        Parameters
+        ----------
+        weight_per_minute : int
+            Request weight limit of the API key per minute.
+        safety_margin : float
+            Fraction of the limit to use, leaving room for other clients.
+        min_rate_fraction : float
+            Lowest fraction of the full rate that throttling can go down to.
+        """
+        self.capacity = weight_per_minute * safety_margin
+        self.max_rate = self.capacity / 60  # Weight per second
+        self.min_rate = self.max_rate * min_rate_fraction
+        self.rate = self.max_rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.n_requests = 0
+        self.n_waits = 0
+        self.wait_time = 0.0
+        self.n_retries = 0
+        self.n_throttled = 0
+
+    def acquire(self, weight: int) -> None:
+        """Block until the request `weight` is available and take it."""
+        waited = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.refill(now)
+                if now >= self.paused_until and self.tokens >= weight:
+                    self.tokens -= weight
+                    self.n_requests += 1
+                    return
+                delay = max(
+                    self.paused_until - now,
+                    (weight - self.tokens) / self.rate,
+                )
+                if not waited:
+                    self.n_waits += 1
+                    waited = True
+                self.wait_time += delay
+            time.sleep(delay)
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def on_success(self, used_weight: Optional[int] = None) -> None:
+        """Recover the rate and, if known, sync with the weight the server
+        reports as used (`X-MBX-USED-WEIGHT-1M` header)."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + 0.01 * self.max_rate)
+            if used_weight is not None:
+                self.tokens = min(self.tokens, self.capacity - used_weight)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after the server rejected a request for exceeding the
+        limit."""
+        with self.lock:
+            self.n_throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after is not None:
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + retry_after
+                )
+
+    def on_retry(self) -> None:
+        with self.lock:
+            self.n_retries += 1
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.n_requests,
+            "waits": self.n_waits,
+            "wait_time": self.wait_time,
+            "retries": self.n_retries,
+            "throttled": self.n_throttled,
+        }
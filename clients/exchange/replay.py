@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, List, Optional
+
+import pandas as pd
+from binance import enums
+
+
+class KlineReplayServer:
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        symbols: List[str],
+        speed: Optional[float] = None,
+        interval: str = enums.KLINE_INTERVAL_1MINUTE,
+        interval_ms: int = 60 * 1000,
+    ):
+        """
+        Local stand-in for the Binance kline websocket stream. Replays stored
+        candlesticks, as loaded by `BinanceDataLoader` or `CandleStore`, as
+        closed kline events in the Binance format. Intervals marked as
+        `service_down` are skipped, like a real stream would.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Candlesticks with `open_timestamp` and `{symbol}_{col}` columns.
+        symbols : List[str]
+            Symbols to replay, like `["ETHUSDT", "BTCUSDT"]`.
+        speed : float, optional
+            How many times faster than real time to replay, e.g. `60` replays
+            one 1-minute candle per second. By default, as fast as possible.
+        interval : str
+            Candlestick interval, one of `binance.enums`.
+        interval_ms : int
+            Length of the interval in milliseconds.
+
+        Example
+        -------
+            server = KlineReplayServer.from_parquet("data/binance", symbols)
+            async for message in server:
+                ...
+        """
+        self.data = data.sort_values("open_timestamp", ignore_index=True)
+        self.symbols = symbols
+        self.speed = speed
+        self.interval = interval
+        self.interval_ms = interval_ms
+
+    @classmethod
+    def from_parquet(
+        cls, path: str, symbols: List[str], **kwargs
+    ) -> "KlineReplayServer":
+        return cls(pd.read_parquet(path), symbols, **kwargs)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        delay = (
+            0 if self.speed is None else self.interval_ms / 1000 / self.speed
+        )
+        cols = self.data.columns.tolist()
+        for row in self.data.itertuples(index=False, name=None):
+            row = dict(zip(cols, row))
+            if row.get("service_down", False):
+                continue
+            for symbol in self.symbols:
+                yield json.dumps(self.to_kline_event(row, symbol))
+            await asyncio.sleep(delay)
+
+    def to_kline_event(self, row: dict, symbol: str) -> dict:
+        open_timestamp = int(row["open_timestamp"])
+        return {
+            "e": "kline",
+            "E": int(time.time() * 1000),
+            "s": symbol,
+            "k": {
+                "t": open_timestamp,
+                "T": open_timestamp + self.interval_ms - 1,
+                "s": symbol,
+                "i": self.interval,
+                "o": str(row[f"{symbol}_open"]),
+                "c": str(row[f"{symbol}_close"]),
+                "h": str(row[f"{symbol}_high"]),
+                "l": str(row[f"{symbol}_low"]),
+                "v": str(row[f"{symbol}_volume"]),
+                "n": int(row[f"{symbol}_number_of_trades"]),
+                "x": True,
+                "q": str(row[f"{symbol}_quote_asset_volume"]),
+                "V": str(row[f"{symbol}_taker_buy_base_asset_volume"]),
+                "Q": str(row[f"{symbol}_taker_buy_quote_asset_volume"]),
+                "B": "0",
+            },
+        }
@@ -1,3 +1,4 @@
+from clients.news.connection_pool import HTTPConnectionPool
 from clients.news.mediastack import MediaStackNewsClient
 
-__all__ = ["MediaStackNewsClient"]
+__all__ = ["HTTPConnectionPool", "MediaStackNewsClient"]
@@ -0,0 +1,112 @@
+import http.client
+import queue
+import socket
+import threading
+from typing import Optional, Tuple
+
+# Errors after which a connection is dropped and the request is retried on a
+# new one, e.g. when the server closed an idle keep-alive socket.
+RECONNECT_ERRORS = (
+    http.client.HTTPException,
+    ConnectionError,
+    socket.timeout,
+)
+
+
+class HTTPConnectionPool:
+    def __init__(
+        self,
+        host: str,
+        port: Optional[int] = None,
+        https: bool = False,
+        max_size: int = 4,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+    ):
+        """
+        Thread-safe pool of keep-alive `http.client` connections to one host.
+
+        Each request takes an idle connection, or opens a new one, and gives
+        it back once the response is read. A connection that fails is closed
+        and the request is retried on a fresh one.
+
+        Parameters
+        ----------
+        host : str
+            Host name, like `api.mediastack.com`.
+        port : int, optional
+            Port. By default, 80 for HTTP and 443 for HTTPS.
+        https : bool
+            Whether to connect with TLS.
+        max_size : int
+            Max number of idle connections to keep around. More threads can
+            still make requests at once, the extra connections are closed.
+        timeout : float
+            Timeout of connecting and of every socket read, in seconds.
+        max_retries : int
+            How many times to retry a request on a new connection.
+        """
+        self.host = host
+        self.port = port
+        self.https = https
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.idle = queue.LifoQueue(maxsize=max_size)
+        # Guards the counters, which every thread updates
+        self.lock = threading.Lock()
+        self.n_connections = 0
+        self.n_reconnects = 0
+
+    def request(self, method: str, url: str) -> Tuple[int, bytes]:
+        """Send a request and read the whole response.
+
+        Returns
+        -------
+        Status code and body of the response.
+        """
+        for attempt in range(self.max_retries + 1):
+            connection = self.get_connection()
+            try:
+                connection.request(method, url)
+                response = connection.getresponse()
+                body = response.read()
+            except RECONNECT_ERRORS:
+                connection.close()
+                if attempt == self.max_retries:
+                    raise
+                with self.lock:
+                    self.n_reconnects += 1
+                continue
+            if response.will_close:
+                connection.close()
+            else:
+                self.put_connection(connection)
+            return response.status, body
+
+    def get_connection(self) -> http.client.HTTPConnection:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                self.n_connections += 1
+            connection_class = (
+                http.client.HTTPSConnection
+                if self.https
+                else http.client.HTTPConnection
+            )
+            return connection_class(
+                self.host, port=self.port, timeout=self.timeout
+            )
+
+    def put_connection(self, connection: http.client.HTTPConnection) -> None:
+        try:
+            self.idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
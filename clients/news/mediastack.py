@@ -1,15 +1,50 @@
-import http.client
 import json
 import urllib.parse
-from typing import List
+from typing import List, Optional
 
 from clients.news.abstract import NewsClient
+from clients.news.connection_pool import HTTPConnectionPool
 
 
 class MediaStackNewsClient(NewsClient):
-    def __init__(self, access_key: str):
+    def __init__(
+        self,
+        access_key: str,
+        host: str = "api.mediastack.com",
+        port: Optional[int] = None,
+        pool_size: int = 4,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+    ):
+        """
+        Thread-safe client of the MediaStack news API. Connections are kept
+        alive and shared through an `HTTPConnectionPool`, so it can be used
+        by `MediaStackNewsScraper` with `max_workers > 1`.
+
+        Parameters
+        ----------
+        access_key : str
+            API access key.
+        host : str
+            API host.
+        port : int, optional
+            API port. By default, 80.
+        pool_size : int
+            Number of keep-alive connections to reuse. Match it to the
+            number of threads that use the client.
+        timeout : float
+            Per-request timeout in seconds.
+        max_retries : int
+            How many times to reconnect and retry a failed request.
+        """
         self.access_key = access_key
-        self.connection = http.client.HTTPConnection("api.mediastack.com")
+        self.pool = HTTPConnectionPool(
+            host=host,
+            port=port,
+            max_size=pool_size,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
 
     def get_data(
         self,
@@ -64,7 +99,5 @@ class MediaStackNewsClient(NewsClient):
                 "sort": sort_by,
             }
         )
-        self.connection.request("GET", f"/v1/news?{params}")
-        response = self.connection.getresponse()
-        bytes_data = response.read()
+        _, bytes_data = self.pool.request("GET", f"/v1/news?{params}")
         return json.loads(bytes_data)["data"]
@@ -1,27 +1,47 @@
+import functools
+import hashlib
+import io
 import os
-from typing import BinaryIO
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 
 import constants
 from clients import ENV
 
+MB = 1024**2
+
+# Objects above the threshold are transferred in parts, several at a time.
+# Memory use is bounded by the number of parts in flight, not the file size.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * MB,
+    multipart_chunksize=16 * MB,
+    max_concurrency=8,
+    use_threads=True,
+)
+
 
 def upload(
-    serialized_data: bytes,
+    serialized_data: Union[bytes, BinaryIO],
     s3_path: str,
     env: str,
     bucket_name: str = constants.S3_BUCKET_NAME,
 ) -> None:
     """
     Upload serialized data to an S3 bucket at a specified path. The file is to be
-        uploaded from the memory directly, without saving it to disk.
+        uploaded from the memory directly, without saving it to disk. Large
+        objects are uploaded in parallel parts, see `TRANSFER_CONFIG`.
 
     Parameters
     ----------
-    serialized_data: Any
+    serialized_data: bytes or file-like object
         Serialized data (e.g. model, table) to upload to S3. The object to upload has
-        to be converted to byte stream first, examples below.
+        to be converted to byte stream first, examples below. An open binary
+        file is streamed from instead.
     s3_path: str
         Path within the S3 bucket to store the data.
     env: str
@@ -54,24 +74,39 @@ def upload(
 
     """
     _validate_env(env)
-    session = _get_session()
-    s3 = session.client("s3")
-    s3.put_object(
-        Body=serialized_data,
+    if isinstance(serialized_data, bytes):
+        serialized_data = io.BytesIO(serialized_data)
+    get_client().upload_fileobj(
+        serialized_data,
         Bucket=bucket_name,
         Key=os.path.join(env, s3_path),
-        ACL="bucket-owner-full-control",
+        ExtraArgs={"ACL": "bucket-owner-full-control"},
+        Config=TRANSFER_CONFIG,
     )
 
 
+def upload_file(
+    local_path: str,
+    s3_path: str,
+    env: str,
+    bucket_name: str = constants.S3_BUCKET_NAME,
+) -> None:
+    """Upload a local file, e.g. a large Parquet file or model artifact,
+    without reading it into memory. See `upload`."""
+    with open(local_path, "rb") as f:
+        upload(f, s3_path=s3_path, env=env, bucket_name=bucket_name)
+
+
 def download(
     s3_path: str,
     env: str,
     bucket_name: str = constants.S3_BUCKET_NAME,
-) -> BinaryIO:
+    fileobj: Optional[BinaryIO] = None,
+) -> Optional[bytes]:
     """
     Download a file from an S3 bucket to byte stream in memory. The downloaded file
-        has to be deserialized (examples below).
+        has to be deserialized (examples below). Large objects are downloaded
+        in parallel parts, see `TRANSFER_CONFIG`.
 
     Parameters
     ----------
@@ -81,9 +116,13 @@ def download(
         Environment. Can be either `dev` or `prod`.
     bucket_name: str
         Name of the S3 bucket to upload the file to.
+    fileobj: file-like object, optional
+        Binary file or buffer to stream the data into, chunk by chunk, instead
+        of returning it.
+
     Returns
     -------
-    Data as bytes stream.
+    Data as bytes stream, or `None` if written to `fileobj`.
 
     Examples
     --------
@@ -101,12 +140,227 @@ def download(
 
     """
     _validate_env(env)
-    session = _get_session()
-    s3 = session.client("s3")
-    response = s3.get_object(
-        Bucket=bucket_name, Key=os.path.join(env, s3_path)
+    if fileobj is None:
+        buffer = io.BytesIO()
+        download(s3_path, env, bucket_name, fileobj=buffer)
+        return buffer.getvalue()
+    get_client().download_fileobj(
+        Bucket=bucket_name,
+        Key=os.path.join(env, s3_path),
+        Fileobj=fileobj,
+        Config=TRANSFER_CONFIG,
+    )
+
+
+def download_file(
+    s3_path: str,
+    local_path: str,
+    env: str,
+    bucket_name: str = constants.S3_BUCKET_NAME,
+) -> None:
+    """Download to a local file with bounded memory. The file only appears
+    at `local_path` once complete. See `download`."""
+    _validate_env(env)
+    get_client().download_file(
+        Bucket=bucket_name,
+        Key=os.path.join(env, s3_path),
+        Filename=local_path,
+        Config=TRANSFER_CONFIG,
+    )
+
+
+def sync_up(
+    local_path: str,
+    s3_path: str,
+    env: str,
+    bucket_name: str = constants.S3_BUCKET_NAME,
+    max_workers: int = 8,
+) -> Dict[str, float]:
+    """
+    Upload the files of a local directory, like the `date=` partitions of a
+        `CandleStore`, that are missing or different on S3. Files are compared
+        by size and ETag, and transferred concurrently. Nothing is deleted.
+
+    Parameters
+    ----------
+    local_path: str
+        Local directory to upload.
+    s3_path: str
+        Path within the S3 bucket to mirror it to.
+    env: str
+        Environment. Can be either `dev` or `prod`.
+    bucket_name: str
+        Name of the S3 bucket.
+    max_workers: int
+        Number of files to transfer at once.
+
+    Returns
+    -------
+    Report of the number of files transferred and skipped, bytes, seconds and
+        bytes per second.
+
+    Examples
+    --------
+        sync_up("data/binance", "data/binance", env="dev")
+    """
+    _validate_env(env)
+    s3_path = s3_path.rstrip("/")
+    local_files = _list_local(local_path)
+    remote_files = _list_remote(s3_path, env, bucket_name)
+    to_transfer = [
+        path
+        for path, size in local_files.items()
+        if not _is_same(
+            os.path.join(local_path, path), size, remote_files.get(path)
+        )
+    ]
+    return _transfer(
+        lambda path: upload_file(
+            os.path.join(local_path, path),
+            f"{s3_path}/{path}",
+            env=env,
+            bucket_name=bucket_name,
+        ),
+        to_transfer,
+        sizes=local_files,
+        n_skipped=len(local_files) - len(to_transfer),
+        max_workers=max_workers,
     )
-    return response["Body"].read()
+
+
+def sync_down(
+    s3_path: str,
+    local_path: str,
+    env: str,
+    bucket_name: str = constants.S3_BUCKET_NAME,
+    max_workers: int = 8,
+) -> Dict[str, float]:
+    """
+    Download the objects under an S3 path that are missing or different
+        locally. The counterpart of `sync_up`, see there.
+
+    Examples
+    --------
+        sync_down("data/binance", "data/binance", env="dev")
+    """
+    _validate_env(env)
+    s3_path = s3_path.rstrip("/")
+    remote_files = _list_remote(s3_path, env, bucket_name)
+    to_transfer = [
+        path
+        for path, remote in remote_files.items()
+        if not _is_same(os.path.join(local_path, path), None, remote)
+    ]
+
+    def download_to(path: str) -> None:
+        file_path = os.path.join(local_path, path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        download_file(
+            f"{s3_path}/{path}", file_path, env=env, bucket_name=bucket_name
+        )
+
+    return _transfer(
+        download_to,
+        to_transfer,
+        sizes={path: size for path, (size, _) in remote_files.items()},
+        n_skipped=len(remote_files) - len(to_transfer),
+        max_workers=max_workers,
+    )
+
+
+def _transfer(
+    transfer_file,
+    paths: List[str],
+    sizes: Dict[str, int],
+    n_skipped: int,
+    max_workers: int,
+) -> Dict[str, float]:
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(transfer_file, paths))
+    seconds = time.perf_counter() - start_time
+    n_bytes = sum(sizes[path] for path in paths)
+    return {
+        "files": len(paths),
+        "skipped": n_skipped,
+        "bytes": n_bytes,
+        "seconds": seconds,
+        "bytes_per_second": n_bytes / seconds if seconds > 0 else 0.0,
+    }
+
+
+def _list_local(local_path: str) -> Dict[str, int]:
+    """Sizes of the files under a directory, by relative path. Hidden files,
+    like temporary ones, are left out."""
+    files = {}
+    for root, dirs, names in os.walk(local_path):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in names:
+            if name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, local_path).replace(os.sep, "/")
+            files[relative] = os.path.getsize(path)
+    return files
+
+
+def _list_remote(
+    s3_path: str, env: str, bucket_name: str
+) -> Dict[str, Tuple[int, str]]:
+    """Sizes and ETags of the objects under an S3 path, by relative path."""
+    prefix = f"{env}/{s3_path}/"
+    paginator = get_client().get_paginator("list_objects_v2")
+    return {
+        obj["Key"][len(prefix) :]: (obj["Size"], obj["ETag"].strip('"'))
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    }
+
+
+def _is_same(
+    file_path: str,
+    size: Optional[int],
+    remote: Optional[Tuple[int, str]],
+) -> bool:
+    if remote is None or not os.path.isfile(file_path):
+        return False
+    if size is None:
+        size = os.path.getsize(file_path)
+    remote_size, remote_etag = remote
+    return size == remote_size and _local_etag(file_path) == remote_etag
+
+
+def _local_etag(file_path: str) -> str:
+    """ETag that S3 gives a file uploaded with `TRANSFER_CONFIG`: the MD5 of
+    the file, or for multipart uploads, the MD5 of the MD5s of the parts."""
+    chunk_size = TRANSFER_CONFIG.multipart_chunksize
+    md5 = hashlib.md5()
+    digests = []
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            md5.update(chunk)
+            digests.append(hashlib.md5(chunk).digest())
+    if os.path.getsize(file_path) < TRANSFER_CONFIG.multipart_threshold:
+        return md5.hexdigest()
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+@functools.lru_cache(maxsize=None)
+def get_client():
+    """S3 client shared by all calls in the process. Clients are
+    thread-safe, unlike sessions, and reuse their connections."""
+    return _get_session().client(
+        "s3",
+        config=Config(
+            max_pool_connections=TRANSFER_CONFIG.max_concurrency * 4
+        ),
+    )
+
+
+# The connections of a client are not safe to share with a forked child, so
+# the child makes its own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=get_client.cache_clear)
 
 
 def _validate_env(env: str) -> None:
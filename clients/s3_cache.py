@@ -0,0 +1,137 @@
+import os
+from typing import Optional
+
+import constants
+from clients import s3
+
+
+class S3Cache:
+    def __init__(
+        self,
+        path: str = constants.S3_CACHE_PATH,
+        max_bytes: int = 10 * 1024**3,
+        validate: bool = True,
+    ):
+        """
+        Local read-through cache of S3 objects, like model pickles and data
+        partitions. Objects are kept at `{path}/{bucket}/{env}/{s3_path}`,
+        next to a `.etag` file with the ETag they were downloaded at.
+
+        A cached object is only downloaded again when its ETag on S3 has
+        changed, which costs a HEAD request. When the cache grows over
+        `max_bytes`, the least recently used objects are deleted.
+
+        Parameters
+        ----------
+        path : str
+            Root directory of the cache.
+        max_bytes : int
+            Max total size of the cached objects.
+        validate : bool
+            Whether to check cached objects against S3. Without it, cached
+            objects are used as they are, without any request.
+
+        Example
+        -------
+            cache = S3Cache()
+            model = pickle.loads(cache.download("models/model.pkl", env="dev"))
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.validate = validate
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def download(
+        self,
+        s3_path: str,
+        env: str,
+        bucket_name: str = constants.S3_BUCKET_NAME,
+    ) -> bytes:
+        """Like `clients.s3.download`, through the cache."""
+        with open(self.get_path(s3_path, env, bucket_name), "rb") as f:
+            return f.read()
+
+    def get_path(
+        self,
+        s3_path: str,
+        env: str,
+        bucket_name: str = constants.S3_BUCKET_NAME,
+    ) -> str:
+        """Local path of an up-to-date copy of the object, e.g. to read a
+        Parquet file from without loading it in memory first."""
+        s3._validate_env(env)
+        local_path = os.path.join(self.path, bucket_name, env, s3_path)
+        cached_etag = self.read_etag(local_path)
+        if cached_etag is not None and not self.validate:
+            etag = cached_etag
+        else:
+            etag = (
+                s3.get_client()
+                .head_object(Bucket=bucket_name, Key=f"{env}/{s3_path}")
+                .get("ETag")
+            )
+        if etag == cached_etag:
+            self.n_hits += 1
+            # Mark as recently used
+            os.utime(local_path)
+            return local_path
+        self.n_misses += 1
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        # Written to a temporary file and renamed once complete. Storing the
+        # ETag from before the download means that an object that changes
+        # meanwhile is only ever considered stale, never up to date.
+        s3.get_client().download_file(
+            Bucket=bucket_name,
+            Key=f"{env}/{s3_path}",
+            Filename=local_path,
+            Config=s3.TRANSFER_CONFIG,
+        )
+        self.write_etag(local_path, etag)
+        self.evict(keep=local_path)
+        return local_path
+
+    @staticmethod
+    def read_etag(local_path: str) -> Optional[str]:
+        if not os.path.isfile(local_path):
+            return None
+        try:
+            with open(f"{local_path}.etag") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def write_etag(local_path: str, etag: str) -> None:
+        tmp_path = f"{local_path}.etag.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(etag)
+        os.replace(tmp_path, f"{local_path}.etag")
+
+    @property
+    def size(self) -> int:
+        return sum(os.path.getsize(path) for path, _ in self.cached_files())
+
+    def cached_files(self):
+        """Paths of the cached objects and their last use."""
+        for root, _, files in os.walk(self.path):
+            for file in files:
+                if file.endswith((".etag", ".tmp")) or file.startswith("."):
+                    continue
+                path = os.path.join(root, file)
+                yield path, os.path.getmtime(path)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete the least recently used objects, but `keep`, until the
+        cache fits in `max_bytes`."""
+        files = sorted(self.cached_files(), key=lambda item: item[1])
+        size = sum(os.path.getsize(path) for path, _ in files)
+        for path, _ in files:
+            if size <= self.max_bytes:
+                return
+            if path == keep:
+                continue
+            size -= os.path.getsize(path)
+            os.remove(path)
+            if os.path.isfile(f"{path}.etag"):
+                os.remove(f"{path}.etag")
@@ -14,3 +14,7 @@ BINANCE_INTERVAL = enums.KLINE_INTERVAL_1MINUTE
 
 # AWS
 S3_BUCKET_NAME = "crypto-bot-dc777"
+S3_CACHE_PATH = str(pathlib.Path(BASE_PATH) / ".s3_cache")
+
+# Features
+FEATURE_CACHE_PATH = str(pathlib.Path(BASE_PATH) / ".feature_cache")
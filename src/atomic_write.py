@@ -0,0 +1,29 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a temporary file next to `path` for writing in binary mode, and
+    move it in place once the block exits, so that concurrent or
+    interrupted runs never leave a half-written file. If the block raises,
+    the temporary file is removed and `path` is left untouched.
+
+    Example
+    -------
+        with atomic_write(path) as f:
+            data.to_parquet(f)
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
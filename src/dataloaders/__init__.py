@@ -1,3 +1,5 @@
 from src.dataloaders.exchange.binance import BinanceDataLoader
+from src.dataloaders.exchange.candle_store import CandleStore
+from src.dataloaders.exchange.resampler import CandleResampler
 
-__all__ = ["BinanceDataLoader"]
+__all__ = ["BinanceDataLoader", "CandleStore", "CandleResampler"]
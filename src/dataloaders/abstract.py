@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Protocol
 
+import pandas as pd
 import pytz
 
 
+class RowConsumer(Protocol):
+    """Anything rows can be streamed into one at a time, like a
+    `FeatureService` or a `CandleResampler`."""
+
+    def add_value(self, data_row: Any, purging: bool = False) -> Any:
+        ...
+
+
 class DataLoader(ABC):
     """Abstract class for DataLoaders."""
 
@@ -30,6 +39,12 @@ class DataLoader(ABC):
         timestamp /= 1000
         return datetime.fromtimestamp(timestamp, tz=pytz.utc)
 
+    @staticmethod
+    def timestamps_to_datetimes(timestamps: pd.Series) -> pd.Series:
+        """Vectorized `timestamp_to_datetime` over a whole series of
+        millisecond timestamps."""
+        return pd.to_datetime(timestamps, unit="ms", utc=True)
+
     @staticmethod
     def datetime_to_timestamp(dt: datetime) -> int:
         return int(dt.timestamp() // 1) * 1000
@@ -42,6 +57,16 @@ class DataLoader(ABC):
         dt = self.timestamp_to_datetime(timestamp)
         return self.datetime_to_str(dt)
 
+    @staticmethod
+    def memory_report(data: pd.DataFrame) -> pd.DataFrame:
+        """Data type and memory in bytes of every column, largest first."""
+        return pd.DataFrame(
+            {
+                "dtype": data.dtypes.astype(str),
+                "bytes": data.memory_usage(index=False, deep=True),
+            }
+        ).sort_values("bytes", ascending=False)
+
     @property
     def now(self):
         return int(datetime.now(pytz.utc).timestamp() // 1) * 1000
@@ -1,10 +1,12 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from clients.exchange.abstract import ExchangeClient
-from src.dataloaders.abstract import DataLoader
+from clients.exchange.abstract import ExchangeClient, StreamingExchangeClient
+from src.dataloaders.abstract import DataLoader, RowConsumer
 
 
 class BinanceDataLoader(DataLoader):
@@ -14,13 +16,38 @@ class BinanceDataLoader(DataLoader):
         assets: List[str],
         fiat: str,
         exchange_client: ExchangeClient,
+        max_workers: int = 1,
+        compact: bool = False,
         **kwargs,
     ):
+        """
+        Parameters
+        ----------
+        interval : str
+            Candlestick interval, one of `binance.enums`.
+        assets : List[str]
+            Assets to load, like `["BTC", "ETH"]`.
+        fiat : str
+            Fiat currency each asset is quoted in, like `USDT`.
+        exchange_client : ExchangeClient
+            Client to load the candlesticks with.
+        max_workers : int
+            Number of symbols to fetch concurrently. The thread pool is the
+            shared budget of in-flight requests against the exchange.
+            `1` fetches the symbols one after another.
+        compact : bool
+            Store prices and volumes as `float32` and counts as `int32`
+            instead of 64 bits. Halves the memory of the loaded data at the
+            cost of precision. Timestamps always stay `int64`.
+        """
         super().__init__(**kwargs)
         self.interval = interval
         self.assets = assets
         self.fiat = fiat
         self.exchange_client = exchange_client
+        self.max_workers = max_workers
+        self.compact = compact
+        self.gaps = []
         self.validate()
 
     def load_data(self, start: int, end: int) -> pd.DataFrame:
@@ -37,26 +64,150 @@ class BinanceDataLoader(DataLoader):
         -------
         Pandas data frame
         """
-        data = pd.DataFrame()
+        return self.process_missing_intervals(self.load_candles(start, end))
+
+    def load_candles(self, start: int, end: int) -> pd.DataFrame:
+        """Load the candlesticks of every symbol between `start` and `end`,
+        not inclusive, one row per interval that any symbol has a candle
+        for. Unlike `load_data`, the missing intervals are not filled."""
         end -= 1  # `<` instead of `<=`
-        for symbol in self.symbols:
-            input_data = self.exchange_client.get_historic_prices(
-                symbol=symbol,
-                interval=self.interval,
-                start=start,
-                end=end,
-            )
-            data_for_symbol = self.read_raw_input_data(input_data)
-            data_for_symbol["symbol"] = symbol
-            data = pd.concat((data, data_for_symbol), ignore_index=True)
-        data = self.pivot_price_data(data)
-        data = self.process_missing_intervals(data)
-        return data
+        data = pd.concat(self.fetch_symbols(start, end), ignore_index=True)
+        return self.pivot_price_data(data)
+
+    async def stream_data(
+        self,
+        source: AsyncIterable[Any],
+        feature_service: RowConsumer,
+        purging: bool = False,
+    ) -> None:
+        """Feed closed candlesticks from a stream of kline events to the
+        feature service, one row per interval in the format of `load_data`.
+
+        A row is added as soon as every symbol has closed its candle.
+        Intervals that are skipped, or that only some symbols close, are
+        filled with the last available data and marked as `service_down`,
+        like in `process_missing_intervals`.
+
+        Parameters
+        ----------
+        source : AsyncIterable
+            Kline events, like a websocket connection or a
+            `KlineReplayServer`, for the `StreamingExchangeClient` of the
+            data loader.
+        feature_service : RowConsumer
+            Feature service, or anything else with `add_value`, to add the
+            rows to.
+        purging : bool
+            Whether to purge the oldest value on every added row.
+
+        Example
+        -------
+            asyncio.run(dataloader.stream_data(source, feature_service))
+        """
+        assert isinstance(
+            self.exchange_client, StreamingExchangeClient
+        ), "The exchange client does not stream klines."
+        pending = {}
+        last_row = None
+        last_timestamp = None
+        async for symbol, kline in self.exchange_client.stream_klines(source):
+            open_timestamp = int(kline[0])
+            if symbol not in self.symbols or (
+                last_timestamp is not None and open_timestamp <= last_timestamp
+            ):
+                continue
+            pending.setdefault(open_timestamp, {})[symbol] = kline
+            if len(pending[open_timestamp]) < len(self.symbols):
+                continue
+            if last_timestamp is None:
+                last_timestamp = open_timestamp - self.interval_ms
+            for timestamp in range(
+                last_timestamp + self.interval_ms,
+                open_timestamp + 1,
+                self.interval_ms,
+            ):
+                row = self.build_row(
+                    timestamp, pending.pop(timestamp, {}), last_row
+                )
+                feature_service.add_value(row, purging)
+                last_row = row
+            last_timestamp = open_timestamp
+            # Drop the candles of the intervals that were never completed
+            pending = {t: k for t, k in pending.items() if t > open_timestamp}
+
+    def build_row(
+        self,
+        timestamp: int,
+        klines: Dict[str, List],
+        last_row: Optional[pd.Series],
+    ) -> pd.Series:
+        """Build a row like the ones of `load_data` from the klines of one
+        interval, per symbol. Symbols without a kline take their values from
+        the `last_row`."""
+        parsers = self.exchange_client.dtypes
+        row = {
+            "time": pd.Timestamp(timestamp, unit="ms"),
+            "open_timestamp": timestamp
+            if klines
+            else last_row["open_timestamp"],
+        }
+        for i, (col, dtype) in enumerate(self.dtypes.items()):
+            if col in ("open_timestamp", "close_timestamp"):
+                continue
+            for symbol in self.symbols:
+                if symbol in klines:
+                    value = dtype(parsers[col](klines[symbol][i]))
+                else:
+                    value = last_row[f"{symbol}_{col}"]
+                row[f"{symbol}_{col}"] = value
+        row["service_down"] = len(klines) < len(self.symbols)
+        return pd.Series(row)
 
     @property
     def symbols(self) -> List[str]:
         return [asset + self.fiat for asset in self.assets]
 
+    @property
+    def dtypes(self) -> Dict[str, type]:
+        """Data types of the loaded columns, per exchange client column."""
+        dtypes = self.exchange_client.dtypes
+        if not self.compact:
+            return dtypes
+        compact_dtypes = {float: np.float32, int: np.int32}
+        return {
+            col: dtype
+            if col.endswith("_timestamp")
+            else compact_dtypes.get(dtype, dtype)
+            for col, dtype in dtypes.items()
+        }
+
+    def fetch_symbols(self, start: int, end: int) -> List[pd.DataFrame]:
+        """Fetch the data of every symbol, in the order of `symbols`."""
+        if self.max_workers == 1:
+            return [
+                self.fetch_symbol(symbol, start, end)
+                for symbol in self.symbols
+            ]
+        n_workers = min(self.max_workers, len(self.symbols))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            return list(
+                executor.map(
+                    lambda symbol: self.fetch_symbol(symbol, start, end),
+                    self.symbols,
+                )
+            )
+
+    def fetch_symbol(self, symbol: str, start: int, end: int) -> pd.DataFrame:
+        input_data = self.exchange_client.get_historic_prices(
+            symbol=symbol,
+            interval=self.interval,
+            start=start,
+            end=end,
+        )
+        data_for_symbol = self.read_raw_input_data(input_data)
+        data_for_symbol["symbol"] = symbol
+        return data_for_symbol
+
     def read_raw_input_data(self, input_data: List[List[str]]) -> pd.DataFrame:
         """Create a data frame from raw input data like:
         [
@@ -77,13 +228,21 @@ class BinanceDataLoader(DataLoader):
             ...
         ]
         """
-        # Drop the last `Ignore` column
-        input_data = np.array(input_data)[:, :-1]
-        data = pd.DataFrame(
-            input_data, columns=self.exchange_client.dtypes.keys()
+        # Parse every column straight into a preallocated array of its final
+        # type. The last `Ignore` column is never read.
+        n_rows = len(input_data)
+        parsers = self.exchange_client.dtypes
+        return pd.DataFrame(
+            {
+                col: np.fromiter(
+                    map(parsers[col], map(itemgetter(i), input_data)),
+                    dtype=dtype,
+                    count=n_rows,
+                )
+                for i, (col, dtype) in enumerate(self.dtypes.items())
+            },
+            copy=False,
         )
-        data = data.astype(self.exchange_client.dtypes)
-        return data
 
     def pivot_price_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Transform the dataframe so that each symbol gets its own column.
@@ -109,46 +268,161 @@ class BinanceDataLoader(DataLoader):
             for col in self.exchange_client.dtypes.keys()
             if col not in ("open_timestamp", "close_timestamp")
         ]
-        return pd.concat(
-            {
-                f"{asset}_{col}": data.pivot(
-                    index="open_timestamp", columns="symbol", values=col
-                )[asset]
-                for col in cols
-                for asset in data["symbol"].unique()
-            },
-            axis=1,
-        ).reset_index()
+        symbols = data["symbol"].unique()
+        # Unstack block by block, which keeps the integer columns integer
+        data = data.set_index(["open_timestamp", "symbol"])[cols].unstack()
+        # Order the columns by value column first, then by symbol appearance
+        data = data.reindex(
+            columns=pd.MultiIndex.from_product((cols, symbols))
+        )
+        data.columns = [f"{symbol}_{col}" for col, symbol in data.columns]
+        return data.reset_index()
 
     def process_missing_intervals(self, data: pd.DataFrame) -> pd.DataFrame:
-        data = self.extract_time(data)
+        """Extend the data to the full range of intervals, fill the missing
+        intervals with the last available data and mark them in the
+        `service_down` column. The data has to be sorted by time.
+
+        The runs of missing intervals are kept in `gaps` as
+        `(row, n_rows)` tuples, see `find_gaps`.
+        """
+        timestamps = data["open_timestamp"].to_numpy()
+        self.gaps = self.find_gaps(timestamps)
+        # Symbols that have no candle in some of the rows
+        partial_rows = self.find_partial_rows(data)
+        if partial_rows.any():
+            data = self.fill_partial_rows(data)
         data = self.extend_missing_intervals(data)
+        data = self.extract_time(data)
         # Mark missing intervals
-        data["service_down"] = np.where(data.isnull().any(axis=1), True, False)
-        # Fill missing data to last available
-        return data.fillna(method="ffill")
+        service_down = np.ones(len(data), dtype=bool)
+        service_down[self.grid_positions(timestamps)] = partial_rows
+        data["service_down"] = service_down
+        if self.compact:
+            data = self.restore_compact_dtypes(data)
+        return data
 
-    def extract_time(self, data: pd.DataFrame) -> pd.DataFrame:
-        time = pd.to_datetime(
-            data["open_timestamp"].apply(self.timestamp_to_str)
+    def restore_compact_dtypes(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Cast the columns that were upcast by the missing intervals back
+        to their compact types. Integer columns that still contain NaNs
+        (missing from the first row on) become `float32` instead."""
+        dtypes = {}
+        for col, dtype in self.dtypes.items():
+            for data_col in (col, *(f"{s}_{col}" for s in self.symbols)):
+                if data_col not in data.columns:
+                    continue
+                if (
+                    np.issubdtype(dtype, np.integer)
+                    and data[data_col].isna().any()
+                ):
+                    dtypes[data_col] = np.float32
+                else:
+                    dtypes[data_col] = dtype
+        return data.astype(dtypes, copy=False)
+
+    @property
+    def interval_ms(self) -> int:
+        """Length of the interval in milliseconds. Weekly candles always
+        span 7 days, monthly candles have no fixed length."""
+        freq = self.exchange_client.interval_mapping[self.interval]
+        return pd.Timedelta(freq) // pd.Timedelta(milliseconds=1)
+
+    def grid_positions(self, timestamps: np.ndarray) -> np.ndarray:
+        """Row of every timestamp within the full range of intervals."""
+        if len(timestamps) == 0:
+            return timestamps.astype(np.int64)
+        return (timestamps - timestamps[0]).astype(
+            np.int64
+        ) // self.interval_ms
+
+    def find_gaps(self, timestamps: np.ndarray) -> List[Tuple[int, int]]:
+        """Find the runs of missing intervals in sorted timestamps.
+
+        Returns
+        -------
+        List of `(row, n_rows)` tuples, where `row` is the first missing row
+        within the full range of intervals and `n_rows` is the number of
+        missing intervals in a row.
+
+        Example
+        -------
+        With 1-minute intervals, `[00:00, 00:01, 00:04, 00:05, 00:07]`
+        gives `[(2, 2), (6, 1)]`.
+        """
+        positions = self.grid_positions(timestamps)
+        n_missing = np.diff(positions) - 1
+        rows = np.flatnonzero(n_missing > 0)
+        return list(
+            zip((positions[rows] + 1).tolist(), n_missing[rows].tolist())
         )
-        data.insert(loc=0, column="time", value=time)
-        return data
+
+    def find_partial_rows(self, data: pd.DataFrame) -> np.ndarray:
+        """Rows where some symbol has no candle. The pivot leaves all the
+        columns of such a symbol empty, so one column per symbol is enough
+        to find them."""
+        partial_rows = np.zeros(len(data), dtype=bool)
+        for symbol in self.symbols:
+            symbol_cols = [
+                col for col in data.columns if col.startswith(f"{symbol}_")
+            ]
+            if symbol_cols:
+                partial_rows |= data[symbol_cols[0]].isna().to_numpy()
+        return partial_rows
+
+    def fill_partial_rows(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Fill the columns of every symbol, in the rows where it has no
+        candle, with its last available data. The other rows and columns
+        are left as they are."""
+        filled = {}
+        for symbol in self.symbols:
+            symbol_cols = [
+                col for col in data.columns if col.startswith(f"{symbol}_")
+            ]
+            if not symbol_cols:
+                continue
+            missing = data[symbol_cols[0]].isna().to_numpy()
+            if not missing.any():
+                continue
+            # Last row with a candle, up to every row
+            positions = np.arange(len(data))
+            source = np.maximum.accumulate(np.where(missing, -1, positions))
+            rows = np.flatnonzero(missing & (source >= 0))
+            for col in symbol_cols:
+                values = data[col].to_numpy(copy=True)
+                values[rows] = values[source[rows]]
+                filled[col] = values
+        return data.assign(**filled)
 
     def extend_missing_intervals(self, data: pd.DataFrame) -> pd.DataFrame:
-        full_range_df = pd.DataFrame(
-            {
-                "time": pd.date_range(
-                    start=data["time"].min(),
-                    end=data["time"].max(),
-                    freq=self.exchange_client.interval_mapping[self.interval],
-                )
-            }
-        )
-        return full_range_df.merge(data, on="time", how="left")
+        """Repeat every row once per missing interval that follows it, which
+        fills the missing intervals with the last available data."""
+        positions = self.grid_positions(data["open_timestamp"].to_numpy())
+        if len(positions) == 0:
+            return data
+        repeats = np.diff(positions, append=positions[-1] + 1)
+        rows = np.repeat(np.arange(len(data)), repeats)
+        return data.iloc[rows].reset_index(drop=True)
+
+    def extract_time(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Insert the time of every row of the full range of intervals."""
+        start = data["open_timestamp"].iloc[0] if len(data) > 0 else 0
+        timestamps = start + self.interval_ms * np.arange(len(data))
+        time = self.timestamps_to_datetimes(timestamps)
+        # Keep the times timezone-naive, in UTC
+        data.insert(loc=0, column="time", value=time.tz_localize(None))
+        return data
 
     def validate(self):
         assert (
             self.interval in self.exchange_client.interval_mapping.keys()
         ), f"Invalid interval '{self.interval}'."
+        offset = pd.tseries.frequencies.to_offset(
+            self.exchange_client.interval_mapping[self.interval]
+        )
+        assert isinstance(
+            offset, (pd.offsets.Tick, pd.offsets.Week)
+        ), f"Interval '{self.interval}' has no fixed length."
         assert len(self.symbols) > 0, "No symbols to get data for."
+        assert (
+            self.max_workers > 0
+        ), f"Max workers must be positive, got {self.max_workers}."
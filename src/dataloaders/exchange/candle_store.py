@@ -0,0 +1,167 @@
+import os
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.atomic_write import atomic_write
+from src.dataloaders.abstract import DataLoader
+from src.dataloaders.exchange.binance import BinanceDataLoader
+
+# hours * minutes * seconds * milliseconds
+MILLISECONDS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+class CandleStore(DataLoader):
+    def __init__(
+        self,
+        path: str,
+        dataloader: BinanceDataLoader,
+        datetime_fmt: str = "%Y-%m-%d",
+    ):
+        """
+        Local cache of candlestick data, partitioned by the symbols,
+        interval and `compact` of the `dataloader`, and by day like:
+            {path}/symbols=BTCUSDT-ETHUSDT/interval=1m/compact=False/
+                date=2023-01-01/data.parquet
+                date=2023-01-02/data.parquet
+                ...
+
+        Data loaders with other settings can share the same `path`, without
+        reading each other's partitions.
+
+        Only the days that are not cached yet are fetched with the
+        `dataloader`. Days that have not ended yet are partial: they are
+        fetched on every call and never written to disk. The partitions
+        keep the candlesticks as fetched: the missing intervals are filled
+        after the days are joined, so that gaps across midnight are filled
+        and marked like in `BinanceDataLoader.load_data`.
+
+        Parameters
+        ----------
+        path : str
+            Root directory of the partitions of every data loader.
+        dataloader : BinanceDataLoader
+            Data loader to fetch the missing days with.
+        datetime_fmt : str
+            Format of the `date=` partition names.
+        """
+        super().__init__(datetime_fmt=datetime_fmt)
+        self.path = path
+        self.dataloader = dataloader
+
+    def load_data(self, start: int, end: int) -> pd.DataFrame:
+        """Load candlestick data from the cache, backfilling missing days.
+
+        Parameters
+        ----------
+        start : int
+            Starting timestamp in milliseconds, like `1672531200000`.
+        end : int
+            Ending timestamp. Not inclusive.
+
+        Returns
+        -------
+        Pandas data frame
+        """
+        saved_dates = set(self.saved_partitions())
+        now = self.now
+        data = []
+        for day_start, day_end in self.partition_timestamps_into_days(
+            start, end
+        ):
+            if day_start >= now:
+                break
+            date = self.timestamp_to_str(day_start)
+            if date in saved_dates:
+                data.append(self.read_partition(date))
+            elif day_end <= now:
+                data_for_date = self.dataloader.load_candles(
+                    day_start, day_end
+                )
+                self.write_partition(date, data_for_date)
+                data.append(data_for_date)
+            else:
+                data.append(
+                    self.dataloader.load_candles(day_start, min(end, now))
+                )
+        if len(data) == 0:
+            return self.empty_data()
+        data = self.dataloader.process_missing_intervals(
+            pd.concat(data, ignore_index=True)
+        )
+        # Filled intervals repeat the open timestamp of the last candle, so
+        # the range is sliced by the time of the interval
+        timestamps = (
+            data["time"].to_numpy().astype("datetime64[ms]").astype(np.int64)
+        )
+        in_range = (timestamps >= start) & (timestamps < end)
+        return data[in_range].reset_index(drop=True)
+
+    @staticmethod
+    def partition_timestamps_into_days(
+        start: int, end: int
+    ) -> List[Tuple[int, int]]:
+        """Split `[start, end)` into full days `[midnight, next midnight)`
+        that overlap with it."""
+        first_day = start // MILLISECONDS_PER_DAY * MILLISECONDS_PER_DAY
+        return [
+            (day_start, day_start + MILLISECONDS_PER_DAY)
+            for day_start in range(first_day, end, MILLISECONDS_PER_DAY)
+        ]
+
+    def empty_data(self) -> pd.DataFrame:
+        """Data frame without rows, with the columns and types of
+        `load_data`."""
+        dtypes = self.dataloader.dtypes
+        cols = [
+            col
+            for col in dtypes
+            if col not in ("open_timestamp", "close_timestamp")
+        ]
+        return pd.DataFrame(
+            {
+                "time": pd.Series(dtype="datetime64[ns]"),
+                "open_timestamp": pd.Series(dtype=np.int64),
+                **{
+                    f"{symbol}_{col}": pd.Series(dtype=dtypes[col])
+                    for col in cols
+                    for symbol in self.dataloader.symbols
+                },
+                "service_down": pd.Series(dtype=bool),
+            }
+        )
+
+    @property
+    def dataloader_path(self) -> str:
+        """Directory of the partitions of the `dataloader`."""
+        return os.path.join(
+            self.path,
+            f"symbols={'-'.join(self.dataloader.symbols)}",
+            f"interval={self.dataloader.interval}",
+            f"compact={self.dataloader.compact}",
+        )
+
+    def saved_partitions(self) -> List[str]:
+        if not os.path.isdir(self.dataloader_path):
+            return []
+        return [
+            partition.split("=")[1]
+            for partition in os.listdir(self.dataloader_path)
+            if partition.startswith("date=")
+            and os.path.isfile(self.partition_path(partition.split("=")[1]))
+        ]
+
+    def partition_path(self, date: str) -> str:
+        return os.path.join(
+            self.dataloader_path, f"date={date}", "data.parquet"
+        )
+
+    def read_partition(self, date: str) -> pd.DataFrame:
+        return pd.read_parquet(self.partition_path(date))
+
+    def write_partition(self, date: str, data: pd.DataFrame) -> None:
+        """Write the partition to a temporary file first and then move it in
+        place, so that an interrupted run never leaves a half-written day."""
+        with atomic_write(self.partition_path(date)) as f:
+            data.to_parquet(f, index=False)
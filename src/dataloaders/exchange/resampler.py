@@ -0,0 +1,183 @@
+import operator
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.dataloaders.abstract import RowConsumer
+
+# How to aggregate each candlestick column, by the name after the symbol
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "quote_asset_volume": "sum",
+    "number_of_trades": "sum",
+    "taker_buy_base_asset_volume": "sum",
+    "taker_buy_quote_asset_volume": "sum",
+}
+
+# The same aggregations, one value at a time
+INCREMENTAL_AGGREGATIONS = {
+    "first": lambda aggregate, _: aggregate,
+    "max": max,
+    "min": min,
+    "last": lambda _, value: value,
+    "sum": operator.add,
+    "any": operator.or_,
+}
+
+# 1970-01-05, the first Monday after the epoch, where weekly candlesticks
+# start
+FIRST_MONDAY_MS = 4 * 24 * 60 * 60 * 1000
+
+
+class CandleResampler:
+    def __init__(
+        self,
+        freq: str,
+        base_freq: str = "1T",
+        feature_service: Optional[RowConsumer] = None,
+    ):
+        """
+        Derive coarser candlesticks, like 5-minute or 1-hour ones, from the
+        1-minute candlesticks of `BinanceDataLoader` or `CandleStore`,
+        without loading them again.
+
+        Candlesticks are aggregated per symbol: first open, highest high,
+        lowest low, last close and summed volumes and number of trades. A
+        coarser candlestick is `service_down` if any of its candlesticks is.
+        Intervals are aligned to the Unix epoch, like Binance does, weekly
+        ones to the first Monday after it, and only complete intervals are
+        returned. Monthly intervals have no fixed length and are not
+        supported.
+
+        Parameters
+        ----------
+        freq : str
+            Pandas frequency to resample to, like `5T` or `1H`. See
+            `BinanceClient.interval_mapping`.
+        base_freq : str
+            Pandas frequency of the input candlesticks.
+        feature_service : RowConsumer, optional
+            In incremental mode, every completed candlestick is added to it.
+            The resampler can then be streamed into like a feature service,
+            e.g. `dataloader.stream_data(source, resampler)`.
+        """
+        self.freq = freq
+        self.base_freq = base_freq
+        self.feature_service = feature_service
+        self.validate()
+        self.interval_ms = self.freq_to_ms(freq)
+        self.base_interval_ms = self.freq_to_ms(base_freq)
+        self.origin_ms = (
+            FIRST_MONDAY_MS
+            if isinstance(self.to_offset(freq), pd.offsets.Week)
+            else 0
+        )
+        self.bar = None
+        self.bar_timestamp = None
+        self.n_rows = 0
+
+    @property
+    def rows_per_interval(self) -> int:
+        return self.interval_ms // self.base_interval_ms
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Resample a whole data frame at once."""
+        aggregations = self.get_aggregations(data.columns)
+        timestamps = data["time"].to_numpy().astype("int64") // 1_000_000
+        bar_timestamps = self.bar_start(timestamps)
+        groups = data.groupby(bar_timestamps, sort=False)
+        output = groups.agg(aggregations)
+        output = output.astype(data.dtypes[list(aggregations)])
+        # Drop the incomplete intervals at the edges
+        output = output[groups.size() == self.rows_per_interval]
+        output.insert(loc=0, column="open_timestamp", value=output.index)
+        output.insert(
+            loc=0,
+            column="time",
+            value=pd.to_datetime(output.index, unit="ms"),
+        )
+        return output.reset_index(drop=True)
+
+    def add_value(
+        self, data_row: pd.Series, purging: bool = False
+    ) -> Optional[pd.Series]:
+        """Add a single row.
+
+        Returns
+        -------
+        The coarser candlestick once its interval is complete, else `None`.
+        """
+        timestamp = data_row["time"].value // 1_000_000
+        bar_timestamp = self.bar_start(timestamp)
+        aggregations = self.get_aggregations(data_row.index)
+        if bar_timestamp != self.bar_timestamp:
+            # Rows of an incomplete interval are dropped, like in `transform`
+            self.bar = {col: data_row[col] for col in aggregations}
+            self.bar_timestamp = bar_timestamp
+            self.n_rows = 1
+        else:
+            for col, aggregation in aggregations.items():
+                self.bar[col] = INCREMENTAL_AGGREGATIONS[aggregation](
+                    self.bar[col], data_row[col]
+                )
+            self.n_rows += 1
+        if (
+            timestamp + self.base_interval_ms
+            < bar_timestamp + self.interval_ms
+        ):
+            return None
+        complete = self.n_rows == self.rows_per_interval
+        bar = pd.Series(
+            {
+                "time": pd.Timestamp(bar_timestamp, unit="ms"),
+                "open_timestamp": bar_timestamp,
+                **self.bar,
+            }
+        )
+        self.bar, self.bar_timestamp, self.n_rows = None, None, 0
+        if not complete:
+            return None
+        if self.feature_service is not None:
+            self.feature_service.add_value(bar, purging)
+        return bar
+
+    def bar_start(self, timestamps: Any) -> Any:
+        """Open timestamp of the interval of every millisecond timestamp."""
+        return (
+            timestamps - self.origin_ms
+        ) // self.interval_ms * self.interval_ms + self.origin_ms
+
+    @staticmethod
+    def get_aggregations(columns: List[Any]) -> Dict[str, str]:
+        aggregations = {
+            col: AGGREGATIONS[col.partition("_")[2]]
+            for col in columns
+            if col.partition("_")[2] in AGGREGATIONS
+        }
+        if "service_down" in columns:
+            aggregations["service_down"] = "any"
+        return aggregations
+
+    @staticmethod
+    def freq_to_ms(freq: str) -> int:
+        return pd.Timedelta(freq) // pd.Timedelta(milliseconds=1)
+
+    @staticmethod
+    def to_offset(freq: str) -> pd.DateOffset:
+        return pd.tseries.frequencies.to_offset(freq)
+
+    def validate(self):
+        for freq in (self.freq, self.base_freq):
+            assert isinstance(
+                self.to_offset(freq), (pd.offsets.Tick, pd.offsets.Week)
+            ), f"Frequency '{freq}' has no fixed length."
+        assert (
+            self.freq_to_ms(self.freq) % self.freq_to_ms(self.base_freq) == 0
+        ), (
+            f"Frequency '{self.freq}' is not a multiple of "
+            f"'{self.base_freq}'."
+        )
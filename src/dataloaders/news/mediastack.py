@@ -1,8 +1,14 @@
-from typing import List
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 import pandas as pd
 
 from clients.news.abstract import NewsClient
+from src.atomic_write import atomic_write
 from src.dataloaders.abstract import DataLoader
 
 
@@ -15,13 +21,44 @@ class MediaStackNewsScraper(DataLoader):
         limit: int = 100,
         sort_by: str = "popularity",
         datetime_fmt="%Y-%m-%d",
+        max_workers: int = 1,
+        cache_path: Optional[str] = None,
     ):
+        """
+        Parameters
+        ----------
+        keywords : List[str]
+            Keywords to search for.
+        news_client : NewsClient
+            Client to fetch the articles with. With `max_workers > 1`, it is
+            called from several threads at once and has to be thread-safe.
+        language : str
+            Language of the articles.
+        limit : int
+            Number of articles per day. Max is 100.
+        sort_by : str
+            How to sort the results. Can be `popularity` or `published_desc`.
+        datetime_fmt : str
+            Format of the dates passed to the `news_client`.
+        max_workers : int
+            Number of days to fetch concurrently.
+        cache_path : str, optional
+            Directory to cache the articles of every past day in, as gzipped
+            JSON lines:
+                {cache_path}/date=2023-01-01/{query hash}.jsonl.gz
+            The query hash covers the keywords, language, sorting and limit,
+            so that different queries never share a file. Cached days are not
+            fetched again. By default, nothing is cached.
+        """
         super().__init__(datetime_fmt=datetime_fmt)
         self.news_client = news_client
         self.keywords = keywords
         self.language = language
         self.limit = limit
         self.sort_by = sort_by
+        self.max_workers = max_workers
+        self.cache_path = cache_path
+        self.validate()
 
     def load_data(self, start: int, end: int) -> pd.DataFrame:
         """Load news data from MediaStack.
@@ -37,18 +74,40 @@ class MediaStackNewsScraper(DataLoader):
         -------
         Pandas data frame
         """
+        dates = self.get_dates(start, end)
+        if self.max_workers == 1:
+            data_per_date = map(self.load_date, dates)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                data_per_date = list(executor.map(self.load_date, dates))
         data = []
-        for date in self.get_dates(start, end):
-            data_for_date = self.news_client.get_data(
-                date=date,
-                keywords=self.keywords,
-                limit=self.limit,
-                language=self.language,
-                sort_by=self.sort_by,
-            )
+        for data_for_date in data_per_date:
             data.extend(data_for_date)
         return data
 
+    def load_date(self, date: str) -> List[dict]:
+        """Articles of a single day, from the cache if possible."""
+        if self.cache_path is None:
+            return self.fetch_date(date)
+        path = self.cache_file_path(date)
+        if os.path.isfile(path):
+            return self.read_cache(path)
+        data_for_date = self.fetch_date(date)
+        # Articles of a day that has not ended yet can still change
+        next_day = self.str_to_datetime(date) + pd.Timedelta(days=1)
+        if self.datetime_to_timestamp(next_day) <= self.now:
+            self.write_cache(path, data_for_date)
+        return data_for_date
+
+    def fetch_date(self, date: str) -> List[dict]:
+        return self.news_client.get_data(
+            date=date,
+            keywords=self.keywords,
+            limit=self.limit,
+            language=self.language,
+            sort_by=self.sort_by,
+        )
+
     def get_dates(self, start: int, end: int) -> List[str]:
         dates = pd.date_range(
             start=self.timestamp_to_str(start),
@@ -56,3 +115,38 @@ class MediaStackNewsScraper(DataLoader):
             freq="D",
         )
         return [d.strftime(self.datetime_fmt) for d in dates]
+
+    @property
+    def query_hash(self) -> str:
+        query = json.dumps(
+            {
+                "keywords": self.keywords,
+                "language": self.language,
+                "limit": self.limit,
+                "sort_by": self.sort_by,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(query.encode()).hexdigest()[:16]
+
+    def cache_file_path(self, date: str) -> str:
+        return os.path.join(
+            self.cache_path, f"date={date}", f"{self.query_hash}.jsonl.gz"
+        )
+
+    @staticmethod
+    def read_cache(path: str) -> List[dict]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def write_cache(self, path: str, data: List[dict]) -> None:
+        with atomic_write(path) as raw, gzip.open(
+            raw, "wt", encoding="utf-8"
+        ) as f:
+            for article in data:
+                f.write(json.dumps(article) + "\n")
+
+    def validate(self):
+        assert (
+            self.max_workers > 0
+        ), f"Max workers must be positive, got {self.max_workers}."
@@ -0,0 +1,148 @@
+import hashlib
+import os
+from typing import Any, List, Tuple
+
+import numpy as np
+
+import constants
+from src.atomic_write import atomic_write
+from src.features.feature_generators.abstract import FeatureGenerator
+
+# Part of every key. Increase it when the state of the generators
+# changes, so that older entries are not used anymore.
+VERSION = 1
+
+
+class FeatureCache:
+    def __init__(
+        self,
+        path: str = constants.FEATURE_CACHE_PATH,
+        max_new_rows: int = 1_440,
+    ):
+        """
+        On-disk cache of initialized feature generators, for
+        `FeatureService(..., cache=FeatureCache())`. The state of a
+        generator, see `FeatureGenerator.get_state`, is kept as arrays at
+        `{path}/{name}__{cols}/{n_rows}-{key}.npz`, where `cols` is a hash
+        of its `input_cols` and `key` a hash of its `name` and of the first
+        `n_rows` of its `input_cols`.
+
+        A generator is restored from the cached state instead of being
+        initialized again when neither its parameters, which are part of
+        its name, nor its input columns changed. When the data has new rows
+        after the cached ones, it is restored and extended with the new
+        ones, unless there are more than `max_new_rows`, and the extended
+        state replaces the entry. Only the latest entry of every generator
+        is kept. Generators without `input_cols` are not cached.
+
+        Parameters
+        ----------
+        path : str
+            Root directory of the cache.
+        max_new_rows : int
+            Most new rows to extend a generator with, a day of minutes by
+            default. With more, initializing it again is as fast.
+        """
+        self.path = path
+        self.max_new_rows = max_new_rows
+        self.n_hits = 0
+        self.n_extended = 0
+        self.n_misses = 0
+
+    def load(self, feature_generator: FeatureGenerator, data: Any) -> bool:
+        """Restore the generator on `data`, a data frame, from its cached
+        state.
+
+        Returns
+        -------
+        Whether it was in the cache.
+        """
+        if not self.is_cached(feature_generator):
+            return False
+        n_rows = len(data)
+        for cached_rows, path in self.entries(feature_generator):
+            if (
+                cached_rows > n_rows
+                or n_rows - cached_rows > self.max_new_rows
+                or path
+                != self.entry_path(feature_generator, data, cached_rows)
+            ):
+                continue
+            with np.load(path) as arrays:
+                feature_generator.set_state(dict(arrays))
+            if cached_rows < n_rows:
+                feature_generator.add_values(data.iloc[cached_rows:])
+                self.save(feature_generator, data)
+                self.n_extended += 1
+            else:
+                self.n_hits += 1
+            return True
+        self.n_misses += 1
+        return False
+
+    def save(self, feature_generator: FeatureGenerator, data: Any) -> None:
+        """Store the state of the generator, initialized on `data`, in place
+        of its previous entry."""
+        if not self.is_cached(feature_generator):
+            return
+        path = self.entry_path(feature_generator, data, len(data))
+        if os.path.isfile(path):
+            return
+        with atomic_write(path) as f:
+            np.savez(f, **feature_generator.get_state())
+        for _, old_path in self.entries(feature_generator):
+            if old_path != path:
+                os.remove(old_path)
+
+    @staticmethod
+    def is_cached(feature_generator: FeatureGenerator) -> bool:
+        return feature_generator.input_cols is not None
+
+    def entries(
+        self, feature_generator: FeatureGenerator
+    ) -> List[Tuple[int, str]]:
+        """Number of rows and path of the entries of the generator, the
+        longest first."""
+        directory = self.directory(feature_generator)
+        if not os.path.isdir(directory):
+            return []
+        entries = []
+        for file_name in os.listdir(directory):
+            n_rows, _, key = file_name.partition("-")
+            if n_rows.isdigit() and key.endswith(".npz"):
+                entries.append(
+                    (int(n_rows), os.path.join(directory, file_name))
+                )
+        return sorted(entries, reverse=True)
+
+    def directory(self, feature_generator: FeatureGenerator) -> str:
+        """Directory of the entries of the generator. Names leave out some
+        input columns, like the high and low of `ATR`, so the columns are
+        part of it too."""
+        cols = hashlib.sha1(
+            "/".join(feature_generator.input_cols).encode()
+        ).hexdigest()[:8]
+        return os.path.join(self.path, f"{feature_generator.name}__{cols}")
+
+    def entry_path(
+        self, feature_generator: FeatureGenerator, data: Any, n_rows: int
+    ) -> str:
+        key = self.key(feature_generator, data, n_rows)
+        return os.path.join(
+            self.directory(feature_generator), f"{n_rows}-{key}.npz"
+        )
+
+    @staticmethod
+    def key(
+        feature_generator: FeatureGenerator, data: Any, n_rows: int
+    ) -> str:
+        """Hash of the generator and of the first `n_rows` of its input
+        columns."""
+        key = hashlib.sha1(f"{VERSION}/{feature_generator.name}".encode())
+        for col in feature_generator.input_cols:
+            values = np.asarray(data[col])[:n_rows]
+            if values.dtype == object:
+                values = values.astype(str)
+            key.update(f"/{col}/{values.dtype.str}/".encode())
+            key.update(np.ascontiguousarray(values).view(np.uint8))
+        return key.hexdigest()[:16]
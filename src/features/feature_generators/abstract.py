@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod, abstractproperty
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 
 class FeatureGenerator(ABC):
@@ -15,6 +17,13 @@ class FeatureGenerator(ABC):
         """Add a new value to the feature generator."""
         raise NotImplementedError()
 
+    def add_values(self, data: Any, purging: bool = False) -> None:
+        """Add the rows of `data`, a data frame, with the same outcome as
+        `add_value` for each of them. Generators override it to add them at
+        once, with the kernels."""
+        for i in range(len(data)):
+            self.add_value(data.iloc[i], purging)
+
     @abstractproperty
     def output_values(self) -> Dict[str, List[float]]:
         raise NotImplementedError()
@@ -22,3 +31,80 @@ class FeatureGenerator(ABC):
     @abstractproperty
     def name(self) -> str:
         raise NotImplementedError()
+
+    @property
+    def input_cols(self) -> Optional[List[str]]:
+        """Columns of the data that the outputs depend on. None if they
+        depend on anything else too, and `FeatureCache` does not cache
+        them."""
+        return None
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Arrays to restore the generator from with `set_state`, e.g. for
+        `FeatureCache`. Generators with `input_cols` implement both."""
+        raise NotImplementedError()
+
+    def set_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restore the generator from the arrays of `get_state`, as it was
+        then, instead of initializing it again."""
+        raise NotImplementedError()
+
+    @property
+    def kernel_calls(self) -> Dict[str, Any]:
+        """`kernels.KernelCall`s of `initialize`, by name. `FeatureService`
+        runs each distinct call once for all its generators."""
+        return {}
+
+    @property
+    def output_names(self) -> List[str]:
+        """Names of the outputs, as in `FeatureService.output_values`.
+        Generators override it, so that it does not build `output_values`."""
+        output_values = self.output_values
+        if isinstance(output_values, dict):
+            return [f"{self.name}__{key}" for key in output_values]
+        return [self.name]
+
+    def latest_values(self) -> List[float]:
+        """Newest value of every output, in the order of `output_names`.
+        Generators override it to take constant time, whatever the length
+        of the history."""
+        output_values = self.output_values
+        if isinstance(output_values, dict):
+            return [self.last(values) for values in output_values.values()]
+        return [self.last(output_values)]
+
+    @staticmethod
+    def last(values: List[Optional[float]]) -> float:
+        """Last value, NaN if there is none yet."""
+        if len(values) == 0 or values[-1] is None:
+            return np.nan
+        return values[-1]
+
+    @property
+    def n_rows(self) -> int:
+        """Number of rows of `output_values`. Generators override it, so
+        that it does not build `output_values`."""
+        output_values = self.output_values
+        if isinstance(output_values, dict):
+            output_values = next(iter(output_values.values()))
+        return len(output_values)
+
+    def write_values(self, out: np.ndarray) -> None:
+        """Write `output_values` into `out`, of shape
+        `(n_rows, len(output_names))`, a column per output. Generators
+        override it to write their state directly, without building
+        `output_values`."""
+        output_values = self.output_values
+        if not isinstance(output_values, dict):
+            output_values = {self.name: output_values}
+        for column, values in zip(out.T, output_values.values()):
+            self.write_column(column, values)
+
+    @staticmethod
+    def write_column(column: np.ndarray, values: List[Optional[float]]):
+        """Write `values` at the end of `column`, with NaN before them and
+        instead of None."""
+        values = values[max(0, len(values) - len(column)) :]
+        n_missing = len(column) - len(values)
+        column[:n_missing] = np.nan
+        column[n_missing:] = values
@@ -1,45 +1,150 @@
-from typing import Dict, List
+from typing import Dict
 
+import numpy as np
 import pandas as pd
 
 from src.dataloaders.abstract import DataLoader
 from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.ring_buffer import RingBuffer
+
+MILLISECONDS_PER_HOUR = 60 * 60 * 1000
 
 
 class DateTime(FeatureGenerator):
-    def __init__(self, timestamp_col: str) -> None:
+    # One-hot categories, by prefix. The first one of each is dropped, as it
+    # is implied by the others.
+    CATEGORIES = {
+        "day_of_week_": list(range(7)),
+        "month_": list(range(1, 13)),
+        "quarter_": list(range(1, 5)),
+        "time_of_day_": ["afternoon", "evening", "morning", "night"],
+    }
+
+    def __init__(self, timestamp_col: str, capacity: int = 1024) -> None:
+        """
+        One-hot encoded day of the week, month, quarter and time of day of
+        the millisecond timestamps in `timestamp_col`, always with the same
+        columns.
+
+        Parameters
+        ----------
+        timestamp_col : str
+            Column of the millisecond timestamps, like `open_timestamp`.
+        capacity : int
+            Number of timestamps to preallocate for. It grows as needed.
+        """
         super().__init__()
-        self.time_series = None
+        self.timestamps = None
         self.timestamp_col = timestamp_col
+        self.capacity = capacity
 
     def initialize(self, data):
-        self.time_series = self.to_dt_series(data[self.timestamp_col])
-        self.time_series.name = None
+        self.set_state(
+            {
+                "timestamps": np.asarray(
+                    data[self.timestamp_col], dtype=np.int64
+                )
+            }
+        )
 
-    @staticmethod
-    def to_dt_series(data) -> pd.Series:
-        return pd.Series(data).apply(DataLoader.timestamp_to_datetime)
+    def get_state(self):
+        assert self.timestamps is not None, "Initialize first."
+        return {"timestamps": self.timestamps.to_array()}
 
-    def add_value(self, data, purging: bool = False):
-        self.time_series = pd.concat(
-            (self.time_series, self.to_dt_series(data[self.timestamp_col])),
-            ignore_index=True,
+    def set_state(self, state):
+        timestamps = state["timestamps"]
+        self.timestamps = RingBuffer(
+            max(self.capacity, len(timestamps)), dtype=np.int64
         )
+        self.timestamps.extend(timestamps)
+
+    def add_value(self, data, purging: bool = False):
         if purging is True:
-            self.time_series = self.time_series.iloc[1:]
+            self.timestamps.popleft()
+        self.timestamps.extend(data[self.timestamp_col])
+
+    def add_values(self, data, purging: bool = False):
+        timestamps = np.asarray(data[self.timestamp_col], dtype=np.int64)
+        if purging is True:
+            n_rows = len(self.timestamps)
+            self.timestamps.popleft(len(timestamps))
+            timestamps = timestamps[max(0, len(timestamps) - n_rows) :]
+        self.timestamps.extend(timestamps)
+
+    @property
+    def time_series(self) -> pd.Series:
+        assert self.timestamps is not None, "Initialize first."
+        return DataLoader.timestamps_to_datetimes(
+            pd.Series(self.timestamps.to_array())
+        )
+
+    @classmethod
+    def categories(cls, timestamps: np.ndarray) -> Dict[str, np.ndarray]:
+        """Category of every millisecond timestamp, by one-hot prefix, as
+        its position in `CATEGORIES`."""
+        hours = timestamps // MILLISECONDS_PER_HOUR
+        months = (
+            timestamps.astype("datetime64[ms]")
+            .astype("datetime64[M]")
+            .astype(np.int64)
+        ) % 12
+        return {
+            # 1970-01-01 was a Thursday
+            "day_of_week_": (hours // 24 + 3) % 7,
+            "month_": months,
+            "quarter_": months // 3,
+            "time_of_day_": TIME_OF_DAY_BY_HOUR[hours % 24],
+        }
 
     @property
     def output_values(self):
-        assert self.time_series is not None, "Initialize first."
-        ts = self.time_series
-        time_of_day = ts.dt.hour.apply(DateTime.time_of_day)
+        assert self.timestamps is not None, "Initialize first."
+        categories = self.categories(self.timestamps.to_array())
         return {
-            **self.to_one_hot(ts.dt.dayofweek, "day_of_week_"),
-            **self.to_one_hot(ts.dt.month, "month_"),
-            **self.to_one_hot(ts.dt.quarter, "quarter_"),
-            **self.to_one_hot(time_of_day, "time_of_day_"),
+            f"{prefix}_{category}": (categories[prefix] == i)
+            .astype(float)
+            .tolist()
+            for prefix, i, category in self.one_hot_categories()
         }
 
+    @property
+    def output_names(self):
+        return [
+            f"{self.name}__{prefix}_{category}"
+            for prefix, _, category in self.one_hot_categories()
+        ]
+
+    def latest_values(self):
+        assert self.timestamps is not None, "Initialize first."
+        categories = self.categories(np.array([self.timestamps.last()]))
+        return [
+            float(categories[prefix][0] == i)
+            for prefix, i, _ in self.one_hot_categories()
+        ]
+
+    @property
+    def n_rows(self):
+        assert self.timestamps is not None, "Initialize first."
+        return len(self.timestamps)
+
+    def write_values(self, out):
+        assert self.timestamps is not None, "Initialize first."
+        categories = self.categories(self.timestamps.to_array())
+        for column, (prefix, i, _) in zip(out.T, self.one_hot_categories()):
+            column[:] = categories[prefix] == i
+
+    @classmethod
+    def one_hot_categories(cls):
+        """Prefix, position and category of every one-hot column."""
+        for prefix, categories in cls.CATEGORIES.items():
+            for i, category in enumerate(categories):
+                if i > 0:
+                    yield prefix, i, category
+
+    @property
+    def input_cols(self):
+        return [self.timestamp_col]
+
     @staticmethod
     def time_of_day(hour: int) -> str:
         if hour >= 5 and hour < 12:
@@ -51,18 +156,15 @@ class DateTime(FeatureGenerator):
         else:
             return "night"
 
-    @staticmethod
-    def to_one_hot(data, prefix: str = None) -> Dict[str, List[float]]:
-        series = pd.Series(data)
-        drop_first = series.nunique() > 1
-        one_hot_encoded = pd.get_dummies(
-            series, prefix=prefix, drop_first=drop_first
-        ).astype(float)
-        return {
-            col: one_hot_encoded[col].tolist()
-            for col in one_hot_encoded.columns
-        }
-
     @property
     def name(self):
         return "DateTime"
+
+
+# Position of the time of day of every hour in `DateTime.CATEGORIES`
+TIME_OF_DAY_BY_HOUR = np.array(
+    [
+        DateTime.CATEGORIES["time_of_day_"].index(DateTime.time_of_day(hour))
+        for hour in range(24)
+    ]
+)
@@ -0,0 +1,11 @@
+from src.features.feature_generators.news.embedding_cache import EmbeddingCache
+from src.features.feature_generators.news.encoders import (
+    TransformersSentimentEncoder,
+)
+from src.features.feature_generators.news.sentiment import NewsSentiment
+
+__all__ = [
+    "EmbeddingCache",
+    "NewsSentiment",
+    "TransformersSentimentEncoder",
+]
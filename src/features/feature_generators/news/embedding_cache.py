@@ -0,0 +1,55 @@
+import glob
+import os
+import uuid
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from src.atomic_write import atomic_write
+
+
+class EmbeddingCache:
+    def __init__(self, path: str):
+        """
+        On-disk memo of text embeddings by text hash, for one encoder.
+
+        Every batch of new embeddings is written to its own shard,
+        `{path}/{uuid}.npz`, holding the `hashes` and `vectors` arrays.
+        Shards are written atomically and never modified, so several
+        processes can share the cache.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the shards.
+        """
+        self.path = path
+        self.vectors = {}
+        self.load()
+
+    def load(self) -> None:
+        for shard in sorted(glob.glob(os.path.join(self.path, "*.npz"))):
+            with np.load(shard) as data:
+                self.vectors.update(zip(data["hashes"], data["vectors"]))
+
+    def __contains__(self, text_hash: str) -> bool:
+        return text_hash in self.vectors
+
+    def __getitem__(self, text_hash: str) -> np.ndarray:
+        return self.vectors[text_hash]
+
+    def update(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Add `(hash, vector)` pairs, like `dict.update`, as a new shard."""
+        items = dict(items)
+        self.vectors.update(items)
+        self.write_shard(
+            dict(
+                hashes=np.array(list(items)),
+                vectors=np.stack(list(items.values())),
+            )
+        )
+
+    def write_shard(self, arrays: Dict[str, np.ndarray]) -> None:
+        path = os.path.join(self.path, f"{uuid.uuid4()}.npz")
+        with atomic_write(path) as f:
+            np.savez(f, **arrays)
@@ -0,0 +1,58 @@
+from typing import List
+
+import numpy as np
+
+DEFAULT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+
+class TransformersSentimentEncoder:
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        batch_size: int = 64,
+        max_length: int = 128,
+    ):
+        """
+        Sentiment of texts with a local `transformers` text classification
+        model on the CPU, as `P(positive) - P(negative)` in `[-1, 1]`.
+
+        The model is only loaded on the first call, so that creating the
+        encoder, e.g. when all articles are cached already, is cheap.
+
+        Parameters
+        ----------
+        model : str
+            Hugging Face model name with `POSITIVE`/`NEGATIVE` labels.
+        batch_size : int
+            Number of texts per forward pass.
+        max_length : int
+            Texts are truncated to this many tokens.
+        """
+        self.model = model
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.pipeline = None
+
+    @property
+    def name(self) -> str:
+        return self.model.replace("/", "--")
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into an array of shape `(len(texts), 1)`."""
+        if self.pipeline is None:
+            from transformers import pipeline
+
+            self.pipeline = pipeline(
+                "text-classification", model=self.model, device=-1
+            )
+        results = self.pipeline(
+            texts,
+            batch_size=self.batch_size,
+            truncation=True,
+            max_length=self.max_length,
+        )
+        scores = [
+            r["score"] if r["label"].upper() == "POSITIVE" else -r["score"]
+            for r in results
+        ]
+        return np.array(scores, dtype=np.float32).reshape(-1, 1)
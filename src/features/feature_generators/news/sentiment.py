@@ -0,0 +1,301 @@
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.news.embedding_cache import EmbeddingCache
+from src.features.feature_generators.news.encoders import (
+    TransformersSentimentEncoder,
+)
+from src.features.ring_buffer import RingBuffer
+
+
+class NewsSentiment(FeatureGenerator):
+    def __init__(
+        self,
+        timestamp_col: str = "open_timestamp",
+        interval_ms: int = 60 * 1000,
+        decay: float = 0.99,
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+        n_dims: int = 1,
+        batch_size: int = 1024,
+        cache_path: Optional[str] = None,
+        text_fields: Sequence[str] = ("title", "description"),
+    ) -> None:
+        """
+        News headlines as features of candlesticks.
+
+        Articles, e.g. from `MediaStackNewsScraper`, are added with
+        `add_articles` and encoded in batches, once per distinct text. Their
+        vectors are summed per candlestick by publication time, and carried
+        over to later candlesticks with an exponential decay:
+            sum[t] = decay * sum[t - 1] + sum of the new articles
+        The features are the decayed mean vector, `score`, and the decayed
+        number of articles, `count`. Articles published during a candlestick
+        count towards that candlestick.
+
+        Parameters
+        ----------
+        timestamp_col : str
+            Column with the open timestamps of the candlesticks.
+        interval_ms : int
+            Length of a candlestick in milliseconds.
+        decay : float
+            Weight left of an article after every candlestick, in `[0, 1)`.
+        encoder : Callable, optional
+            Maps a list of texts to an array of shape `(n_texts, n_dims)`.
+            By default, the sentiment of `TransformersSentimentEncoder`.
+        n_dims : int
+            Size of the vectors of the `encoder`.
+        batch_size : int
+            Number of texts passed to the `encoder` at once.
+        cache_path : str, optional
+            Directory to memoize the vectors in, by text hash, so that
+            articles are never encoded twice across runs. By default, they
+            are only memoized in memory.
+        text_fields : Sequence[str]
+            Fields of an article that make up its text.
+        """
+        super().__init__()
+        self.timestamp_col = timestamp_col
+        self.interval_ms = interval_ms
+        self.decay = decay
+        self.encoder = encoder or TransformersSentimentEncoder()
+        self.n_dims = n_dims
+        self.batch_size = batch_size
+        self.text_fields = text_fields
+        encoder_name = getattr(
+            self.encoder, "name", type(self.encoder).__name__
+        )
+        self.memo = (
+            EmbeddingCache(os.path.join(cache_path, encoder_name))
+            if cache_path is not None
+            else {}
+        )
+        self.n_encoded = 0
+        # Articles that were not counted towards a candlestick yet
+        self.pending_timestamps = np.empty(0, dtype=np.int64)
+        self.pending_vectors = np.empty((0, n_dims))
+        self.sums = None
+        self.counts = None
+        self.validate()
+
+    def add_articles(self, articles: List[dict]) -> None:
+        """Encode articles that were not seen before and queue them for the
+        next candlesticks. Each article needs `published_at` and the
+        `text_fields`, like the MediaStack ones."""
+        if len(articles) == 0:
+            return
+        hashes = [self.text_hash(self.to_text(a)) for a in articles]
+        self.encode(
+            {
+                text_hash: self.to_text(article)
+                for text_hash, article in zip(hashes, articles)
+                if text_hash not in self.memo
+            }
+        )
+        vectors = np.stack([self.memo[text_hash] for text_hash in hashes])
+        timestamps = (
+            pd.to_datetime([a["published_at"] for a in articles], utc=True)
+            .as_unit("ms")
+            .asi8
+        )
+        self.pending_timestamps = np.concatenate(
+            (self.pending_timestamps, timestamps)
+        )
+        self.pending_vectors = np.concatenate((self.pending_vectors, vectors))
+
+    def encode(self, texts: Dict[str, str]) -> None:
+        hashes = list(texts)
+        for i in range(0, len(hashes), self.batch_size):
+            batch = hashes[i : i + self.batch_size]
+            vectors = np.asarray(self.encoder([texts[h] for h in batch]))
+            self.memo.update(zip(batch, vectors))
+            self.n_encoded += len(batch)
+
+    def initialize(self, data):
+        timestamps = np.asarray(data[self.timestamp_col], dtype=np.int64)
+        self.sums = RingBuffer(len(timestamps), shape=(self.n_dims,))
+        self.counts = RingBuffer(len(timestamps))
+        if len(timestamps) == 0:
+            # The pending articles are counted from the first added row on
+            return
+        first = timestamps[0]
+        article_timestamps, vectors = self.pop_pending(
+            timestamps[-1] + self.interval_ms
+        )
+        rows = np.searchsorted(timestamps, article_timestamps, "right") - 1
+        before = rows < 0
+        sums = np.zeros((len(timestamps), self.n_dims))
+        np.add.at(sums, rows[~before], vectors[~before])
+        counts = np.bincount(rows[~before], minlength=len(timestamps))
+        # Articles from before the first candlestick, decayed up to it
+        weights = self.decay ** self.age(article_timestamps[before], first)
+        initial_sum = weights @ vectors[before]
+        initial_count = weights.sum()
+        decayed_sums, _ = lfilter(
+            [1.0],
+            [1.0, -self.decay],
+            sums,
+            axis=0,
+            zi=initial_sum[np.newaxis],
+        )
+        decayed_counts, _ = lfilter(
+            [1.0], [1.0, -self.decay], counts, zi=[initial_count]
+        )
+        self.sums.extend(decayed_sums)
+        self.counts.extend(decayed_counts)
+
+    def add_value(self, data, purging: bool = False):
+        timestamp = int(data[self.timestamp_col])
+        article_timestamps, vectors = self.pop_pending(
+            timestamp + self.interval_ms
+        )
+        weights = self.decay ** self.age(article_timestamps, timestamp)
+        last_sum, last_count = self.last_state()
+        new_sum = self.decay * last_sum + weights @ vectors
+        new_count = self.decay * last_count + weights.sum()
+        if purging is True:
+            self.sums.popleft()
+            self.counts.popleft()
+        self.sums.append(new_sum)
+        self.counts.append(new_count)
+
+    def add_values(self, data, purging: bool = False):
+        timestamps = np.asarray(data[self.timestamp_col], dtype=np.int64)
+        if len(timestamps) == 0:
+            return
+        article_timestamps, vectors = self.pop_pending(
+            timestamps[-1] + self.interval_ms
+        )
+        # Row of every article, the first one that it is due at
+        rows = np.searchsorted(
+            timestamps + self.interval_ms, article_timestamps, "right"
+        )
+        weights = self.decay ** self.age(article_timestamps, timestamps[rows])
+        sums = np.zeros((len(timestamps), self.n_dims))
+        np.add.at(sums, rows, weights[:, np.newaxis] * vectors)
+        counts = np.bincount(rows, weights, minlength=len(timestamps))
+        last_sum, last_count = self.last_state()
+        decayed_sums, _ = lfilter(
+            [1.0],
+            [1.0, -self.decay],
+            sums,
+            axis=0,
+            zi=self.decay * last_sum[np.newaxis],
+        )
+        decayed_counts, _ = lfilter(
+            [1.0], [1.0, -self.decay], counts, zi=[self.decay * last_count]
+        )
+        if purging is True:
+            n_rows = len(self.counts)
+            self.sums.popleft(len(timestamps))
+            self.counts.popleft(len(timestamps))
+            # Rows older than the window are dropped too
+            start = max(0, len(timestamps) - n_rows)
+            decayed_sums, decayed_counts = (
+                decayed_sums[start:],
+                decayed_counts[start:],
+            )
+        self.sums.extend(decayed_sums)
+        self.counts.extend(decayed_counts)
+
+    def last_state(self):
+        """Decayed sum and count of the last candlestick, zeros before the
+        first one."""
+        assert self.sums is not None, "Initialize first."
+        if len(self.counts) == 0:
+            return np.zeros(self.n_dims), 0.0
+        return self.sums.last(), self.counts.last()
+
+    def pop_pending(self, end: int):
+        """Take the pending articles published before `end`."""
+        is_due = self.pending_timestamps < end
+        due = self.pending_timestamps[is_due], self.pending_vectors[is_due]
+        self.pending_timestamps = self.pending_timestamps[~is_due]
+        self.pending_vectors = self.pending_vectors[~is_due]
+        return due
+
+    def age(
+        self, article_timestamps: np.ndarray, timestamp: int
+    ) -> np.ndarray:
+        """Number of candlesticks from the articles up to the candlestick at
+        `timestamp`, 0 for articles published during it."""
+        return np.maximum(
+            0, -((article_timestamps - timestamp) // self.interval_ms)
+        )
+
+    def to_text(self, article: dict) -> str:
+        return ". ".join(
+            article[field] for field in self.text_fields if article.get(field)
+        )
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @property
+    def output_values(self):
+        assert self.sums is not None, "Initialize first."
+        counts = self.counts.to_array()
+        sums = self.sums.to_array()
+        scores = np.divide(
+            sums,
+            counts[:, np.newaxis],
+            out=np.zeros_like(sums),
+            where=counts[:, np.newaxis] > 0,
+        )
+        output = {
+            key: scores[:, i].tolist() for i, key in enumerate(self.score_keys)
+        }
+        return {**output, "count": counts.tolist()}
+
+    @property
+    def score_keys(self) -> List[str]:
+        if self.n_dims == 1:
+            return ["score"]
+        return [f"score_{i}" for i in range(self.n_dims)]
+
+    @property
+    def output_names(self):
+        return [f"{self.name}__{key}" for key in self.score_keys + ["count"]]
+
+    def latest_values(self):
+        assert self.sums is not None, "Initialize first."
+        count = float(self.counts.last())
+        scores = (
+            self.sums.last() / count if count > 0 else np.zeros(self.n_dims)
+        )
+        return [*scores.tolist(), count]
+
+    @property
+    def n_rows(self):
+        assert self.sums is not None, "Initialize first."
+        return len(self.counts)
+
+    def write_values(self, out):
+        assert self.sums is not None, "Initialize first."
+        counts = self.counts.to_array()
+        sums = self.sums.to_array()
+        scores = out[:, : self.n_dims]
+        scores[:] = 0.0
+        np.divide(
+            sums,
+            counts[:, np.newaxis],
+            out=scores,
+            where=counts[:, np.newaxis] > 0,
+        )
+        out[:, self.n_dims] = counts
+
+    @property
+    def name(self):
+        return f"NewsSentiment__decay_{self.decay}"
+
+    def validate(self):
+        assert (
+            0 <= self.decay < 1
+        ), f"Decay must be in [0, 1), got {self.decay}."
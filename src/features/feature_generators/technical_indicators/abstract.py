@@ -0,0 +1,173 @@
+import pickle
+from abc import abstractmethod, abstractproperty
+from typing import Any, List
+
+import numpy as np
+
+from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.ring_buffer import RingBuffer
+
+
+class TechnicalIndicator(FeatureGenerator):
+    """
+    Feature generator of a talipp indicator.
+
+    The outputs of the whole history are kept in `outputs`, a ring buffer
+    with a row per value of talipp's `output_values`. `talipp_instance`
+    only holds the last rows, the ones it needs to compute the next values
+    in `add_value`, so that building it does not depend on the length of
+    the history, and neither does restoring it with `set_state`.
+
+    Purging drops rows like talipp's `purge_oldest` on the whole history.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.talipp_instance = None
+        self.outputs = None
+        # Number of rows, like the length of talipp's `input_values`
+        self.n_inputs = 0
+
+    @abstractproperty
+    def talipp_window(self) -> int:
+        """Number of the last rows that `talipp_instance` keeps at least.
+        More than every period that talipp compares its number of inputs
+        with, so that it computes the next values as on the whole
+        history."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def talipp_input(self, data: Any) -> Any:
+        """Input value of talipp for the row `data`."""
+        raise NotImplementedError()
+
+    def output_row(self, value: Any, input_value: Any) -> Any:
+        """Row of `outputs` for the output `value` of talipp, computed
+        from `input_value`."""
+        return value
+
+    def talipp_start(self, n_rows: int) -> int:
+        """Number of the oldest of `n_rows` rows left out of
+        `talipp_instance`."""
+        return max(0, n_rows - self.talipp_window)
+
+    def reset(
+        self, talipp_instance: Any, outputs: np.ndarray, n_rows: int
+    ) -> None:
+        """Start over, at the end of `initialize`.
+
+        Parameters
+        ----------
+        talipp_instance : Indicator
+            talipp indicator on the rows after `talipp_start(n_rows)`, with
+            the oldest values of every list left out.
+        outputs : np.ndarray
+            Rows of talipp's `output_values` on the whole history.
+        n_rows : int
+            Number of rows of the history.
+        """
+        self.talipp_instance = talipp_instance
+        # One more, so that purging in `add_value` never grows it
+        self.outputs = RingBuffer(len(outputs) + 1, shape=outputs.shape[1:])
+        self.outputs.extend(outputs)
+        self.n_inputs = n_rows
+
+    def add_value(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        n_outputs = len(talipp.output_values)
+        talipp.add_input_value(self.talipp_input(data))
+        self.n_inputs += 1
+        if len(talipp.output_values) > n_outputs:
+            self.outputs.append(
+                self.output_row(
+                    talipp.output_values[-1], talipp.input_values[-1]
+                )
+            )
+        if purging is True:
+            self.purge_oldest()
+        self.trim_talipp()
+
+    def extend(
+        self, outputs: np.ndarray, n_rows: int, purging: bool = False
+    ) -> None:
+        """Add the outputs of `n_rows` new rows, at the end of `add_values`,
+        once they were added to `talipp_instance`."""
+        self.outputs.extend(outputs)
+        self.n_inputs += n_rows
+        if purging is True:
+            self.purge_oldest(n_rows)
+        self.trim_talipp()
+
+    def purge_oldest(self, n_rows: int = 1) -> None:
+        """Drop the `n_rows` oldest rows from the history, in constant
+        time."""
+        self.n_inputs = max(0, self.n_inputs - n_rows)
+        self.outputs.popleft(n_rows)
+        # talipp keeps no more rows than there are
+        n_extra = len(self.talipp_instance.input_values) - self.n_inputs
+        if n_extra > 0:
+            self.talipp_instance.purge_oldest(n_extra)
+
+    def trim_talipp(self) -> None:
+        """Drop the rows of `talipp_instance` before the last
+        `talipp_window`, once there are as many, so that they are dropped
+        in constant amortized time."""
+        n_extra = len(self.talipp_instance.input_values) - self.talipp_window
+        if n_extra >= self.talipp_window:
+            self.talipp_instance.purge_oldest(n_extra)
+
+    def get_state(self):
+        assert self.outputs is not None, "Initialize first."
+        return {
+            "outputs": self.outputs.to_array(),
+            "n_inputs": np.array(self.n_inputs),
+            # Only the last rows, small
+            "talipp_instance": np.frombuffer(
+                pickle.dumps(self.talipp_instance), dtype=np.uint8
+            ),
+        }
+
+    def set_state(self, state):
+        self.reset(
+            pickle.loads(state["talipp_instance"].tobytes()),
+            state["outputs"],
+            int(state["n_inputs"]),
+        )
+
+    @property
+    def output_names(self):
+        return [self.name]
+
+    def latest_values(self):
+        assert self.outputs is not None, "Initialize first."
+        if len(self.outputs) == 0:
+            return len(self.output_names) * [np.nan]
+        return np.atleast_1d(self.outputs.last()).tolist()
+
+    @property
+    def n_rows(self):
+        assert self.outputs is not None, "Initialize first."
+        return self.n_inputs
+
+    def write_values(self, out):
+        assert self.outputs is not None, "Initialize first."
+        for column, values in zip(out.T, self.output_columns()):
+            self.write_column(column, values)
+
+    def output_columns(self) -> np.ndarray:
+        """Columns of `outputs`, an array per output."""
+        assert self.outputs is not None, "Initialize first."
+        outputs = self.outputs.to_array()
+        return outputs.T if outputs.ndim == 2 else outputs[np.newaxis]
+
+    def output_lists(self) -> List[List[float]]:
+        """Columns of `outputs`, as lists with `np.nan` for NaN, like
+        `output_values`."""
+        return [self.to_list(values) for values in self.output_columns()]
+
+    @staticmethod
+    def to_list(values: np.ndarray) -> List[float]:
+        output = values.tolist()
+        for i in np.flatnonzero(np.isnan(values)):
+            output[i] = np.nan
+        return output
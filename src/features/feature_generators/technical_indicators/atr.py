@@ -2,10 +2,13 @@ import numpy as np
 from talipp.indicators import ATR as ATR_talipp
 from talipp.ohlcv import OHLCVFactory
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class ATR(FeatureGenerator):
+class ATR(TechnicalIndicator):
     """
     Average True Range.
     """
@@ -14,42 +17,80 @@ class ATR(FeatureGenerator):
         self, high_col: str, low_col: str, close_col: str, period: int = 14
     ) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.high_col = high_col
         self.low_col = low_col
         self.close_col = close_col
         self.period = period
 
     def initialize(self, data):
-        input_values = OHLCVFactory.from_dict(
-            {
-                "high": data[self.high_col],
-                "low": data[self.low_col],
-                "close": data[self.close_col],
-            }
-        )
-        self.talipp_instance = ATR_talipp(
-            input_values=input_values,
-            period=self.period,
+        columns = self.columns(data)
+        true_range = kernels.compute(data, self.kernel_calls["true_range"])
+        atr = kernels.atr(true_range, self.period)[self.period - 1 :]
+        start = self.talipp_start(len(true_range))
+        talipp = ATR_talipp(period=self.period)
+        talipp.input_values = OHLCVFactory.from_dict(
+            {col: values[start:] for col, values in columns.items()}
         )
+        talipp.tr.extend(true_range[start:].tolist())
+        talipp.output_values = atr[start:].tolist()
+        self.reset(talipp, atr, len(true_range))
 
-    def add_value(self, data, purging: bool = False):
-        new_value = OHLCVFactory.from_dict(
+    def columns(self, data):
+        return {
+            "high": np.asarray(data[self.high_col], dtype=float),
+            "low": np.asarray(data[self.low_col], dtype=float),
+            "close": np.asarray(data[self.close_col], dtype=float),
+        }
+
+    def talipp_input(self, data):
+        return OHLCVFactory.from_dict(
             {
                 "high": [data[self.high_col]],
                 "low": [data[self.low_col]],
                 "close": [data[self.close_col]],
             }
-        )
-        self.talipp_instance.add_input_value(new_value)
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+        )[0]
+
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.output_values) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        columns = self.columns(data)
+        previous = talipp.input_values[-1]
+        true_range = kernels.true_range(
+            *(
+                np.concatenate(([getattr(previous, col)], values))
+                for col, values in columns.items()
+            )
+        )[1:]
+        atr = kernels.wilder(true_range, self.period, talipp.output_values[-1])
+        talipp.input_values.extend(OHLCVFactory.from_dict(columns))
+        talipp.tr.extend(true_range.tolist())
+        talipp.output_values.extend(atr.tolist())
+        self.extend(atr, len(true_range), purging)
+
+    @property
+    def talipp_window(self):
+        return self.period + 1
+
+    @property
+    def input_cols(self):
+        return [self.high_col, self.low_col, self.close_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "true_range": kernels.KernelCall(
+                kernels.true_range,
+                (self.high_col, self.low_col, self.close_col),
+            )
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
         nans = (self.period - 1) * [np.nan]
-        return nans + self.talipp_instance.output_values
+        return nans + self.output_lists()[0]
 
     @property
     def name(self):
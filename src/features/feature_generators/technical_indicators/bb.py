@@ -1,42 +1,155 @@
 import numpy as np
 from talipp.indicators import BB as BB_talipp
+from talipp.indicators.BB import BBVal
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class BB(FeatureGenerator):
+class BB(TechnicalIndicator):
     def __init__(
         self, input_col: str, period: int = 14, std_dev_multiplier: int = 2
     ) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.input_col = input_col
         self.period = period
         self.std_dev_multiplier = std_dev_multiplier
 
     def initialize(self, data):
-        self.talipp_instance = BB_talipp(
-            input_values=data[self.input_col],
+        values = np.asarray(data[self.input_col], dtype=float)
+        central_band = kernels.compute(
+            data, self.kernel_calls["central_band"]
+        )[self.period - 1 :]
+        std_dev = kernels.compute(data, self.kernel_calls["std_dev"])[
+            self.period - 1 :
+        ]
+        width = self.std_dev_multiplier * std_dev
+        lower, upper = central_band - width, central_band + width
+        start = self.talipp_start(len(values))
+        talipp = BB_talipp(
             period=self.period,
             std_dev_multiplier=self.std_dev_multiplier,
         )
+        # Every indicator appends to its own list of inputs
+        talipp.input_values = values[start:].tolist()
+        talipp.central_band.input_values = values[start:].tolist()
+        talipp.central_band.output_values = central_band[start:].tolist()
+        talipp.std_dev.input_values = values[start:].tolist()
+        talipp.std_dev.output_values = std_dev[start:].tolist()
+        talipp.output_values = list(
+            map(
+                BBVal,
+                lower[start:].tolist(),
+                central_band[start:].tolist(),
+                upper[start:].tolist(),
+            )
+        )
+        self.reset(
+            talipp,
+            self.band_outputs(
+                lower, central_band, upper, values[self.period - 1 :]
+            ),
+            len(values),
+        )
+
+    def band_outputs(
+        self,
+        lower: np.ndarray,
+        middle: np.ndarray,
+        upper: np.ndarray,
+        price: np.ndarray,
+    ) -> np.ndarray:
+        """Rows of `outputs` for the bands, and the input values at the
+        same rows."""
+        return np.column_stack((lower, middle, upper))
+
+    def talipp_input(self, data):
+        return data[self.input_col]
+
+    def output_row(self, value, input_value):
+        return self.band_outputs(
+            np.array([value.lb]),
+            np.array([value.cb]),
+            np.array([value.ub]),
+            np.array([input_value]),
+        )[0]
 
-    def add_value(self, data, purging: bool = False):
-        self.talipp_instance.add_input_value(data[self.input_col])
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.output_values) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        values = np.asarray(data[self.input_col], dtype=float)
+        central_band = kernels.sma_continued(
+            np.concatenate(
+                (talipp.central_band.input_values[-self.period :], values)
+            ),
+            self.period,
+            talipp.central_band.output_values[-1],
+        )
+        previous = talipp.std_dev.input_values
+        std_dev = kernels.std(
+            np.concatenate(
+                (previous[len(previous) - self.period + 1 :], values)
+            ),
+            self.period,
+        )[self.period - 1 :]
+        width = self.std_dev_multiplier * std_dev
+        lower, upper = central_band - width, central_band + width
+        for indicator in (talipp, talipp.central_band, talipp.std_dev):
+            indicator.input_values.extend(values.tolist())
+        talipp.central_band.output_values.extend(central_band.tolist())
+        talipp.std_dev.output_values.extend(std_dev.tolist())
+        with kernels.paused_gc():
+            talipp.output_values.extend(
+                map(
+                    BBVal,
+                    lower.tolist(),
+                    central_band.tolist(),
+                    upper.tolist(),
+                )
+            )
+        self.extend(
+            self.band_outputs(lower, central_band, upper, values),
+            len(values),
+            purging,
+        )
+
+    @property
+    def talipp_window(self):
+        return self.period + 1
+
+    @property
+    def input_cols(self):
+        return [self.input_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "central_band": kernels.KernelCall(
+                kernels.sma, (self.input_col,), (self.period,)
+            ),
+            "std_dev": kernels.KernelCall(
+                kernels.std, (self.input_col,), (self.period,)
+            ),
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
         nans = (self.period - 1) * [np.nan]
-        values = self.talipp_instance.output_values
+        lower, middle, upper = self.output_lists()
         return {
-            "lower": nans + [v.lb for v in values],
-            "middle": nans + [v.cb for v in values],
-            "upper": nans + [v.ub for v in values],
+            "lower": nans + lower,
+            "middle": nans + middle,
+            "upper": nans + upper,
         }
 
+    @property
+    def output_names(self):
+        return [f"{self.name}__{key}" for key in ("lower", "middle", "upper")]
+
     @property
     def name(self):
         return (
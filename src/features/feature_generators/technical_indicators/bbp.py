@@ -1,10 +1,9 @@
 import numpy as np
-from talipp.indicators import BB as BB_talipp
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators.bb import BB
 
 
-class BBP(FeatureGenerator):
+class BBP(BB):
     """
     Bollinger Bands Percentile.
     """
@@ -12,39 +11,24 @@ class BBP(FeatureGenerator):
     def __init__(
         self, input_col: str, period: int = 200, std_dev_multiplier: int = 2
     ) -> None:
-        super().__init__()
-        self.talipp_instance = None
-        self.input_col = input_col
-        self.period = period
-        self.std_dev_multiplier = std_dev_multiplier
-
-    def initialize(self, data):
-        self.talipp_instance = BB_talipp(
-            input_values=data[self.input_col],
-            period=self.period,
-            std_dev_multiplier=self.std_dev_multiplier,
-        )
+        super().__init__(input_col, period, std_dev_multiplier)
 
-    def add_value(self, data, purging: bool = False):
-        self.talipp_instance.add_input_value(data[self.input_col])
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+    def band_outputs(self, lower, middle, upper, price):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                (upper - lower) != 0,
+                (price - lower) / (upper - lower),
+                0.5,  # return 0.5 if range is 0
+            )
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
-        offset_idx = self.period - 1
-        nans = offset_idx * [np.nan]
-        values = self.talipp_instance.output_values
-        lower = np.array([v.lb for v in values])
-        upper = np.array([v.ub for v in values])
-        price = np.array(self.talipp_instance.input_values[offset_idx:])
-        bb_percentile = np.where(
-            (upper - lower) != 0,
-            (price - lower) / (upper - lower),
-            0.5,  # return 0.5 if range is 0
-        )
-        return nans + bb_percentile.tolist()
+        nans = (self.period - 1) * [np.nan]
+        return nans + self.output_lists()[0]
+
+    @property
+    def output_names(self):
+        return [self.name]
 
     @property
     def name(self):
@@ -1,32 +1,65 @@
 import numpy as np
 from talipp.indicators import EMA as EMA_talipp
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class EMA(FeatureGenerator):
+class EMA(TechnicalIndicator):
     def __init__(self, input_col: str, period: int) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.input_col = input_col
         self.period = period
 
     def initialize(self, data):
-        self.talipp_instance = EMA_talipp(
-            input_values=data[self.input_col],
-            period=self.period,
+        values = np.asarray(data[self.input_col], dtype=float)
+        ema = kernels.compute(data, self.kernel_calls["ema"])[
+            self.period - 1 :
+        ]
+        start = self.talipp_start(len(values))
+        talipp = EMA_talipp(period=self.period)
+        talipp.input_values = values[start:].tolist()
+        talipp.output_values = ema[start:].tolist()
+        self.reset(talipp, ema, len(values))
+
+    def talipp_input(self, data):
+        return data[self.input_col]
+
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.output_values) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        values = np.asarray(data[self.input_col], dtype=float)
+        ema = kernels.ema_continued(
+            values, self.period, talipp.output_values[-1]
         )
+        talipp.input_values.extend(values.tolist())
+        talipp.output_values.extend(ema.tolist())
+        self.extend(ema, len(values), purging)
+
+    @property
+    def talipp_window(self):
+        return self.period + 1
 
-    def add_value(self, data, purging: bool = False):
-        self.talipp_instance.add_input_value(data[self.input_col])
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+    @property
+    def input_cols(self):
+        return [self.input_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "ema": kernels.KernelCall(
+                kernels.ema, (self.input_col,), (self.period,)
+            )
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
         nans = (self.period - 1) * [np.nan]
-        return nans + self.talipp_instance.output_values
+        return nans + self.output_lists()[0]
 
     @property
     def name(self):
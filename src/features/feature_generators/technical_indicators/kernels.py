@@ -0,0 +1,287 @@
+"""
+NumPy versions of the talipp indicators, to initialize the feature generators
+on a whole history at once. They return arrays aligned with the input, with
+NaN where talipp has no value yet.
+"""
+import gc
+import itertools
+from contextlib import contextmanager
+from typing import Any, Callable, NamedTuple, Tuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+@contextmanager
+def paused_gc():
+    """Pause the garbage collector, e.g. while creating millions of talipp
+    value objects, which otherwise triggers many needless collections."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def sequential_sum(values: np.ndarray) -> float:
+    """Sum from left to right, like Python's `sum`, unlike `np.sum`."""
+    return float(np.cumsum(values)[-1]) if len(values) > 0 else 0.0
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average, updated from the previous one like talipp:
+    `y[t] = y[t - 1] - (x[t - period] - x[t]) / period`."""
+    output = np.full(len(values), np.nan)
+    if len(values) < period:
+        return output
+    initial = sequential_sum(values[:period]) / period
+    output[period - 1] = initial
+    output[period:] = sma_continued(values, period, initial)
+    return output
+
+
+def sma_continued(
+    values: np.ndarray, period: int, previous: float
+) -> np.ndarray:
+    """Simple moving average of `values[period:]`, continued from
+    `previous`, the one of the first `period` values."""
+    changes = (values[:-period] - values[period:]) / float(period)
+    return np.cumsum(np.concatenate(([previous], -changes)))[1:]
+
+
+def std(values: np.ndarray, period: int) -> np.ndarray:
+    """Rolling population standard deviation, around a fresh mean of every
+    window like talipp, not the `sma`, which drifts in the last digits."""
+    output = np.full(len(values), np.nan)
+    if len(values) < period:
+        return output
+    n_windows = len(values) - period + 1
+    windows = [values[i : i + n_windows] for i in range(period)]
+    # Summed from left to right, like talipp
+    mean = sum(windows) / period
+    squares = sum((window - mean) ** 2 for window in windows)
+    output[period - 1 :] = np.sqrt(squares / period)
+    return output
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average, starting from the mean of the first
+    `period` values."""
+    output = np.full(len(values), np.nan)
+    if len(values) < period:
+        return output
+    initial = sequential_sum(values[:period]) / period
+    output[period - 1] = initial
+    output[period:] = ema_continued(values[period:], period, initial)
+    return output
+
+
+def ema_continued(
+    values: np.ndarray, period: int, previous: float
+) -> np.ndarray:
+    """Exponential moving average of `values`, continued from `previous`,
+    the one of the values before them."""
+    mult = 2.0 / (period + 1.0)
+    return recursive(values, mult, 1.0 - mult, previous)
+
+
+def wilder(values: np.ndarray, period: int, initial: float) -> np.ndarray:
+    """Wilder's smoothing `y[t] = (y[t - 1] * (period - 1) + x[t]) / period`,
+    starting from `initial`.
+
+    Unlike the other kernels, this is a scalar loop: rewritten as a linear
+    filter, the recursion rounds differently from talipp.
+    """
+    averages = itertools.accumulate(
+        values.tolist(),
+        lambda average, value: (average * (period - 1) + value) / period,
+        initial=initial,
+    )
+    next(averages)  # Skip `initial`
+    return np.fromiter(averages, dtype=float, count=len(values))
+
+
+def recursive(
+    values: np.ndarray, mult: float, decay: float, initial: float
+) -> np.ndarray:
+    """`y[t] = mult * x[t] + decay * y[t - 1]`, with `y[-1] = initial`, as a
+    linear filter. It rounds exactly like the loop would."""
+    if len(values) == 0:
+        return np.empty(0)
+    output, _ = lfilter([mult], [1.0, -decay], values, zi=[decay * initial])
+    return output
+
+
+def rsi(values: np.ndarray, period: int):
+    """Relative Strength Index.
+
+    Returns
+    -------
+    RSI and the average gains and losses that talipp keeps, starting from
+    the initial ones.
+    """
+    output = np.full(len(values), np.nan)
+    if len(values) < period + 1:
+        return output, np.empty(0), np.empty(0)
+    gains, losses = gains_and_losses(values)
+    initial_gain = sequential_sum(gains[: period - 1]) / (period - 1)
+    initial_loss = sequential_sum(losses[: period - 1]) / (period - 1)
+    output[period:], avg_gain, avg_loss = rsi_continued(
+        values[period - 1 :], period, initial_gain, initial_loss
+    )
+    return (
+        output,
+        np.concatenate(([initial_gain], avg_gain)),
+        np.concatenate(([initial_loss], avg_loss)),
+    )
+
+
+def rsi_continued(
+    values: np.ndarray, period: int, avg_gain: float, avg_loss: float
+):
+    """Relative Strength Index of `values[1:]`, continued from the average
+    gain and loss up to `values[0]`.
+
+    Returns
+    -------
+    RSI, average gains and average losses, aligned with `values[1:]`.
+    """
+    gains, losses = gains_and_losses(values)
+    avg_gains = wilder(gains, period, avg_gain)
+    avg_losses = wilder(losses, period, avg_loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        output = np.where(
+            avg_losses == 0,
+            100.0,
+            100.0 - 100.0 / (1.0 + avg_gains / avg_losses),
+        )
+    return output, avg_gains, avg_losses
+
+
+def gains_and_losses(values: np.ndarray):
+    changes = np.diff(values)
+    return (
+        np.where(changes > 0, changes, 0.0),
+        np.where(changes < 0, -changes, 0.0),
+    )
+
+
+def true_range(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray
+) -> np.ndarray:
+    output = high - low
+    previous_close = close[:-1]
+    output[1:] = np.maximum(
+        output[1:],
+        np.maximum(
+            np.abs(high[1:] - previous_close),
+            np.abs(low[1:] - previous_close),
+        ),
+    )
+    return output
+
+
+def atr(true_ranges: np.ndarray, period: int) -> np.ndarray:
+    """Average True Range, from the true ranges."""
+    output = np.full(len(true_ranges), np.nan)
+    if len(true_ranges) < period:
+        return output
+    initial = sequential_sum(true_ranges[:period]) / period
+    output[period - 1] = initial
+    output[period:] = wilder(true_ranges[period:], period, initial)
+    return output
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On Balance Volume."""
+    if len(close) == 0:
+        return np.empty(0)
+    return np.concatenate(
+        (volume[:1], obv_continued(close, volume[1:], volume[0]))
+    )
+
+
+def obv_continued(
+    close: np.ndarray, volume: np.ndarray, previous: float
+) -> np.ndarray:
+    """On Balance Volume of `close[1:]`, with the volumes `volume`,
+    continued from `previous`, the one up to `close[0]`."""
+    current, before = close[1:], close[:-1]
+    signed_volume = np.where(
+        current == before, 0.0, np.where(current > before, volume, -volume)
+    )
+    return np.cumsum(np.concatenate(([previous], signed_volume)))[1:]
+
+
+def typical_price(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray
+) -> np.ndarray:
+    return (high + low + close) / 3.0
+
+
+class KernelCall(NamedTuple):
+    """A kernel applied to input columns, with fixed parameters."""
+
+    kernel: Callable
+    input_cols: Tuple[str, ...]
+    params: Tuple[Any, ...] = ()
+
+    def __str__(self):
+        args = ", ".join(map(str, self.input_cols + self.params))
+        return f"{self.kernel.__name__}({args})"
+
+
+class ComputationGraph:
+    def __init__(self, data: Any):
+        """
+        Input of `FeatureGenerator.initialize` that runs every distinct
+        kernel call once, and shares the result between all the generators
+        that make it, like the EMA of an `EMA` and of a `MACD` on the same
+        column and period. Columns are read from `data` as usual.
+
+        The results are read-only arrays, as they are shared.
+        """
+        self.data = data
+        self.columns = {}
+        self.results = {}
+        self.n_calls = 0
+
+    def __getitem__(self, col: str) -> Any:
+        return self.data[col]
+
+    def column(self, col: str) -> np.ndarray:
+        if col not in self.columns:
+            self.columns[col] = np.asarray(self.data[col], dtype=float)
+        return self.columns[col]
+
+    def compute(self, call: KernelCall) -> Any:
+        self.n_calls += 1
+        if call not in self.results:
+            self.add_result(
+                call,
+                call.kernel(
+                    *(self.column(col) for col in call.input_cols),
+                    *call.params,
+                ),
+            )
+        return self.results[call]
+
+    def add_result(self, call: KernelCall, result: Any) -> None:
+        """Share a result that was computed elsewhere, e.g. in another
+        process."""
+        for array in result if isinstance(result, tuple) else [result]:
+            array.flags.writeable = False
+        self.results[call] = result
+
+
+def compute(data: Any, call: KernelCall) -> Any:
+    """Result of the kernel call on `data`, shared with the other
+    generators if `data` is a `ComputationGraph`."""
+    if isinstance(data, ComputationGraph):
+        return data.compute(call)
+    return call.kernel(
+        *(np.asarray(data[col], dtype=float) for col in call.input_cols),
+        *call.params,
+    )
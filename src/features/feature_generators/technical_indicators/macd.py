@@ -1,12 +1,14 @@
-from typing import Any, List
-
 import numpy as np
 from talipp.indicators import MACD as MACD_talipp
+from talipp.indicators.MACD import MACDVal
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class MACD(FeatureGenerator):
+class MACD(TechnicalIndicator):
     def __init__(
         self,
         input_col: str,
@@ -15,40 +17,126 @@ class MACD(FeatureGenerator):
         signal_period: int = 9,
     ) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.input_col = input_col
         self.fast_period = fast_period
         self.slow_period = slow_period
         self.signal_period = signal_period
 
     def initialize(self, data):
-        self.talipp_instance = MACD_talipp(
-            input_values=data[self.input_col],
+        values = np.asarray(data[self.input_col], dtype=float)
+        ema_fast = kernels.compute(data, self.kernel_calls["ema_fast"])
+        ema_slow = kernels.compute(data, self.kernel_calls["ema_slow"])
+        # MACD starts once both moving averages have values
+        macd = (ema_fast - ema_slow)[self.macd_start :]
+        signal = kernels.ema(macd, self.signal_period)
+        histogram = macd - signal
+        start = self.talipp_start(len(values))
+        talipp = MACD_talipp(
             fast_period=self.fast_period,
             slow_period=self.slow_period,
             signal_period=self.signal_period,
         )
+        talipp.input_values = values[start:].tolist()
+        self.set_ema_state(talipp.ema_fast, values, ema_fast, start)
+        self.set_ema_state(talipp.ema_slow, values, ema_slow, start)
+        self.set_ema_state(talipp.signal_line, macd, signal, start)
+        talipp.output_values = [
+            # talipp has None, not NaN, until the signal line starts
+            MACDVal(*(None if np.isnan(value) else value for value in row))
+            for row in zip(
+                macd[start:].tolist(),
+                signal[start:].tolist(),
+                histogram[start:].tolist(),
+            )
+        ]
+        self.reset(
+            talipp, np.column_stack((macd, signal, histogram)), len(values)
+        )
+
+    @property
+    def macd_start(self) -> int:
+        """First row with a MACD value."""
+        return max(self.fast_period, self.slow_period) - 1
+
+    @staticmethod
+    def set_ema_state(ema, input_values, output_values, start):
+        ema.input_values = input_values[start:].tolist()
+        ema.output_values = output_values[ema.period - 1 :][start:].tolist()
+
+    def talipp_input(self, data):
+        return data[self.input_col]
+
+    def output_row(self, value, input_value):
+        return np.array(
+            [value.macd, value.signal, value.histogram], dtype=float
+        )
 
-    def add_value(self, data, purging: bool = False):
-        self.talipp_instance.add_input_value(data[self.input_col])
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.signal_line.output_values) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        values = np.asarray(data[self.input_col], dtype=float)
+        ema_fast = self.extend_ema_state(talipp.ema_fast, values)
+        ema_slow = self.extend_ema_state(talipp.ema_slow, values)
+        macd = ema_fast - ema_slow
+        signal = self.extend_ema_state(talipp.signal_line, macd)
+        histogram = macd - signal
+        talipp.input_values.extend(values.tolist())
+        with kernels.paused_gc():
+            talipp.output_values.extend(
+                map(
+                    MACDVal, macd.tolist(), signal.tolist(), histogram.tolist()
+                )
+            )
+        self.extend(
+            np.column_stack((macd, signal, histogram)), len(values), purging
+        )
+
+    @staticmethod
+    def extend_ema_state(ema, input_values):
+        output_values = kernels.ema_continued(
+            input_values, ema.period, ema.output_values[-1]
+        )
+        ema.input_values.extend(input_values.tolist())
+        ema.output_values.extend(output_values.tolist())
+        return output_values
+
+    @property
+    def talipp_window(self):
+        # The signal line needs more inputs than its period too
+        return self.macd_start + self.signal_period + 1
+
+    @property
+    def input_cols(self):
+        return [self.input_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "ema_fast": kernels.KernelCall(
+                kernels.ema, (self.input_col,), (self.fast_period,)
+            ),
+            "ema_slow": kernels.KernelCall(
+                kernels.ema, (self.input_col,), (self.slow_period,)
+            ),
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
         nans = (self.slow_period - 1) * [np.nan]
-        values = self.talipp_instance.output_values
+        line, signal, histogram = self.output_lists()
         return {
-            "line": nans + self.none_to_nan([v.macd for v in values]),
-            "signal": nans + self.none_to_nan([v.signal for v in values]),
-            "histogram": nans
-            + self.none_to_nan([v.histogram for v in values]),
+            "line": nans + line,
+            "signal": nans + signal,
+            "histogram": nans + histogram,
         }
 
-    @staticmethod
-    def none_to_nan(input_list: List[Any]) -> List[Any]:
-        return [np.nan if x is None else x for x in input_list]
+    @property
+    def output_names(self):
+        return [
+            f"{self.name}__{key}" for key in ("line", "signal", "histogram")
+        ]
 
     @property
     def name(self):
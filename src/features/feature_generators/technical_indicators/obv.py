@@ -1,44 +1,82 @@
+import numpy as np
 from talipp.indicators import OBV as OBV_talipp
 from talipp.ohlcv import OHLCVFactory
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class OBV(FeatureGenerator):
+class OBV(TechnicalIndicator):
     def __init__(
         self,
         close_col: str,
         volume_col: str,
     ) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.close_col = close_col
         self.volume_col = volume_col
 
     def initialize(self, data):
-        ohlcvs_factory = OHLCVFactory.from_dict(
-            {
-                "close": data[self.close_col],
-                "volume": data[self.volume_col],
-            }
+        close = np.asarray(data[self.close_col], dtype=float)
+        volume = np.asarray(data[self.volume_col], dtype=float)
+        obv = kernels.compute(data, self.kernel_calls["obv"])
+        start = self.talipp_start(len(close))
+        talipp = OBV_talipp()
+        talipp.input_values = OHLCVFactory.from_dict(
+            {"close": close[start:], "volume": volume[start:]}
         )
-        self.talipp_instance = OBV_talipp(ohlcvs_factory)
+        talipp.output_values = obv[start:].tolist()
+        self.reset(talipp, obv, len(close))
 
-    def add_value(self, data, purging: bool = False):
-        new_value = OHLCVFactory.from_dict(
+    def talipp_input(self, data):
+        return OHLCVFactory.from_dict(
             {
                 "close": [data[self.close_col]],
                 "volume": [data[self.volume_col]],
             }
+        )[0]
+
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.output_values) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        columns = {
+            "close": np.asarray(data[self.close_col], dtype=float),
+            "volume": np.asarray(data[self.volume_col], dtype=float),
+        }
+        obv = kernels.obv_continued(
+            np.concatenate(
+                ([talipp.input_values[-1].close], columns["close"])
+            ),
+            columns["volume"],
+            talipp.output_values[-1],
         )
-        self.talipp_instance.add_input_value(new_value)
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+        talipp.input_values.extend(OHLCVFactory.from_dict(columns))
+        talipp.output_values.extend(obv.tolist())
+        self.extend(obv, len(obv), purging)
+
+    @property
+    def talipp_window(self):
+        return 2
+
+    @property
+    def input_cols(self):
+        return [self.close_col, self.volume_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "obv": kernels.KernelCall(
+                kernels.obv, (self.close_col, self.volume_col)
+            )
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
-        return self.talipp_instance.output_values
+        return self.output_lists()[0]
 
     @property
     def name(self):
@@ -1,32 +1,74 @@
 import numpy as np
 from talipp.indicators import RSI as RSI_talipp
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class RSI(FeatureGenerator):
+class RSI(TechnicalIndicator):
     def __init__(self, input_col: str, period: int = 14) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.input_col = input_col
         self.period = period
 
     def initialize(self, data):
-        self.talipp_instance = RSI_talipp(
-            input_values=data[self.input_col],
-            period=self.period,
+        values = np.asarray(data[self.input_col], dtype=float)
+        rsi, avg_gain, avg_loss = kernels.compute(
+            data, self.kernel_calls["rsi"]
         )
+        rsi = rsi[self.period :]
+        start = self.talipp_start(len(values))
+        talipp = RSI_talipp(period=self.period)
+        talipp.input_values = values[start:].tolist()
+        talipp.output_values = rsi[start:].tolist()
+        # Managed sequences, filled in place
+        talipp.avg_gain.extend(avg_gain[start:].tolist())
+        talipp.avg_loss.extend(avg_loss[start:].tolist())
+        self.reset(talipp, rsi, len(values))
 
-    def add_value(self, data, purging: bool = False):
-        self.talipp_instance.add_input_value(data[self.input_col])
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+    def talipp_input(self, data):
+        return data[self.input_col]
+
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.avg_gain) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        values = np.asarray(data[self.input_col], dtype=float)
+        rsi, avg_gain, avg_loss = kernels.rsi_continued(
+            np.concatenate((talipp.input_values[-1:], values)),
+            self.period,
+            talipp.avg_gain[-1],
+            talipp.avg_loss[-1],
+        )
+        talipp.input_values.extend(values.tolist())
+        talipp.output_values.extend(rsi.tolist())
+        talipp.avg_gain.extend(avg_gain.tolist())
+        talipp.avg_loss.extend(avg_loss.tolist())
+        self.extend(rsi, len(values), purging)
+
+    @property
+    def talipp_window(self):
+        return self.period + 2
+
+    @property
+    def input_cols(self):
+        return [self.input_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "rsi": kernels.KernelCall(
+                kernels.rsi, (self.input_col,), (self.period,)
+            )
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
         nans = self.period * [np.nan]
-        return nans + self.talipp_instance.output_values
+        return nans + self.output_lists()[0]
 
     @property
     def name(self):
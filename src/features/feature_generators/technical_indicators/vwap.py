@@ -2,10 +2,13 @@ import numpy as np
 from talipp.indicators import VWAP as VWAP_talipp
 from talipp.ohlcv import OHLCVFactory
 
-from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators import kernels
+from src.features.feature_generators.technical_indicators.abstract import (
+    TechnicalIndicator,
+)
 
 
-class VWAP(FeatureGenerator):
+class VWAP(TechnicalIndicator):
     """
     Volume Weighted Average Price
     """
@@ -18,41 +21,103 @@ class VWAP(FeatureGenerator):
         volume_col: str,
     ) -> None:
         super().__init__()
-        self.talipp_instance = None
         self.high_col = high_col
         self.low_col = low_col
         self.close_col = close_col
         self.volume_col = volume_col
 
     def initialize(self, data):
-        values = OHLCVFactory.from_dict(
-            {
-                "high": data[self.high_col],
-                "low": data[self.low_col],
-                "close": data[self.close_col],
-                "volume": data[self.volume_col],
-            }
+        columns = self.columns(data)
+        talipp = VWAP_talipp()
+        if len(columns["close"]) == 0:
+            self.reset(talipp, np.empty(0), 0)
+            return
+        typical_price = kernels.compute(
+            data, self.kernel_calls["typical_price"]
+        )
+        sum_price_vol = np.cumsum(
+            np.concatenate(([0.0], columns["volume"] * typical_price))
         )
-        self.talipp_instance = VWAP_talipp(input_values=values)
+        sum_vol = np.cumsum(np.concatenate(([0.0], columns["volume"])))
+        # No value while there is no volume yet
+        has_volume = sum_vol[1:] != 0
+        vwap = sum_price_vol[1:][has_volume] / sum_vol[1:][has_volume]
+        start = self.talipp_start(len(columns["close"]))
+        talipp.input_values = OHLCVFactory.from_dict(
+            {col: values[start:] for col, values in columns.items()}
+        )
+        talipp.sum_price_vol.extend(sum_price_vol[start:].tolist())
+        talipp.sum_vol.extend(sum_vol[start:].tolist())
+        talipp.output_values = vwap[start:].tolist()
+        self.reset(talipp, vwap, len(columns["close"]))
+
+    def columns(self, data):
+        return {
+            "high": np.asarray(data[self.high_col], dtype=float),
+            "low": np.asarray(data[self.low_col], dtype=float),
+            "close": np.asarray(data[self.close_col], dtype=float),
+            "volume": np.asarray(data[self.volume_col], dtype=float),
+        }
 
-    def add_value(self, data, purging: bool = False):
-        new_value = OHLCVFactory.from_dict(
+    def talipp_input(self, data):
+        return OHLCVFactory.from_dict(
             {
                 "high": [data[self.high_col]],
                 "low": [data[self.low_col]],
                 "close": [data[self.close_col]],
                 "volume": [data[self.volume_col]],
             }
+        )[0]
+
+    def add_values(self, data, purging: bool = False):
+        talipp = self.talipp_instance
+        if len(talipp.sum_vol) == 0:
+            # Not enough values to continue from yet
+            return super().add_values(data, purging)
+        columns = self.columns(data)
+        typical_price = kernels.typical_price(
+            columns["high"], columns["low"], columns["close"]
         )
-        self.talipp_instance.add_input_value(new_value)
-        if purging is True:
-            self.talipp_instance.purge_oldest(1)
+        sum_price_vol = np.cumsum(
+            np.concatenate(
+                (
+                    talipp.sum_price_vol[-1:],
+                    columns["volume"] * typical_price,
+                )
+            )
+        )[1:]
+        sum_vol = np.cumsum(
+            np.concatenate((talipp.sum_vol[-1:], columns["volume"]))
+        )[1:]
+        # No value while there is no volume yet
+        has_volume = sum_vol != 0
+        vwap = sum_price_vol[has_volume] / sum_vol[has_volume]
+        talipp.input_values.extend(OHLCVFactory.from_dict(columns))
+        talipp.sum_price_vol.extend(sum_price_vol.tolist())
+        talipp.sum_vol.extend(sum_vol.tolist())
+        talipp.output_values.extend(vwap.tolist())
+        self.extend(vwap, len(sum_vol), purging)
+
+    @property
+    def talipp_window(self):
+        return 2
+
+    @property
+    def input_cols(self):
+        return [self.high_col, self.low_col, self.close_col, self.volume_col]
+
+    @property
+    def kernel_calls(self):
+        return {
+            "typical_price": kernels.KernelCall(
+                kernels.typical_price,
+                (self.high_col, self.low_col, self.close_col),
+            )
+        }
 
     @property
     def output_values(self):
-        assert self.talipp_instance is not None, "Initialize first."
-        # nans = (self.period - 1) * [np.nan]
-        return self.talipp_instance.output_values
+        return self.output_lists()[0]
 
     @property
     def name(self):
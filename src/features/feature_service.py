@@ -1,20 +1,161 @@
-from typing import Any, Dict, List
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from src.features.feature_cache import FeatureCache
 from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.technical_indicators.kernels import (
+    ComputationGraph,
+)
+
+# Input columns of the worker processes, memory-mapped
+_graph = None
 
 
 class FeatureService:
-    def __init__(self, *feature_generators: List[FeatureGenerator]):
+    def __init__(
+        self,
+        *feature_generators: List[FeatureGenerator],
+        max_workers: int = 1,
+        cache: Optional[FeatureCache] = None,
+    ):
+        """
+        Parameters
+        ----------
+        *feature_generators : FeatureGenerator
+            Generators of the features, in the order of their columns.
+        max_workers : int
+            Number of processes to initialize the generators in, see
+            `initialize_in_parallel`. They are then restored from their
+            states in this process, so the outputs are the same as with
+            `1`, the default.
+        cache : FeatureCache, optional
+            On-disk cache of generator states, to restore the generators
+            from in `initialize` instead of initializing them again on the
+            same data.
+        """
         self.feature_generators = feature_generators
+        self.max_workers = max_workers
+        self.cache = cache
+        self.latest = None
+        self.latest_layout = None
 
     def initialize(self, data: Any) -> None:
-        for feature_generator in self.feature_generators:
-            feature_generator.initialize(data)
+        """Initialize the generators on the history in `data`. Kernel calls
+        that several generators make, see `computation_report`, are computed
+        once."""
+        graph = ComputationGraph(data)
+        feature_generators = self.feature_generators
+        if self.cache is not None:
+            feature_generators = [
+                feature_generator
+                for feature_generator in feature_generators
+                if not self.cache.load(feature_generator, data)
+            ]
+        uncached = feature_generators
+        if self.max_workers > 1:
+            feature_generators = self.initialize_in_parallel(
+                graph, feature_generators
+            )
+        for feature_generator in feature_generators:
+            # The graph only reads columns, the other generators may need
+            # the whole data frame
+            feature_generator.initialize(
+                graph if feature_generator.kernel_calls else data
+            )
+        if self.cache is not None:
+            for feature_generator in uncached:
+                self.cache.save(feature_generator, data)
+        self.latest = None
+
+    def initialize_in_parallel(
+        self,
+        graph: ComputationGraph,
+        feature_generators: List[FeatureGenerator],
+    ) -> List[FeatureGenerator]:
+        """Initialize the generators with kernel calls in a process pool,
+        and restore them here from the states that the processes send back,
+        see `FeatureGenerator.get_state`.
+
+        The generators are split by input columns, so that the kernel calls
+        they share are still computed once. The input columns are saved
+        once to a temporary directory, which every process memory-maps
+        instead of receiving a pickled copy.
+
+        Returns
+        -------
+        The other generators, still to initialize.
+        """
+        groups = {}
+        remaining = []
+        for feature_generator in feature_generators:
+            if (
+                feature_generator.kernel_calls
+                and feature_generator.input_cols is not None
+            ):
+                groups.setdefault(
+                    tuple(feature_generator.input_cols), []
+                ).append(feature_generator)
+            else:
+                remaining.append(feature_generator)
+        if len(groups) <= 1:
+            return feature_generators
+        groups = list(groups.values())
+        input_cols = dict.fromkeys(
+            col
+            for group in groups
+            for feature_generator in group
+            for col in feature_generator.input_cols
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = {}
+            for i, col in enumerate(input_cols):
+                paths[col] = os.path.join(tmp_dir, f"{i}.npy")
+                np.save(paths[col], graph.column(col))
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(groups)),
+                initializer=_load_columns,
+                initargs=(paths,),
+            ) as executor:
+                for group, states in zip(
+                    groups, executor.map(_initialize, groups)
+                ):
+                    for feature_generator, state in zip(group, states):
+                        feature_generator.set_state(state)
+        return remaining
 
     def add_value(self, data_row: Any, purging: bool = False):
         for feature_generator in self.feature_generators:
             feature_generator.add_value(data_row, purging)
 
+    def add_values(self, data: Any, purging: bool = False):
+        """Add the rows of `data`, a data frame, like `add_value` for each
+        of them, but in one step per generator. Faster to catch up on many
+        rows, e.g. after a restart."""
+        for feature_generator in self.feature_generators:
+            feature_generator.add_values(data, purging)
+
+    def computation_report(self) -> Dict[str, Any]:
+        """How many kernel calls the generators make in `initialize`, and
+        how many of them are duplicates, only computed once."""
+        calls = Counter(
+            call
+            for feature_generator in self.feature_generators
+            for call in feature_generator.kernel_calls.values()
+        )
+        return {
+            "calls": sum(calls.values()),
+            "computed": len(calls),
+            "removed": sum(calls.values()) - len(calls),
+            "shared": {
+                str(call): count for call, count in calls.items() if count > 1
+            },
+        }
+
     @property
     def output_values(self) -> Dict[str, List[float]]:
         return self.flatten_dict(
@@ -24,6 +165,77 @@ class FeatureService:
             }
         )
 
+    @property
+    def output_names(self) -> List[str]:
+        """Names of the features, in the order of `latest_values`."""
+        return [
+            name
+            for feature_generator in self.feature_generators
+            for name in feature_generator.output_names
+        ]
+
+    def latest_values(self) -> np.ndarray:
+        """Newest row of `output_values`, in the order of `output_names`.
+
+        Its cost does not depend on the length of the history. The returned
+        array is reused by the next call: copy it to keep it.
+        """
+        if self.latest is None:
+            self.allocate_latest()
+        start = 0
+        for feature_generator, n_outputs in zip(
+            self.feature_generators, self.latest_layout
+        ):
+            self.latest[
+                start : start + n_outputs
+            ] = feature_generator.latest_values()
+            start += n_outputs
+        return self.latest
+
+    def allocate_latest(self) -> None:
+        # Number of outputs of every generator, always the same
+        self.latest_layout = [
+            len(feature_generator.output_names)
+            for feature_generator in self.feature_generators
+        ]
+        self.latest = np.full(sum(self.latest_layout), np.nan)
+
+    def to_array(self, dtype: np.dtype = np.float32) -> np.ndarray:
+        """`output_values` as one 2-D array of shape `(rows, features)`, with
+        the columns in the order of `output_names`.
+
+        Every generator writes its outputs straight into the array, without
+        the lists of `output_values`. Generators with fewer rows are aligned
+        on the last one, with NaN before. The array is column-major, as it is
+        filled column by column.
+        """
+        layout = [
+            feature_generator.output_names
+            for feature_generator in self.feature_generators
+        ]
+        n_rows = max(
+            (
+                feature_generator.n_rows
+                for feature_generator in self.feature_generators
+            ),
+            default=0,
+        )
+        n_outputs = sum(len(names) for names in layout)
+        output = np.empty((n_rows, n_outputs), dtype=dtype, order="F")
+        start = 0
+        for feature_generator, names in zip(self.feature_generators, layout):
+            feature_generator.write_values(
+                output[:, start : start + len(names)]
+            )
+            start += len(names)
+        return output
+
+    def to_tensor(self, dtype: np.dtype = np.float32):
+        """`to_array` as a PyTorch tensor, sharing its memory."""
+        import torch  # Slow to import, only needed here
+
+        return torch.from_numpy(self.to_array(dtype))
+
     @staticmethod
     def flatten_dict(input_dict) -> Dict[str, Any]:
         output = {}
@@ -34,3 +246,22 @@ class FeatureService:
             else:
                 output[k] = v
         return output
+
+
+def _load_columns(paths: Dict[str, str]) -> None:
+    global _graph
+    _graph = ComputationGraph(
+        {col: np.load(path, mmap_mode="r") for col, path in paths.items()}
+    )
+
+
+def _initialize(
+    feature_generators: List[FeatureGenerator],
+) -> List[Dict[str, np.ndarray]]:
+    # Free the results of the previous group, which rarely shares any
+    _graph.results.clear()
+    states = []
+    for feature_generator in feature_generators:
+        feature_generator.initialize(_graph)
+        states.append(feature_generator.get_state())
+    return states
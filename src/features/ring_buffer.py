@@ -0,0 +1,83 @@
+from typing import Tuple
+
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(
+        self,
+        capacity: int,
+        dtype: np.dtype = np.float64,
+        shape: Tuple[int, ...] = (),
+    ):
+        """
+        Circular buffer in a preallocated array. Values are appended at the
+        end and dropped from the start in constant time. When it is full, an
+        append doubles its capacity, so a rolling window that drops a value
+        for every new one keeps the same memory.
+
+        Parameters
+        ----------
+        capacity : int
+            Number of values to allocate for.
+        dtype : np.dtype
+            Type of the values.
+        shape : Tuple[int, ...]
+            Shape of every value, scalars by default.
+        """
+        self.buffer = np.empty((max(1, capacity), *shape), dtype=dtype)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.buffer)
+
+    def append(self, value) -> None:
+        if self.size == self.capacity:
+            self.grow(self.size + 1)
+        self.buffer[(self.start + self.size) % self.capacity] = value
+        self.size += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=self.buffer.dtype).reshape(
+            -1, *self.buffer.shape[1:]
+        )
+        if self.size + len(values) > self.capacity:
+            self.grow(self.size + len(values))
+        end = (self.start + self.size) % self.capacity
+        n_until_wrap = min(len(values), self.capacity - end)
+        self.buffer[end : end + n_until_wrap] = values[:n_until_wrap]
+        self.buffer[: len(values) - n_until_wrap] = values[n_until_wrap:]
+        self.size += len(values)
+
+    def popleft(self, n: int = 1) -> None:
+        """Drop the `n` oldest values."""
+        n = min(n, self.size)
+        self.start = (self.start + n) % self.capacity
+        self.size -= n
+
+    def last(self):
+        assert self.size > 0, "The buffer is empty."
+        return self.buffer[(self.start + self.size - 1) % self.capacity]
+
+    def to_array(self) -> np.ndarray:
+        """The values, from the oldest, as a new array."""
+        end = self.start + self.size
+        if end <= self.capacity:
+            return self.buffer[self.start : end].copy()
+        return np.concatenate(
+            (self.buffer[self.start :], self.buffer[: end - self.capacity])
+        )
+
+    def grow(self, min_capacity: int) -> None:
+        buffer = np.empty(
+            (max(2 * self.capacity, min_capacity), *self.buffer.shape[1:]),
+            dtype=self.buffer.dtype,
+        )
+        buffer[: self.size] = self.to_array()
+        self.buffer = buffer
+        self.start = 0
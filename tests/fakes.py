@@ -0,0 +1,125 @@
+"""
+Fakes of the clients and encoders, shared by the unit tests and the
+benchmarks.
+"""
+import json
+import time
+from typing import List, Optional
+
+import numpy as np
+from binance import enums
+
+from clients.exchange.abstract import StreamingExchangeClient
+
+MILLISECONDS_PER_MINUTE = 60 * 1000
+
+# Keys of a kline event, in the order of the values of a kline
+KLINE_EVENT_KEYS = "t o h l c v T q n V Q B".split()
+
+
+class FakeExchangeClient(StreamingExchangeClient):
+    def __init__(
+        self,
+        klines: Optional[List[List]] = None,
+        latency: float = 0.0,
+        seed: int = 42,
+    ):
+        """
+        Local stand-in for `BinanceClient`. It returns `klines`, or else
+        random 1-minute klines of the requested range, and sleeps `latency`
+        seconds per call to mimic a network round-trip. The requested
+        ranges are recorded in `calls`. It streams Binance kline events,
+        like the ones of `KlineReplayServer`, without connecting to Binance.
+
+        Parameters
+        ----------
+        klines : List[List], optional
+            Raw klines to return for every symbol, with the close prices
+            shifted by the length of the symbol, so that every symbol gets
+            different data.
+        latency : float
+            Seconds to sleep per call.
+        seed : int
+            Seed of the random klines.
+        """
+        self.klines = klines
+        self.latency = latency
+        self.seed = seed
+        self.calls = []
+        self.dtypes = {
+            "open_timestamp": int,
+            "open": float,
+            "high": float,
+            "low": float,
+            "close": float,
+            "volume": float,
+            "close_timestamp": int,
+            "quote_asset_volume": float,
+            "number_of_trades": int,
+            "taker_buy_base_asset_volume": float,
+            "taker_buy_quote_asset_volume": float,
+        }
+        self.interval_mapping = {enums.KLINE_INTERVAL_1MINUTE: "1T"}
+
+    def get_historic_prices(
+        self, symbol: str, interval: str, start: int, end: int
+    ) -> List[List]:
+        self.calls.append((start, end))
+        time.sleep(self.latency)
+        if self.klines is not None:
+            return [
+                row[:4] + [float(row[4]) + len(symbol)] + row[5:]
+                for row in self.klines
+            ]
+        return generate_klines(start, end, seed=self.seed + len(symbol))
+
+    async def stream_klines(self, source):
+        """Yield `(symbol, kline)` for every closed kline event of `source`,
+        JSON strings like the ones of `KlineReplayServer`."""
+        async for message in source:
+            event = json.loads(message)
+            if event["k"]["x"]:
+                yield event["s"], [event["k"][key] for key in KLINE_EVENT_KEYS]
+
+
+def generate_klines(start: int, end: int, seed: int = 42) -> List[List]:
+    """Random 1-minute klines between `start` and `end` (inclusive) in the raw
+    format returned by the Binance API."""
+    rng = np.random.default_rng(seed)
+    first = -(-start // MILLISECONDS_PER_MINUTE) * MILLISECONDS_PER_MINUTE
+    open_timestamps = np.arange(first, end + 1, MILLISECONDS_PER_MINUTE)
+    n = len(open_timestamps)
+    close = 1000 + np.cumsum(rng.normal(size=n))
+    volume = rng.uniform(1, 100, size=n)
+    trades = rng.integers(10, 1000, size=n)
+    return [
+        [
+            int(open_timestamps[i]),
+            f"{close[i] - 0.5:.8f}",
+            f"{close[i] + 1:.8f}",
+            f"{close[i] - 1:.8f}",
+            f"{close[i]:.8f}",
+            f"{volume[i]:.8f}",
+            int(open_timestamps[i]) + MILLISECONDS_PER_MINUTE - 1,
+            f"{volume[i] * close[i]:.8f}",
+            int(trades[i]),
+            f"{volume[i] / 2:.8f}",
+            f"{volume[i] * close[i] / 2:.8f}",
+            "0",
+        ]
+        for i in range(n)
+    ]
+
+
+class FakeEncoder:
+    """Encodes a text as its length, like a sentiment encoder of
+    `NewsSentiment`, and records the texts it encoded."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        self.texts.extend(texts)
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
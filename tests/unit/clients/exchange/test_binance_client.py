@@ -0,0 +1,171 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from binance import enums
+from binance.client import Client
+from binance.exceptions import BinanceAPIException
+
+from clients.exchange.binance import KLINES_LIMIT, BinanceClient
+from clients.exchange.rate_limiter import RequestWeightLimiter
+
+MILLISECONDS_PER_MINUTE = 60 * 1000
+START = 1672531200000  # 2023-01-01 00:00:00
+
+
+class FakeBinanceHandler(BaseHTTPRequestHandler):
+    # Status codes to answer the next klines requests with, before the data
+    errors = []
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.endswith("/ping"):
+            return self.respond(200, {})
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.requests.append(params)
+        if self.errors:
+            return self.respond(self.errors.pop(0), {"code": -1, "msg": ""})
+        # Klines that open at or after `startTime`, like Binance returns
+        first = (
+            -(-int(params["startTime"]) // MILLISECONDS_PER_MINUTE)
+            * MILLISECONDS_PER_MINUTE
+        )
+        timestamps = range(
+            first,
+            int(params["endTime"]) + 1,
+            MILLISECONDS_PER_MINUTE,
+        )[: int(params["limit"])]
+        self.respond(200, [[ts, "1.0", ts + 59999] for ts in timestamps])
+
+    def respond(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Retry-After", "0")
+        self.send_header("X-MBX-USED-WEIGHT-1M", "10")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FakeBinanceHandler.errors = []
+    FakeBinanceHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBinanceHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    class LocalClient(Client):
+        API_URL = f"http://127.0.0.1:{server.server_port}/api"
+
+    return BinanceClient(
+        api_key=None,
+        api_secret=None,
+        rate_limiter=RequestWeightLimiter(),
+        max_retries=3,
+        backoff=0.01,
+        client=LocalClient(),
+    )
+
+
+def get_klines(client, n_minutes):
+    return client.get_historic_prices(
+        symbol="BTCUSDT",
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        start=START,
+        end=START + (n_minutes - 1) * MILLISECONDS_PER_MINUTE,
+    )
+
+
+@pytest.mark.unit
+def test_get_historic_prices_pages(client):
+    n_minutes = 2 * KLINES_LIMIT + 10
+
+    klines = get_klines(client, n_minutes)
+
+    assert [kline[0] for kline in klines] == [
+        START + i * MILLISECONDS_PER_MINUTE for i in range(n_minutes)
+    ]
+    assert len(FakeBinanceHandler.requests) == 3
+    assert client.rate_limiter.stats["requests"] == 3
+
+
+@pytest.mark.unit
+def test_get_historic_prices_retries(client):
+    FakeBinanceHandler.errors = [429, 500]
+
+    klines = get_klines(client, 5)
+
+    assert len(klines) == 5
+    assert client.rate_limiter.stats["retries"] == 2
+    assert client.rate_limiter.stats["throttled"] == 1
+    assert client.rate_limiter.rate < client.rate_limiter.max_rate
+
+
+@pytest.mark.unit
+def test_get_historic_prices_gives_up(client):
+    FakeBinanceHandler.errors = [500] * 4
+
+    with pytest.raises(BinanceAPIException):
+        get_klines(client, 5)
+    assert len(FakeBinanceHandler.requests) == 4
+
+
+@pytest.mark.unit
+def test_get_historic_prices_client_error(client):
+    FakeBinanceHandler.errors = [400]
+
+    with pytest.raises(BinanceAPIException):
+        get_klines(client, 5)
+    assert client.rate_limiter.stats["retries"] == 0
+
+
+@pytest.mark.unit
+def test_rate_limiter_waits():
+    limiter = RequestWeightLimiter(weight_per_minute=600, safety_margin=1.0)
+    limiter.acquire(600)
+
+    limiter.acquire(1)  # Refills at 10 weight per second
+
+    assert limiter.stats["waits"] == 1
+    assert 0 < limiter.stats["wait_time"] < 1
+
+
+@pytest.mark.unit
+def test_request_reads_own_response(client, monkeypatch):
+    used_weights = []
+    monkeypatch.setattr(client.rate_limiter, "on_success", used_weights.append)
+
+    def get_klines_then_other_thread(**params):
+        klines = client.client.get_klines(**params)
+        # Another thread's request finishes before this one reads headers
+        thread = threading.Thread(
+            target=client.client.get_klines, kwargs=params
+        )
+        thread.start()
+        thread.join()
+        client.client.response.headers["X-MBX-USED-WEIGHT-1M"] = "1000"
+        return klines
+
+    client.request(
+        get_klines_then_other_thread,
+        weight=2,
+        symbol="BTCUSDT",
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        startTime=START,
+        endTime=START,
+        limit=1,
+    )
+
+    assert used_weights == [10]
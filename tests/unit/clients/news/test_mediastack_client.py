@@ -0,0 +1,103 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from clients.news import MediaStackNewsClient
+from src.dataloaders.news import MediaStackNewsScraper
+
+DAY_1 = 1672531200000  # 2023-01-01 00:00:00
+DAY_8 = 1673136000000  # 2023-01-08 00:00:00
+
+
+class FakeMediaStackHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    # Number of the next requests to drop the connection on, without replying
+    n_drops = 0
+
+    def do_GET(self):
+        if FakeMediaStackHandler.n_drops > 0:
+            FakeMediaStackHandler.n_drops -= 1
+            self.close_connection = True
+            return
+        date = parse_qs(urlparse(self.path).query)["date"][0]
+        body = json.dumps({"data": [{"title": f"News on {date}"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FakeMediaStackHandler.n_drops = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeMediaStackHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = MediaStackNewsClient(
+        access_key="key", host="127.0.0.1", port=server.server_port
+    )
+    yield client
+    client.pool.close()
+
+
+def get_data(client, date="2023-01-01"):
+    return client.get_data(
+        date=date,
+        keywords=["bitcoin"],
+        limit=10,
+        language="en",
+        sort_by="popularity",
+    )
+
+
+@pytest.mark.unit
+def test_connection_is_reused(client):
+    for _ in range(5):
+        assert get_data(client) == [{"title": "News on 2023-01-01"}]
+
+    assert client.pool.n_connections == 1
+
+
+@pytest.mark.unit
+def test_reconnects_on_dropped_connection(client):
+    get_data(client)
+    FakeMediaStackHandler.n_drops = 1
+
+    assert get_data(client) == [{"title": "News on 2023-01-01"}]
+    assert client.pool.n_reconnects == 1
+
+
+@pytest.mark.unit
+def test_gives_up_after_max_retries(client):
+    FakeMediaStackHandler.n_drops = client.pool.max_retries + 1
+
+    with pytest.raises(ConnectionError):
+        get_data(client)
+
+
+@pytest.mark.unit
+def test_concurrent_scraping(client):
+    scraper = MediaStackNewsScraper(
+        keywords=["bitcoin"], news_client=client, max_workers=4
+    )
+
+    data = scraper.load_data(DAY_1, DAY_8)
+
+    assert [article["title"] for article in data] == [
+        f"News on 2023-01-0{day}" for day in range(1, 9)
+    ]
+    assert client.pool.n_connections <= 4
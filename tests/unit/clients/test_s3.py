@@ -0,0 +1,159 @@
+import io
+import os
+
+import pytest
+
+from clients import s3
+
+moto = pytest.importorskip("moto")
+
+BUCKET = "test-bucket"
+MB = 1024**2
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setitem(s3.ENV, "AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setitem(s3.ENV, "AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        s3.get_client.cache_clear()
+        s3.get_client().create_bucket(Bucket=BUCKET)
+        yield BUCKET
+    s3.get_client.cache_clear()
+
+
+@pytest.fixture
+def large_data():
+    # Above the multipart threshold, so it is transferred in parts
+    return bytes(range(256)) * (20 * MB // 256)
+
+
+@pytest.mark.unit
+def test_client_is_cached(bucket):
+    assert s3.get_client() is s3.get_client()
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork")
+def test_client_is_not_shared_with_forked_child(bucket):
+    s3.get_client()
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(s3.get_client.cache_info().currsize)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WEXITSTATUS(status) == 0
+    assert s3.get_client.cache_info().currsize == 1
+
+
+@pytest.mark.unit
+def test_upload_download(bucket):
+    s3.upload(b"data", "path/data.bin", env="dev", bucket_name=bucket)
+
+    assert s3.download("path/data.bin", env="dev", bucket_name=bucket) == (
+        b"data"
+    )
+
+
+@pytest.mark.unit
+def test_multipart_upload(bucket, large_data):
+    s3.upload(large_data, "large.bin", env="dev", bucket_name=bucket)
+
+    head = s3.get_client().head_object(Bucket=bucket, Key="dev/large.bin")
+    # ETags of multipart uploads end with the number of parts
+    assert head["ETag"].strip('"').endswith("-2")
+    assert head["ContentLength"] == len(large_data)
+
+
+@pytest.mark.unit
+def test_streamed_download(tmp_path, bucket, large_data):
+    local_path = tmp_path / "large.bin"
+    local_path.write_bytes(large_data)
+    s3.upload_file(str(local_path), "large.bin", env="dev", bucket_name=bucket)
+
+    buffer = io.BytesIO()
+    s3.download("large.bin", env="dev", bucket_name=bucket, fileobj=buffer)
+    downloaded_path = tmp_path / "downloaded.bin"
+    s3.download_file(
+        "large.bin", str(downloaded_path), env="dev", bucket_name=bucket
+    )
+
+    assert buffer.getvalue() == large_data
+    assert downloaded_path.read_bytes() == large_data
+
+
+@pytest.mark.unit
+def test_invalid_env(bucket):
+    with pytest.raises(ValueError):
+        s3.upload(b"data", "data.bin", env="test", bucket_name=bucket)
+
+
+@pytest.fixture
+def partitions(tmp_path):
+    path = tmp_path / "local"
+    for date in ("2023-01-01", "2023-01-02", "2023-01-03"):
+        (path / f"date={date}").mkdir(parents=True)
+        (path / f"date={date}" / "data.parquet").write_bytes(date.encode())
+    (path / ".tmp123.tmp").write_bytes(b"partial")
+    return path
+
+
+@pytest.mark.unit
+def test_sync_up_transfers_changed_partitions(bucket, partitions):
+    first = s3.sync_up(str(partitions), "data", env="dev", bucket_name=bucket)
+    (partitions / "date=2023-01-03" / "data.parquet").write_bytes(b"changed")
+    second = s3.sync_up(str(partitions), "data", env="dev", bucket_name=bucket)
+
+    assert (first["files"], first["skipped"], first["bytes"]) == (3, 0, 30)
+    assert (second["files"], second["skipped"], second["bytes"]) == (1, 2, 7)
+    assert s3.download(
+        "data/date=2023-01-03/data.parquet", env="dev", bucket_name=bucket
+    ) == (b"changed")
+
+
+@pytest.mark.unit
+def test_sync_down(tmp_path, bucket, partitions):
+    s3.sync_up(str(partitions), "data", env="dev", bucket_name=bucket)
+    local_path = tmp_path / "mirror"
+
+    first = s3.sync_down(
+        "data", str(local_path), env="dev", bucket_name=bucket
+    )
+    second = s3.sync_down(
+        "data", str(local_path), env="dev", bucket_name=bucket
+    )
+
+    assert (first["files"], second["files"], second["skipped"]) == (3, 0, 3)
+    assert (local_path / "date=2023-01-02" / "data.parquet").read_bytes() == (
+        b"2023-01-02"
+    )
+
+
+@pytest.mark.unit
+def test_sync_trailing_slash(tmp_path, bucket, partitions):
+    s3.sync_up(str(partitions), "data/", env="dev", bucket_name=bucket)
+    report = s3.sync_down(
+        "data/", str(tmp_path / "mirror"), env="dev", bucket_name=bucket
+    )
+
+    keys = [
+        obj["Key"]
+        for obj in s3.get_client().list_objects_v2(Bucket=bucket)["Contents"]
+    ]
+    assert sorted(keys) == [
+        f"dev/data/date=2023-01-0{day}/data.parquet" for day in (1, 2, 3)
+    ]
+    assert report["files"] == 3
+
+
+@pytest.mark.unit
+def test_local_etag_matches_multipart_upload(tmp_path, bucket, large_data):
+    local_path = tmp_path / "large.bin"
+    local_path.write_bytes(large_data)
+    s3.upload_file(str(local_path), "large.bin", env="dev", bucket_name=bucket)
+
+    head = s3.get_client().head_object(Bucket=bucket, Key="dev/large.bin")
+
+    assert s3._local_etag(str(local_path)) == head["ETag"].strip('"')
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from clients import s3
+from clients.s3_cache import S3Cache
+
+moto = pytest.importorskip("moto")
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setitem(s3.ENV, "AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setitem(s3.ENV, "AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        s3.get_client.cache_clear()
+        s3.get_client().create_bucket(Bucket=BUCKET)
+        yield BUCKET
+    s3.get_client.cache_clear()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return S3Cache(path=str(tmp_path))
+
+
+@pytest.mark.unit
+def test_download_is_cached(bucket, cache):
+    s3.upload(b"model", "model.pkl", env="dev", bucket_name=bucket)
+
+    first = cache.download("model.pkl", env="dev", bucket_name=bucket)
+    second = cache.download("model.pkl", env="dev", bucket_name=bucket)
+
+    assert first == second == b"model"
+    assert (cache.n_misses, cache.n_hits) == (1, 1)
+    assert os.path.isfile(os.path.join(cache.path, bucket, "dev", "model.pkl"))
+
+
+@pytest.mark.unit
+def test_changed_object_is_downloaded_again(bucket, cache):
+    s3.upload(b"old", "model.pkl", env="dev", bucket_name=bucket)
+    cache.download("model.pkl", env="dev", bucket_name=bucket)
+    s3.upload(b"new", "model.pkl", env="dev", bucket_name=bucket)
+
+    data = cache.download("model.pkl", env="dev", bucket_name=bucket)
+
+    assert data == b"new"
+    assert cache.n_misses == 2
+
+
+@pytest.mark.unit
+def test_without_validation(bucket, tmp_path):
+    cache = S3Cache(path=str(tmp_path), validate=False)
+    s3.upload(b"old", "model.pkl", env="dev", bucket_name=bucket)
+    cache.download("model.pkl", env="dev", bucket_name=bucket)
+    s3.upload(b"new", "model.pkl", env="dev", bucket_name=bucket)
+
+    assert cache.download("model.pkl", env="dev", bucket_name=bucket) == (
+        b"old"
+    )
+
+
+@pytest.mark.unit
+def test_least_recently_used_is_evicted(bucket, tmp_path):
+    cache = S3Cache(path=str(tmp_path), max_bytes=25)
+    for name in ("a", "b", "c"):
+        s3.upload(b"x" * 10, name, env="dev", bucket_name=bucket)
+    cache.download("a", env="dev", bucket_name=bucket)
+    cache.download("b", env="dev", bucket_name=bucket)
+    path_a = cache.get_path("a", env="dev", bucket_name=bucket)
+    os.utime(path_a, (2e9, 2e9))  # Used last
+
+    cache.download("c", env="dev", bucket_name=bucket)
+
+    cached = sorted(os.path.basename(path) for path, _ in cache.cached_files())
+    assert cached == ["a", "c"]
+    assert cache.size == 20
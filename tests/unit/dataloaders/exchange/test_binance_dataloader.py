@@ -1,9 +1,11 @@
+import numpy as np
 import pandas as pd
 import pytest
 from binance import enums
 
 from clients.exchange import BinanceClient
 from src.dataloaders.exchange import BinanceDataLoader
+from tests.fakes import FakeExchangeClient
 
 
 @pytest.fixture
@@ -17,6 +19,17 @@ def binance_dataloader():
     )
 
 
+@pytest.fixture
+def fake_dataloader():
+    return BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC", "ETH"],
+        fiat="USDT",
+        exchange_client=FakeExchangeClient(),
+        datetime_fmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
 @pytest.fixture
 def raw_input_data():
     return [
@@ -59,6 +72,23 @@ def test_read_raw_input_data(binance_dataloader, raw_input_data):
     assert data.shape == (2, 11)
 
 
+@pytest.mark.unit
+def test_read_raw_input_data_dtypes(fake_dataloader, raw_input_data):
+    data = fake_dataloader.read_raw_input_data(raw_input_data)
+    assert data.dtypes.to_dict() == {
+        col: np.dtype(dtype)
+        for col, dtype in fake_dataloader.exchange_client.dtypes.items()
+    }
+    assert data["open"].tolist() == [48306.8, 48341.14]
+    assert data["number_of_trades"].tolist() == [1207, 1184]
+
+
+@pytest.mark.unit
+def test_read_raw_input_data_empty(fake_dataloader):
+    data = fake_dataloader.read_raw_input_data([])
+    assert data.shape == (0, 11)
+
+
 @pytest.mark.unit
 def test_pivot_price_data(binance_dataloader, monkeypatch):
     # Patch dtypes
@@ -107,10 +137,10 @@ def test_process_missing_intervals(binance_dataloader):
                 pd.Timestamp("2021-03-03 00:04:00"),
             ],
             "open_timestamp": [
-                1614729660000.0,
-                1614729660000.0,  # Extended
-                1614729660000.0,  # Extended
-                1614729840000.0,
+                1614729660000,
+                1614729660000,  # Extended
+                1614729660000,  # Extended
+                1614729840000,
             ],
             "BTC_open": [48306.8, 48306.8, 48306.8, 48281.94],
             "BTC_close": [48341.15, 48341.15, 48341.15, 48240.63],
@@ -121,6 +151,92 @@ def test_process_missing_intervals(binance_dataloader):
     pd.testing.assert_frame_equal(output, expected_output)
 
 
+@pytest.mark.unit
+def test_process_missing_intervals_partial_rows(fake_dataloader):
+    # ETHUSDT has no candle at 00:02
+    input_data = pd.DataFrame(
+        {
+            "open_timestamp": [1614729660000, 1614729720000, 1614729780000],
+            "BTCUSDT_open": [48306.8, 48341.14, 48325.84],
+            "ETHUSDT_open": [1553.43, np.nan, 1555.12],
+        }
+    )
+
+    output = fake_dataloader.process_missing_intervals(input_data)
+
+    assert output["ETHUSDT_open"].tolist() == [1553.43, 1553.43, 1555.12]
+    assert output["BTCUSDT_open"].tolist() == [48306.8, 48341.14, 48325.84]
+    assert output["service_down"].tolist() == [False, True, False]
+    # Partially missing rows are not missing intervals
+    assert fake_dataloader.gaps == []
+
+
+@pytest.mark.unit
+def test_process_missing_intervals_fills_only_partial_rows(fake_dataloader):
+    # ETHUSDT has no candle at 00:02, BTCUSDT has one without a volume
+    input_data = pd.DataFrame(
+        {
+            "open_timestamp": [1614729660000, 1614729720000, 1614729780000],
+            "BTCUSDT_open": [48306.8, 48341.14, 48325.84],
+            "BTCUSDT_volume": [47.5, np.nan, 77.6],
+            "ETHUSDT_open": [1553.43, np.nan, 1555.12],
+            "ETHUSDT_volume": [12.5, np.nan, 13.5],
+        }
+    )
+
+    output = fake_dataloader.process_missing_intervals(input_data)
+
+    assert output["ETHUSDT_volume"].tolist() == [12.5, 12.5, 13.5]
+    np.testing.assert_array_equal(
+        output["BTCUSDT_volume"], [47.5, np.nan, 77.6]
+    )
+    # The input is left as it is
+    assert input_data["ETHUSDT_open"].isna().sum() == 1
+
+
+@pytest.mark.unit
+def test_process_missing_intervals_gaps(fake_dataloader):
+    minute = 60 * 1000
+    input_data = pd.DataFrame(
+        {
+            "open_timestamp": [
+                1614729660000 + i * minute for i in (0, 1, 4, 5, 7)
+            ],
+            "BTCUSDT_open": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+
+    output = fake_dataloader.process_missing_intervals(input_data)
+
+    assert fake_dataloader.gaps == [(2, 2), (6, 1)]
+    assert output["service_down"].tolist() == [
+        False,
+        False,
+        True,
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert output["BTCUSDT_open"].tolist() == [
+        1.0,
+        2.0,
+        2.0,
+        2.0,
+        3.0,
+        4.0,
+        4.0,
+        5.0,
+    ]
+
+
+@pytest.mark.unit
+def test_find_gaps_no_gaps(fake_dataloader):
+    timestamps = np.array([1614729660000, 1614729720000, 1614729780000])
+    assert fake_dataloader.find_gaps(timestamps) == []
+
+
 @pytest.mark.unit
 def test_validate_invalid_symbols(binance_dataloader, monkeypatch):
     with pytest.raises(AssertionError):
@@ -133,3 +249,120 @@ def test_validate_invalid_interval(binance_dataloader, monkeypatch):
     with pytest.raises(AssertionError):
         monkeypatch.setattr(binance_dataloader, "interval", "1-minutito")
         binance_dataloader.validate()
+
+
+@pytest.mark.unit
+def test_load_data_concurrent_matches_serial(raw_input_data):
+    def load(max_workers):
+        dataloader = BinanceDataLoader(
+            interval=enums.KLINE_INTERVAL_1MINUTE,
+            assets=["BTC", "ETH", "DOGE"],
+            fiat="USDT",
+            exchange_client=FakeExchangeClient(raw_input_data),
+            max_workers=max_workers,
+        )
+        return dataloader.load_data(1614729660000, 1614729780000)
+
+    serial = load(max_workers=1)
+    concurrent = load(max_workers=3)
+
+    pd.testing.assert_frame_equal(serial, concurrent)
+    assert serial.shape == (2, 2 + 3 * 9 + 1)
+    assert serial["DOGEUSDT_close"].tolist() == [48349.15, 48333.84]
+
+
+@pytest.mark.unit
+def test_validate_invalid_max_workers(fake_dataloader, monkeypatch):
+    with pytest.raises(AssertionError):
+        monkeypatch.setattr(fake_dataloader, "max_workers", 0)
+        fake_dataloader.validate()
+
+
+@pytest.fixture
+def compact_dataloader(raw_input_data):
+    return BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC"],
+        fiat="USDT",
+        exchange_client=FakeExchangeClient(raw_input_data),
+        compact=True,
+    )
+
+
+@pytest.mark.unit
+def test_read_raw_input_data_compact(compact_dataloader, raw_input_data):
+    data = compact_dataloader.read_raw_input_data(raw_input_data)
+
+    assert data["open_timestamp"].dtype == np.int64
+    assert data["close_timestamp"].dtype == np.int64
+    assert data["open"].dtype == np.float32
+    assert data["volume"].dtype == np.float32
+    assert data["number_of_trades"].dtype == np.int32
+
+
+@pytest.mark.unit
+def test_process_missing_intervals_compact(compact_dataloader):
+    input_data = pd.DataFrame(
+        {
+            "open_timestamp": [1614729660000, 1614729840000],
+            "BTCUSDT_open": np.array([48306.8, 48281.94], dtype=np.float32),
+            "BTCUSDT_number_of_trades": np.array([1207, 1184], dtype=np.int32),
+        }
+    )
+
+    output = compact_dataloader.process_missing_intervals(input_data)
+
+    assert output["open_timestamp"].dtype == np.int64
+    assert output["BTCUSDT_open"].dtype == np.float32
+    assert output["BTCUSDT_number_of_trades"].dtype == np.int32
+    assert output["BTCUSDT_number_of_trades"].tolist() == [
+        1207,
+        1207,
+        1207,
+        1184,
+    ]
+    assert output["service_down"].tolist() == [False, True, True, False]
+
+
+@pytest.mark.unit
+def test_memory_report():
+    data = pd.DataFrame(
+        {
+            "small": np.zeros(10, dtype=np.float32),
+            "large": np.zeros(10, dtype=np.float64),
+        }
+    )
+
+    report = BinanceDataLoader.memory_report(data)
+
+    assert report.index.tolist() == ["large", "small"]
+    assert report["bytes"].tolist() == [80, 40]
+    assert report["dtype"].tolist() == ["float64", "float32"]
+
+
+@pytest.mark.unit
+def test_validate_monthly_interval(fake_dataloader, monkeypatch):
+    monkeypatch.setitem(
+        fake_dataloader.exchange_client.interval_mapping,
+        enums.KLINE_INTERVAL_1MONTH,
+        "1M",
+    )
+    with pytest.raises(AssertionError, match="no fixed length"):
+        monkeypatch.setattr(
+            fake_dataloader, "interval", enums.KLINE_INTERVAL_1MONTH
+        )
+        fake_dataloader.validate()
+
+
+@pytest.mark.unit
+def test_interval_ms_weekly(fake_dataloader, monkeypatch):
+    monkeypatch.setitem(
+        fake_dataloader.exchange_client.interval_mapping,
+        enums.KLINE_INTERVAL_1WEEK,
+        "1w",
+    )
+    monkeypatch.setattr(
+        fake_dataloader, "interval", enums.KLINE_INTERVAL_1WEEK
+    )
+    fake_dataloader.validate()
+    assert fake_dataloader.interval_ms == 7 * 24 * 60 * 60 * 1000
@@ -0,0 +1,199 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+from binance import enums
+
+from clients.exchange import BinanceClient, KlineReplayServer
+from clients.exchange.abstract import ExchangeClient
+from src.dataloaders.exchange import BinanceDataLoader
+from src.features.feature_generators.technical_indicators import EMA
+from src.features.feature_service import FeatureService
+from tests.fakes import FakeExchangeClient
+
+START = 1614729660000
+MINUTE = 60 * 1000
+
+
+class RecordingFeatureService(FeatureService):
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def add_value(self, data_row, purging=False):
+        self.rows.append(data_row)
+
+
+@pytest.fixture
+def binance_dataloader():
+    return BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC", "ETH"],
+        fiat="USDT",
+        exchange_client=FakeExchangeClient(),
+    )
+
+
+def raw_kline(open_timestamp, price):
+    return [
+        open_timestamp,
+        f"{price:.8f}",
+        f"{price + 1:.8f}",
+        f"{price - 1:.8f}",
+        f"{price + 0.5:.8f}",
+        "10.00000000",
+        open_timestamp + MINUTE - 1,
+        "100.00000000",
+        7,
+        "5.00000000",
+        "50.00000000",
+        "0",
+    ]
+
+
+@pytest.fixture
+def candles(binance_dataloader):
+    data = []
+    for i, symbol in enumerate(binance_dataloader.symbols):
+        klines = [raw_kline(START + j * MINUTE, 100 * i + j) for j in range(6)]
+        data_for_symbol = binance_dataloader.read_raw_input_data(klines)
+        data_for_symbol["symbol"] = symbol
+        data.append(data_for_symbol)
+    data = binance_dataloader.pivot_price_data(pd.concat(data))
+    return binance_dataloader.process_missing_intervals(data)
+
+
+def kline_event(symbol, open_timestamp, price, closed=True):
+    kline = raw_kline(open_timestamp, price)
+    return json.dumps(
+        {
+            "e": "kline",
+            "E": open_timestamp + MINUTE,
+            "s": symbol,
+            "k": {
+                "t": kline[0],
+                "T": kline[6],
+                "s": symbol,
+                "i": "1m",
+                "o": kline[1],
+                "c": kline[4],
+                "h": kline[2],
+                "l": kline[3],
+                "v": kline[5],
+                "n": kline[8],
+                "x": closed,
+                "q": kline[7],
+                "V": kline[9],
+                "Q": kline[10],
+                "B": "0",
+            },
+        }
+    )
+
+
+async def to_async_iterable(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.unit
+def test_stream_data_replay_matches_loaded_data(binance_dataloader, candles):
+    server = KlineReplayServer(candles, binance_dataloader.symbols)
+    feature_service = RecordingFeatureService()
+
+    asyncio.run(binance_dataloader.stream_data(server, feature_service))
+
+    streamed = pd.DataFrame(feature_service.rows).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        streamed.infer_objects(), candles, check_dtype=False
+    )
+
+
+@pytest.mark.unit
+def test_stream_data_feeds_feature_service(binance_dataloader, candles):
+    feature_service = FeatureService(EMA(input_col="BTCUSDT_close", period=2))
+    feature_service.initialize(candles.iloc[:3])
+    server = KlineReplayServer(candles.iloc[3:], binance_dataloader.symbols)
+
+    asyncio.run(binance_dataloader.stream_data(server, feature_service))
+
+    expected = FeatureService(EMA(input_col="BTCUSDT_close", period=2))
+    expected.initialize(candles)
+    assert feature_service.output_values == expected.output_values
+
+
+@pytest.mark.unit
+def test_stream_data_fills_missing_klines(binance_dataloader):
+    events = [
+        kline_event("BTCUSDT", START, 1.0),
+        kline_event("ETHUSDT", START, 2.0),
+        # Not closed yet, ignored
+        kline_event("BTCUSDT", START + MINUTE, 100.0, closed=False),
+        # ETHUSDT never closes the second interval
+        kline_event("BTCUSDT", START + MINUTE, 3.0),
+        # The third interval is skipped altogether
+        kline_event("ETHUSDT", START + 3 * MINUTE, 4.0),
+        kline_event("BTCUSDT", START + 3 * MINUTE, 5.0),
+    ]
+    feature_service = RecordingFeatureService()
+
+    asyncio.run(
+        binance_dataloader.stream_data(
+            to_async_iterable(events), feature_service
+        )
+    )
+
+    rows = pd.DataFrame(feature_service.rows).reset_index(drop=True)
+    assert rows["time"].tolist() == [
+        pd.Timestamp("2021-03-03 00:01:00"),
+        pd.Timestamp("2021-03-03 00:02:00"),
+        pd.Timestamp("2021-03-03 00:03:00"),
+        pd.Timestamp("2021-03-03 00:04:00"),
+    ]
+    assert rows["BTCUSDT_open"].tolist() == [1.0, 3.0, 3.0, 5.0]
+    assert rows["ETHUSDT_open"].tolist() == [2.0, 2.0, 2.0, 4.0]
+    assert rows["service_down"].tolist() == [False, True, True, False]
+
+
+@pytest.mark.unit
+def test_parse_kline_event():
+    symbol, kline = BinanceClient.parse_kline_event(
+        kline_event("BTCUSDT", START, 1.0)
+    )
+
+    assert symbol == "BTCUSDT"
+    assert kline[:2] == [START, "1.00000000"]
+    assert len(kline) == 12
+
+
+@pytest.mark.unit
+def test_parse_kline_event_not_closed():
+    event = kline_event("BTCUSDT", START, 1.0, closed=False)
+    assert BinanceClient.parse_kline_event(event) is None
+
+
+@pytest.mark.unit
+def test_stream_data_needs_streaming_client():
+    class HistoricExchangeClient(ExchangeClient):
+        def __init__(self):
+            fake = FakeExchangeClient()
+            self.dtypes = fake.dtypes
+            self.interval_mapping = fake.interval_mapping
+
+        def get_historic_prices(self, **kwargs):
+            return []
+
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC"],
+        fiat="USDT",
+        exchange_client=HistoricExchangeClient(),
+    )
+
+    with pytest.raises(AssertionError, match="does not stream"):
+        asyncio.run(
+            dataloader.stream_data(
+                to_async_iterable([]), RecordingFeatureService()
+            )
+        )
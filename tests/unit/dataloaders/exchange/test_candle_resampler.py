@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dataloaders.exchange import CandleResampler
+
+START = pd.Timestamp("2021-03-03 00:03:00")
+
+
+@pytest.fixture
+def candles():
+    # 00:03 to 00:12, so only 00:05-00:09 is a complete 5-minute interval
+    n_rows = 10
+    return pd.DataFrame(
+        {
+            "time": pd.date_range(START, periods=n_rows, freq="1T"),
+            "open_timestamp": START.value // 1_000_000
+            + 60_000 * np.arange(n_rows),
+            "BTCUSDT_open": np.arange(n_rows, dtype=float),
+            "BTCUSDT_high": [5.0, 6, 7, 8, 9, 10, 11, 8, 3, 2],
+            "BTCUSDT_low": [1.0, 2, 3, 4, 0, 6, 7, 8, 9, 10],
+            "BTCUSDT_close": np.arange(n_rows, dtype=float) + 0.5,
+            "BTCUSDT_volume": np.ones(n_rows),
+            "BTCUSDT_number_of_trades": np.arange(n_rows),
+            "service_down": [False] * 5 + [True] + [False] * 4,
+        }
+    )
+
+
+@pytest.mark.unit
+def test_transform(candles):
+    output = CandleResampler("5T").transform(candles)
+
+    expected_output = pd.DataFrame(
+        {
+            "time": [pd.Timestamp("2021-03-03 00:05:00")],
+            "open_timestamp": [1614729900000],
+            "BTCUSDT_open": [2.0],
+            "BTCUSDT_high": [11.0],
+            "BTCUSDT_low": [0.0],
+            "BTCUSDT_close": [6.5],
+            "BTCUSDT_volume": [5.0],
+            "BTCUSDT_number_of_trades": [2 + 3 + 4 + 5 + 6],
+            "service_down": [True],
+        }
+    )
+
+    pd.testing.assert_frame_equal(output, expected_output)
+
+
+@pytest.mark.unit
+def test_add_value_matches_transform(candles):
+    resampler = CandleResampler("5T")
+
+    bars = [resampler.add_value(row) for _, row in candles.iterrows()]
+
+    # Only the last row of the complete interval returns a bar
+    assert [i for i, bar in enumerate(bars) if bar is not None] == [6]
+    pd.testing.assert_frame_equal(
+        pd.DataFrame([bars[6]]).reset_index(drop=True).infer_objects(),
+        resampler.transform(candles),
+    )
+
+
+@pytest.mark.unit
+def test_add_value_feeds_feature_service(candles):
+    class RecordingFeatureService:
+        def __init__(self):
+            self.rows = []
+
+        def add_value(self, data_row, purging=False):
+            self.rows.append(data_row)
+
+    feature_service = RecordingFeatureService()
+    resampler = CandleResampler("2T", feature_service=feature_service)
+
+    for _, row in candles.iterrows():
+        resampler.add_value(row)
+
+    assert [row["BTCUSDT_open"] for row in feature_service.rows] == [
+        1.0,
+        3.0,
+        5.0,
+        7.0,
+    ]
+
+
+@pytest.mark.unit
+def test_validate_invalid_freq():
+    with pytest.raises(AssertionError):
+        CandleResampler("90S")
+
+
+@pytest.mark.unit
+def test_weekly_bars_open_on_monday():
+    # Two weeks of hourly candlesticks from Monday 2021-03-01
+    start = pd.Timestamp("2021-03-01")
+    n_rows = 2 * 7 * 24
+    candles = pd.DataFrame(
+        {
+            "time": pd.date_range(start, periods=n_rows, freq="1H"),
+            "BTCUSDT_open": np.arange(n_rows, dtype=float),
+            "BTCUSDT_volume": np.ones(n_rows),
+        }
+    )
+    resampler = CandleResampler("1w", base_freq="1H")
+
+    output = resampler.transform(candles)
+    bars = [resampler.add_value(row) for _, row in candles.iterrows()]
+
+    assert output["time"].tolist() == [
+        pd.Timestamp("2021-03-01"),
+        pd.Timestamp("2021-03-08"),
+    ]
+    assert output["BTCUSDT_volume"].tolist() == [7 * 24, 7 * 24]
+    assert [bar["time"] for bar in bars if bar is not None] == output[
+        "time"
+    ].tolist()
+
+
+@pytest.mark.unit
+def test_validate_monthly_freq():
+    with pytest.raises(AssertionError, match="no fixed length"):
+        CandleResampler("1M")
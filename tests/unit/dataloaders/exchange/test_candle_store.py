@@ -0,0 +1,174 @@
+import os
+
+import pandas as pd
+import pytest
+from binance import enums
+
+from src.dataloaders.exchange import BinanceDataLoader, CandleStore
+from tests.fakes import FakeExchangeClient
+
+MILLISECONDS_PER_MINUTE = 60 * 1000
+DAY_1 = 1672531200000  # 2023-01-01 00:00:00
+DAY_2 = 1672617600000  # 2023-01-02 00:00:00
+DAY_3 = 1672704000000  # 2023-01-03 00:00:00
+
+
+@pytest.fixture
+def exchange_client():
+    return FakeExchangeClient()
+
+
+@pytest.fixture
+def candle_store(tmp_path, exchange_client):
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC"],
+        fiat="USDT",
+        exchange_client=exchange_client,
+    )
+    return CandleStore(path=str(tmp_path), dataloader=dataloader)
+
+
+@pytest.mark.unit
+def test_partition_timestamps_into_days():
+    start = DAY_1 + 5 * MILLISECONDS_PER_MINUTE
+    end = DAY_3 - MILLISECONDS_PER_MINUTE
+
+    days = CandleStore.partition_timestamps_into_days(start, end)
+
+    assert days == [(DAY_1, DAY_2), (DAY_2, DAY_3)]
+
+
+@pytest.mark.unit
+def test_load_data_writes_partitions(candle_store, tmp_path):
+    data = candle_store.load_data(DAY_1, DAY_3)
+
+    assert len(data) == 2 * 24 * 60
+    assert sorted(candle_store.saved_partitions()) == [
+        "2023-01-01",
+        "2023-01-02",
+    ]
+    # No temporary files are left behind
+    assert sorted(os.listdir(candle_store.dataloader_path)) == [
+        "date=2023-01-01",
+        "date=2023-01-02",
+    ]
+    assert os.path.relpath(candle_store.dataloader_path, tmp_path) == (
+        os.path.join("symbols=BTCUSDT", "interval=1m", "compact=False")
+    )
+
+
+@pytest.mark.unit
+def test_load_data_after_now(candle_store, exchange_client, monkeypatch):
+    monkeypatch.setattr(CandleStore, "now", DAY_2)
+    expected = candle_store.load_data(DAY_1, DAY_2)
+
+    data = candle_store.load_data(DAY_2, DAY_3)
+
+    assert len(data) == 0
+    pd.testing.assert_series_equal(data.dtypes, expected.dtypes)
+
+
+@pytest.mark.unit
+def test_other_dataloader_same_path(candle_store, exchange_client, tmp_path):
+    candle_store.load_data(DAY_1, DAY_2)
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC"],
+        fiat="USDT",
+        exchange_client=exchange_client,
+        compact=True,
+    )
+    other_store = CandleStore(path=str(tmp_path), dataloader=dataloader)
+
+    data = other_store.load_data(DAY_1, DAY_2)
+
+    # The partitions of the first data loader are not read
+    assert other_store.saved_partitions() == ["2023-01-01"]
+    pd.testing.assert_frame_equal(data, dataloader.load_data(DAY_1, DAY_2))
+
+
+@pytest.mark.unit
+def test_load_data_reads_cached_partitions(candle_store, exchange_client):
+    first = candle_store.load_data(DAY_1, DAY_2)
+    n_calls = len(exchange_client.calls)
+
+    second = candle_store.load_data(DAY_1, DAY_2)
+
+    assert len(exchange_client.calls) == n_calls
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.unit
+def test_load_data_fetches_only_missing_days(candle_store, exchange_client):
+    candle_store.load_data(DAY_1, DAY_2)
+    exchange_client.calls.clear()
+
+    data = candle_store.load_data(DAY_1, DAY_3)
+
+    assert exchange_client.calls == [(DAY_2, DAY_3 - 1)]
+    assert data["open_timestamp"].is_monotonic_increasing
+    assert len(data) == 2 * 24 * 60
+
+
+@pytest.mark.unit
+def test_load_data_slices_requested_range(candle_store):
+    start = DAY_1 + 10 * MILLISECONDS_PER_MINUTE
+    end = DAY_1 + 20 * MILLISECONDS_PER_MINUTE
+
+    data = candle_store.load_data(start, end)
+
+    assert data["open_timestamp"].tolist() == list(
+        range(start, end, MILLISECONDS_PER_MINUTE)
+    )
+    # The full day is cached nonetheless
+    assert candle_store.saved_partitions() == ["2023-01-01"]
+
+
+@pytest.mark.unit
+def test_load_data_does_not_cache_partial_days(
+    candle_store, exchange_client, monkeypatch
+):
+    now = DAY_2 + 60 * MILLISECONDS_PER_MINUTE
+    monkeypatch.setattr(CandleStore, "now", now)
+
+    data = candle_store.load_data(DAY_1, DAY_3)
+
+    assert data["open_timestamp"].max() == now - MILLISECONDS_PER_MINUTE
+    assert candle_store.saved_partitions() == ["2023-01-01"]
+
+
+@pytest.mark.unit
+def test_load_data_fills_gaps_across_days(tmp_path):
+    gap_start = DAY_2 - 2 * MILLISECONDS_PER_MINUTE
+    gap_end = DAY_2 + 2 * MILLISECONDS_PER_MINUTE
+
+    class GapExchangeClient(FakeExchangeClient):
+        def get_historic_prices(self, symbol, interval, start, end):
+            return [
+                kline
+                for kline in super().get_historic_prices(
+                    symbol, interval, start, end
+                )
+                if not gap_start <= kline[0] < gap_end
+            ]
+
+    dataloader = BinanceDataLoader(
+        interval=enums.KLINE_INTERVAL_1MINUTE,
+        assets=["BTC"],
+        fiat="USDT",
+        exchange_client=GapExchangeClient(),
+    )
+    candle_store = CandleStore(path=str(tmp_path), dataloader=dataloader)
+
+    expected = dataloader.load_data(DAY_1, DAY_3)
+    fetched = candle_store.load_data(DAY_1, DAY_3)
+    cached = candle_store.load_data(DAY_1, DAY_3)
+
+    assert len(expected) == 2 * 24 * 60
+    assert expected["service_down"].sum() == 4
+    # The prices of the fake client depend on the requested range, the
+    # intervals do not
+    cols = ["time", "open_timestamp", "service_down"]
+    pd.testing.assert_frame_equal(fetched[cols], expected[cols])
+    pd.testing.assert_frame_equal(cached, fetched)
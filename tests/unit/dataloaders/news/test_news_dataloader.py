@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from clients.news.abstract import NewsClient
+from src.dataloaders.news import MediaStackNewsScraper
+
+DAY_1 = 1672531200000  # 2023-01-01 00:00:00
+DAY_4 = 1672790400000  # 2023-01-04 00:00:00
+
+
+class FakeNewsClient(NewsClient):
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_data(self, date, keywords, limit, language, sort_by):
+        with self.lock:
+            self.calls.append(date)
+        return [
+            {"title": f"{keyword} on {date}", "published_at": date}
+            for keyword in keywords
+        ]
+
+
+@pytest.fixture
+def news_client():
+    return FakeNewsClient()
+
+
+def get_scraper(news_client, **kwargs):
+    return MediaStackNewsScraper(
+        keywords=["bitcoin", "ethereum"], news_client=news_client, **kwargs
+    )
+
+
+@pytest.mark.unit
+def test_load_data_concurrent(news_client):
+    serial = get_scraper(news_client).load_data(DAY_1, DAY_4)
+    concurrent = get_scraper(news_client, max_workers=3).load_data(
+        DAY_1, DAY_4
+    )
+
+    assert concurrent == serial
+    assert [article["published_at"] for article in serial[::2]] == [
+        "2023-01-01",
+        "2023-01-02",
+        "2023-01-03",
+        "2023-01-04",
+    ]
+
+
+@pytest.mark.unit
+def test_max_workers_must_be_positive(news_client):
+    with pytest.raises(AssertionError):
+        get_scraper(news_client, max_workers=0)
+
+
+@pytest.mark.unit
+def test_cache_skips_network_on_rerun(tmp_path, news_client):
+    scraper = get_scraper(news_client, cache_path=str(tmp_path), max_workers=2)
+
+    first = scraper.load_data(DAY_1, DAY_4)
+    n_calls = len(news_client.calls)
+    second = scraper.load_data(DAY_1, DAY_4)
+
+    assert n_calls == 4
+    assert len(news_client.calls) == n_calls
+    assert second == first
+
+
+@pytest.mark.unit
+def test_cache_is_keyed_by_query(tmp_path, news_client):
+    get_scraper(news_client, cache_path=str(tmp_path)).load_data(DAY_1, DAY_1)
+    scraper = get_scraper(
+        news_client, cache_path=str(tmp_path), sort_by="published_desc"
+    )
+
+    scraper.load_data(DAY_1, DAY_1)
+
+    assert news_client.calls == ["2023-01-01", "2023-01-01"]
+
+
+@pytest.mark.unit
+def test_cache_skips_current_day(tmp_path, news_client):
+    scraper = get_scraper(news_client, cache_path=str(tmp_path))
+    today = scraper.now
+
+    scraper.load_data(today, today)
+    scraper.load_data(today, today)
+
+    assert len(news_client.calls) == 2
+    assert not any(tmp_path.iterdir())
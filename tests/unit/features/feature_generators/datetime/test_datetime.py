@@ -1,6 +1,4 @@
-from datetime import datetime
-from unittest.mock import patch
-
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -78,11 +76,23 @@ def test_output_values(sample_data):
     output_values = dt.output_values
 
     expected_output_values = {
+        "day_of_week__1": [0.0, 0.0, 0.0, 0.0, 1.0],
+        "day_of_week__2": [0.0, 0.0, 0.0, 0.0, 0.0],
+        "day_of_week__3": [0.0, 0.0, 0.0, 0.0, 0.0],
+        "day_of_week__4": [0.0, 0.0, 0.0, 0.0, 0.0],
         "day_of_week__5": [0.0, 1.0, 1.0, 1.0, 0.0],
         "day_of_week__6": [1.0, 0.0, 0.0, 0.0, 0.0],
+        "month__2": [0.0, 0.0, 0.0, 0.0, 0.0],
+        "month__3": [0.0, 0.0, 0.0, 0.0, 0.0],
         "month__4": [0.0, 0.0, 1.0, 0.0, 0.0],
+        "month__5": [0.0, 0.0, 0.0, 0.0, 0.0],
+        "month__6": [0.0, 0.0, 0.0, 0.0, 0.0],
+        "month__7": [0.0, 0.0, 0.0, 0.0, 0.0],
         "month__8": [1.0, 0.0, 0.0, 0.0, 0.0],
+        "month__9": [0.0, 0.0, 0.0, 0.0, 0.0],
+        "month__10": [0.0, 0.0, 0.0, 0.0, 0.0],
         "month__11": [0.0, 0.0, 0.0, 1.0, 0.0],
+        "month__12": [0.0, 0.0, 0.0, 0.0, 0.0],
         "quarter__2": [0.0, 0.0, 1.0, 0.0, 0.0],
         "quarter__3": [1.0, 0.0, 0.0, 0.0, 0.0],
         "quarter__4": [0.0, 0.0, 0.0, 1.0, 0.0],
@@ -95,30 +105,55 @@ def test_output_values(sample_data):
 
 
 @pytest.mark.unit
-def test_to_one_hot_one_unique():
-    data = [0, 0, 0, 0, 0]
-    expected_result = {
-        # All 1s
-        "prefix__0": [1.0, 1.0, 1.0, 1.0, 1.0],
-    }
+def test_same_columns_whatever_the_data(sample_data):
+    timestamp_col = "timestamp"
+    dt_all = DateTime(timestamp_col)
+    dt_all.initialize(pd.DataFrame({timestamp_col: sample_data}))
+    dt_one = DateTime(timestamp_col)
+    dt_one.initialize(pd.DataFrame({timestamp_col: sample_data[:1]}))
 
-    result = DateTime.to_one_hot(data, "prefix_")
+    assert list(dt_one.output_values) == list(dt_all.output_values)
+    assert dt_one.output_names == dt_all.output_names
+    assert len(dt_one.latest_values()) == len(dt_all.output_names)
 
-    assert result == expected_result
+
+@pytest.mark.unit
+def test_categories_match_pandas():
+    timestamps = np.arange(0, 2_000_000_000_000, 3_599_999_937)
+    datetimes = pd.to_datetime(timestamps, unit="ms")
+
+    categories = DateTime.categories(timestamps)
+
+    np.testing.assert_array_equal(
+        categories["day_of_week_"], datetimes.dayofweek
+    )
+    np.testing.assert_array_equal(categories["month_"] + 1, datetimes.month)
+    np.testing.assert_array_equal(
+        categories["quarter_"] + 1, datetimes.quarter
+    )
+    time_of_day = DateTime.CATEGORIES["time_of_day_"]
+    assert [time_of_day[i] for i in categories["time_of_day_"]] == [
+        DateTime.time_of_day(hour) for hour in datetimes.hour
+    ]
 
 
 @pytest.mark.unit
-def test_to_one_hot_more_than_one_unique():
-    data = [1, 2, 1, 3, 1, 2]
-    expected_result = {
-        # First column is dropped
-        "prefix__2": [0.0, 1.0, 0.0, 0.0, 0.0, 1.0],
-        "prefix__3": [0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
-    }
+def test_add_value_purging(sample_data, sample_data_later):
+    timestamp_col = "timestamp"
+    data = pd.DataFrame({timestamp_col: sample_data})
 
-    result = DateTime.to_one_hot(data, "prefix_")
+    dt = DateTime(timestamp_col, capacity=len(sample_data))
+    dt.initialize(data)
+    dt.add_value(pd.Series({timestamp_col: sample_data_later}), True)
 
-    assert result == expected_result
+    expected = DateTime(timestamp_col)
+    expected.initialize(
+        pd.DataFrame({timestamp_col: sample_data[1:] + sample_data_later})
+    )
+    assert dt.timestamps.capacity == len(sample_data)
+    assert dt.n_rows == len(sample_data)
+    assert dt.output_values == expected.output_values
+    assert dt.latest_values() == expected.latest_values()
 
 
 @pytest.mark.unit
@@ -127,3 +162,22 @@ def test_time_of_day():
     assert DateTime.time_of_day(12) == "afternoon"
     assert DateTime.time_of_day(18) == "evening"
     assert DateTime.time_of_day(0) == "night"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("purging", [False, True])
+def test_add_values_matches_add_value(sample_data, purging):
+    timestamp_col = "timestamp"
+    history = pd.DataFrame({timestamp_col: sample_data[:2]})
+    new_rows = pd.DataFrame({timestamp_col: sample_data[2:]})
+    dt = DateTime(timestamp_col)
+    dt.initialize(history)
+    expected = DateTime(timestamp_col)
+    expected.initialize(history)
+
+    dt.add_values(new_rows, purging)
+    for _, row in new_rows.iterrows():
+        expected.add_value(row, purging)
+
+    pd.testing.assert_series_equal(dt.time_series, expected.time_series)
+    assert dt.output_values == expected.output_values
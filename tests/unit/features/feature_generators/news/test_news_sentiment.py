@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.feature_generators.news import NewsSentiment
+from tests.fakes import FakeEncoder
+
+START = 1672531200000  # 2023-01-01 00:00:00
+MILLISECONDS_PER_MINUTE = 60 * 1000
+
+
+@pytest.fixture
+def candles():
+    return pd.DataFrame(
+        {
+            "open_timestamp": [
+                START + i * MILLISECONDS_PER_MINUTE for i in range(4)
+            ]
+        }
+    )
+
+
+@pytest.fixture
+def articles():
+    return [
+        {"title": "a", "published_at": "2022-12-31T23:59:30+00:00"},
+        {"title": "bb", "published_at": "2023-01-01T00:00:00+00:00"},
+        {"title": "bb", "published_at": "2023-01-01T00:00:59+00:00"},
+        {"title": "dddd", "published_at": "2023-01-01T00:02:10+00:00"},
+        {"title": "eeeee", "published_at": "2023-01-01T00:05:00+00:00"},
+    ]
+
+
+def get_generator(**kwargs):
+    return NewsSentiment(
+        encoder=FakeEncoder(), decay=0.5, text_fields=("title",), **kwargs
+    )
+
+
+@pytest.mark.unit
+def test_output_values(candles, articles):
+    generator = get_generator()
+    generator.add_articles(articles)
+    generator.initialize(candles)
+
+    sums = [0.5 * 1 + 2 + 2, 0.5 * 4.5, 0.25 * 4.5 + 4, 0.5 * 5.125]
+    counts = [0.5 + 2, 1.25, 1.625, 0.8125]
+    assert generator.output_values["count"] == counts
+    assert generator.output_values["score"] == pytest.approx(
+        [s / c for s, c in zip(sums, counts)]
+    )
+    # The article from the future is kept for later
+    assert generator.pending_timestamps.tolist() == [
+        START + 5 * MILLISECONDS_PER_MINUTE
+    ]
+
+
+@pytest.mark.unit
+def test_add_value_matches_initialize(candles, articles):
+    expected = get_generator()
+    expected.add_articles(articles)
+    expected.initialize(candles)
+
+    generator = get_generator()
+    generator.add_articles(articles)
+    generator.initialize(candles.iloc[:1])
+    for _, row in candles.iloc[1:].iterrows():
+        generator.add_value(row)
+
+    assert generator.output_values["count"] == pytest.approx(
+        expected.output_values["count"]
+    )
+    assert generator.output_values["score"] == pytest.approx(
+        expected.output_values["score"]
+    )
+
+
+@pytest.mark.unit
+def test_add_value_purging(candles, articles):
+    generator = get_generator()
+    generator.add_articles(articles)
+    generator.initialize(candles)
+
+    generator.add_value(
+        pd.Series({"open_timestamp": START + 4 * MILLISECONDS_PER_MINUTE}),
+        purging=True,
+    )
+
+    assert len(generator.output_values["count"]) == 4
+    assert generator.output_values["count"][-1] == 0.5 * 0.8125
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("purging", [False, True])
+def test_add_values_matches_add_value(candles, articles, purging):
+    new_candles = pd.DataFrame(
+        {
+            "open_timestamp": [
+                START + i * MILLISECONDS_PER_MINUTE for i in range(1, 7)
+            ]
+        }
+    )
+    expected = get_generator()
+    expected.add_articles(articles)
+    expected.initialize(candles.iloc[:1])
+    for _, row in new_candles.iterrows():
+        expected.add_value(row, purging)
+
+    generator = get_generator()
+    generator.add_articles(articles)
+    generator.initialize(candles.iloc[:1])
+    generator.add_values(new_candles, purging)
+
+    assert generator.n_rows == expected.n_rows
+    for key, values in expected.output_values.items():
+        assert generator.output_values[key] == pytest.approx(values)
+    assert len(generator.pending_timestamps) == 0
+
+
+@pytest.mark.unit
+def test_texts_are_encoded_once(tmp_path, articles):
+    generator = get_generator(cache_path=str(tmp_path))
+    generator.add_articles(articles)
+    generator.add_articles(articles)
+
+    rerun = get_generator(cache_path=str(tmp_path))
+    rerun.add_articles(articles)
+
+    assert sorted(generator.encoder.texts) == ["a", "bb", "dddd", "eeeee"]
+    assert rerun.encoder.texts == []
+    np.testing.assert_array_equal(
+        rerun.pending_vectors, generator.pending_vectors[:5]
+    )
+
+
+@pytest.mark.unit
+def test_no_articles(candles):
+    generator = get_generator()
+    generator.initialize(candles)
+
+    assert generator.output_values == {
+        "score": [0.0] * 4,
+        "count": [0.0] * 4,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("add_values", [False, True])
+def test_initialize_empty(candles, articles, add_values):
+    expected = get_generator()
+    expected.add_articles(articles)
+    expected.initialize(candles)
+
+    generator = get_generator()
+    generator.add_articles(articles)
+    generator.initialize(candles.iloc[:0])
+    assert generator.n_rows == 0
+    assert generator.output_values == {"score": [], "count": []}
+    if add_values:
+        generator.add_values(candles)
+    else:
+        for _, row in candles.iterrows():
+            generator.add_value(row)
+
+    for key, values in expected.output_values.items():
+        assert generator.output_values[key] == pytest.approx(values)
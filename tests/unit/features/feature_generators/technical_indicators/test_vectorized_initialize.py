@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talipp.indicators as talipp
+
+from src.features.feature_generators.technical_indicators import (
+    ATR,
+    BB,
+    BBP,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+    VWAP,
+)
+from src.features.feature_generators.technical_indicators.kernels import (
+    ComputationGraph,
+)
+
+TALIPP = {
+    "EMA": lambda: talipp.EMA(period=10),
+    "SMA": lambda: talipp.SMA(period=10),
+    "RSI": lambda: talipp.RSI(period=14),
+    "MACD": lambda: talipp.MACD(
+        fast_period=12, slow_period=26, signal_period=9
+    ),
+    "BB": lambda: talipp.BB(period=20, std_dev_multiplier=2),
+    "BBP": lambda: talipp.BB(period=20, std_dev_multiplier=2),
+    "ATR": lambda: talipp.ATR(period=14),
+    "OBV": lambda: talipp.OBV(),
+    "VWAP": lambda: talipp.VWAP(),
+}
+
+GENERATORS = {
+    "EMA": lambda: EMA(input_col="close", period=10),
+    "SMA": lambda: SMA(input_col="close", period=10),
+    "RSI": lambda: RSI(input_col="close", period=14),
+    "MACD": lambda: MACD(input_col="close"),
+    "BB": lambda: BB(input_col="close", period=20),
+    "BBP": lambda: BBP(input_col="close", period=20),
+    "ATR": lambda: ATR(high_col="high", low_col="low", close_col="close"),
+    "OBV": lambda: OBV(close_col="close", volume_col="volume"),
+    "VWAP": lambda: VWAP(
+        high_col="high",
+        low_col="low",
+        close_col="close",
+        volume_col="volume",
+    ),
+}
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(42)
+    close = 100 + rng.normal(size=300).cumsum()
+    # Repeated prices, as in quiet markets
+    close[100:110] = close[100]
+    return pd.DataFrame(
+        {
+            "high": close + rng.uniform(0, 1, size=300),
+            "low": close - rng.uniform(0, 1, size=300),
+            "close": close,
+            "volume": rng.uniform(0, 10, size=300).round(1),
+        }
+    )
+
+
+def incrementally_initialized(generator, data):
+    """How `initialize` used to work: one value at a time through talipp."""
+    generator.initialize(data.iloc[:0])
+    for _, row in data.iterrows():
+        generator.add_value(row)
+    return generator
+
+
+def as_dict(output_values):
+    if isinstance(output_values, dict):
+        return output_values
+    return {"": output_values}
+
+
+def assert_same_outputs(generator, expected):
+    outputs = as_dict(generator.output_values)
+    expected_outputs = as_dict(expected.output_values)
+    assert outputs.keys() == expected_outputs.keys()
+    for key, values in outputs.items():
+        np.testing.assert_array_equal(
+            np.array(values, dtype=float),
+            np.array(expected_outputs[key], dtype=float),
+            err_msg=key,
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", GENERATORS)
+def test_same_outputs_as_talipp(sample_data, name):
+    generator = GENERATORS[name]()
+    generator.initialize(sample_data)
+
+    expected = incrementally_initialized(GENERATORS[name](), sample_data)
+
+    assert_same_outputs(generator, expected)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", GENERATORS)
+def test_add_value_continues_from_initialize(sample_data, name):
+    history, new_rows = sample_data.iloc[:250], sample_data.iloc[250:]
+    generator = GENERATORS[name]()
+    generator.initialize(history)
+    expected = incrementally_initialized(GENERATORS[name](), history)
+
+    for _, row in new_rows.iterrows():
+        generator.add_value(row, purging=True)
+        expected.add_value(row, purging=True)
+
+    assert_same_outputs(generator, expected)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", GENERATORS)
+def test_shorter_than_period(sample_data, name):
+    generator = GENERATORS[name]()
+    generator.initialize(sample_data.iloc[:5])
+
+    expected = incrementally_initialized(
+        GENERATORS[name](), sample_data.iloc[:5]
+    )
+
+    assert_same_outputs(generator, expected)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", GENERATORS)
+def test_kernel_calls(sample_data, name):
+    generator = GENERATORS[name]()
+    graph = ComputationGraph(sample_data)
+    generator.initialize(graph)
+
+    expected = GENERATORS[name]()
+    expected.initialize(sample_data)
+
+    # Only the declared kernel calls are made, once each
+    assert graph.n_calls == len(generator.kernel_calls)
+    assert set(graph.results) == set(generator.kernel_calls.values())
+    assert_same_outputs(generator, expected)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", GENERATORS)
+def test_purging_matches_talipp(sample_data, name):
+    history, new_rows = sample_data.iloc[:100], sample_data.iloc[100:250]
+    generator = GENERATORS[name]()
+    generator.initialize(history)
+    # talipp on the whole history
+    talipp = TALIPP[name]()
+    for _, row in history.iterrows():
+        talipp.add_input_value(generator.talipp_input(row))
+
+    for i, (_, row) in enumerate(new_rows.iterrows()):
+        generator.add_value(row, purging=True)
+        talipp.add_input_value(generator.talipp_input(row))
+        talipp.purge_oldest(1)
+        if i in (0, 98, 99, 149):
+            input_values = talipp.input_values[
+                len(talipp.input_values) - len(talipp.output_values) :
+            ]
+            np.testing.assert_array_equal(
+                generator.outputs.to_array(),
+                np.array(
+                    [
+                        generator.output_row(value, input_value)
+                        for value, input_value in zip(
+                            talipp.output_values, input_values
+                        )
+                    ],
+                    dtype=float,
+                ).reshape(-1, *generator.outputs.buffer.shape[1:]),
+            )
+            assert generator.n_rows == len(talipp.input_values)
+
+    # Only the last rows are kept in talipp
+    assert (
+        len(generator.talipp_instance.input_values)
+        < 2 * generator.talipp_window
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", GENERATORS)
+def test_initialize_after_purging(sample_data, name):
+    generator = GENERATORS[name]()
+    generator.initialize(sample_data.iloc[:100])
+    for _, row in sample_data.iloc[100:160].iterrows():
+        generator.add_value(row, purging=True)
+
+    generator.initialize(sample_data)
+    expected = GENERATORS[name]()
+    expected.initialize(sample_data)
+
+    assert generator.n_rows == expected.n_rows == len(sample_data)
+    assert_same_outputs(generator, expected)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("purging", [False, True])
+@pytest.mark.parametrize("n_history", [5, 100])
+@pytest.mark.parametrize("name", GENERATORS)
+def test_add_values_matches_add_value(sample_data, name, n_history, purging):
+    history = sample_data.iloc[:n_history]
+    generator = GENERATORS[name]()
+    generator.initialize(history)
+    expected = GENERATORS[name]()
+    expected.initialize(history)
+
+    generator.add_values(sample_data.iloc[n_history:250], purging)
+    for _, row in sample_data.iloc[n_history:250].iterrows():
+        expected.add_value(row, purging)
+    assert_same_outputs(generator, expected)
+    assert generator.n_rows == expected.n_rows
+
+    # Both go on from the same state
+    generator.add_values(sample_data.iloc[250:], purging)
+    for _, row in sample_data.iloc[250:].iterrows():
+        expected.add_value(row, purging)
+    assert_same_outputs(generator, expected)
+    assert generator.latest_values() == expected.latest_values()
@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.feature_cache import FeatureCache
+from src.features.feature_generators.datetime import DateTime
+from src.features.feature_generators.technical_indicators import (
+    ATR,
+    BB,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    VWAP,
+)
+from src.features.feature_service import FeatureService
+
+START = 1675209600000  # 2023-02-01 00:00:00
+MILLISECONDS_PER_HOUR = 60 * 60 * 1000
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(42)
+    n_rows = 700
+    close = 100 + rng.normal(size=n_rows).cumsum()
+    return pd.DataFrame(
+        {
+            "open_timestamp": START
+            + MILLISECONDS_PER_HOUR * np.arange(n_rows),
+            "high": close + rng.uniform(0, 1, size=n_rows),
+            "low": close - rng.uniform(0, 1, size=n_rows),
+            "close": close,
+            "volume": rng.uniform(0, 10, size=n_rows),
+        }
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeatureCache(path=str(tmp_path), max_new_rows=200)
+
+
+def build_feature_service(cache=None, ema_period=10):
+    return FeatureService(
+        EMA(input_col="close", period=ema_period),
+        MACD(input_col="close"),
+        BB(input_col="close"),
+        RSI(input_col="close"),
+        ATR(high_col="high", low_col="low", close_col="close"),
+        VWAP(
+            high_col="high",
+            low_col="low",
+            close_col="close",
+            volume_col="volume",
+        ),
+        DateTime(timestamp_col="open_timestamp"),
+        cache=cache,
+    )
+
+
+def assert_initialized_on(feature_service, data):
+    expected = build_feature_service(
+        ema_period=feature_service.feature_generators[0].period
+    )
+    expected.initialize(data)
+    np.testing.assert_equal(
+        feature_service.output_values, expected.output_values
+    )
+
+
+def counts(cache):
+    return cache.n_hits, cache.n_extended, cache.n_misses
+
+
+@pytest.mark.unit
+def test_same_data(sample_data, cache):
+    build_feature_service(cache).initialize(sample_data)
+    assert counts(cache) == (0, 0, 7)
+
+    feature_service = build_feature_service(cache)
+    feature_service.initialize(sample_data)
+
+    assert counts(cache) == (7, 0, 7)
+    assert_initialized_on(feature_service, sample_data)
+
+
+@pytest.mark.unit
+def test_continues_after_loading(sample_data, cache):
+    history, new_rows = sample_data.iloc[:600], sample_data.iloc[600:]
+    build_feature_service(cache).initialize(history)
+    feature_service = build_feature_service(cache)
+    feature_service.initialize(history)
+    expected = build_feature_service()
+    expected.initialize(history)
+
+    for i in range(len(new_rows)):
+        feature_service.add_value(new_rows.iloc[i], purging=True)
+        expected.add_value(new_rows.iloc[i], purging=True)
+
+    assert counts(cache) == (7, 0, 7)
+    np.testing.assert_equal(
+        feature_service.output_values, expected.output_values
+    )
+
+
+@pytest.mark.unit
+def test_changed_parameters(sample_data, cache):
+    build_feature_service(cache).initialize(sample_data)
+
+    feature_service = build_feature_service(cache, ema_period=20)
+    feature_service.initialize(sample_data)
+
+    # Only the EMA is initialized again
+    assert counts(cache) == (6, 0, 8)
+    assert_initialized_on(feature_service, sample_data)
+
+
+@pytest.mark.unit
+def test_changed_data(sample_data, cache):
+    build_feature_service(cache).initialize(sample_data)
+    sample_data.loc[300, "close"] += 1.0
+
+    feature_service = build_feature_service(cache)
+    feature_service.initialize(sample_data)
+
+    # Only DateTime does not depend on the close
+    assert counts(cache) == (1, 0, 13)
+    assert_initialized_on(feature_service, sample_data)
+
+
+@pytest.mark.unit
+def test_new_rows(sample_data, cache):
+    build_feature_service(cache).initialize(sample_data.iloc[:600])
+
+    feature_service = build_feature_service(cache)
+    feature_service.initialize(sample_data)
+
+    assert counts(cache) == (0, 7, 7)
+    assert_initialized_on(feature_service, sample_data)
+    # The extended states replaced the entries
+    for feature_generator in feature_service.feature_generators:
+        assert [
+            file_name.split("-")[0]
+            for file_name in os.listdir(cache.directory(feature_generator))
+        ] == ["700"]
+
+    build_feature_service(cache).initialize(sample_data)
+
+    assert counts(cache) == (7, 7, 7)
+
+
+@pytest.mark.unit
+def test_too_many_new_rows(sample_data, cache):
+    build_feature_service(cache).initialize(sample_data.iloc[:400])
+
+    build_feature_service(cache).initialize(sample_data)
+
+    assert counts(cache) == (0, 0, 14)
+
+
+@pytest.mark.unit
+def test_same_name_other_columns(sample_data, cache):
+    def build_feature_service():
+        return FeatureService(
+            OBV(close_col="close", volume_col="volume"),
+            OBV(close_col="close", volume_col="high"),
+            cache=cache,
+        )
+
+    build_feature_service().initialize(sample_data)
+    feature_service = build_feature_service()
+    feature_service.initialize(sample_data)
+
+    # Neither replaced the entry of the other
+    assert counts(cache) == (2, 0, 2)
+    volume_obv, high_obv = feature_service.feature_generators
+    assert volume_obv.output_values != high_obv.output_values
@@ -0,0 +1,277 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.feature_generators.abstract import FeatureGenerator
+from src.features.feature_generators.datetime import DateTime
+from src.features.feature_generators.news import NewsSentiment
+from src.features.feature_generators.technical_indicators import (
+    ATR,
+    BB,
+    BBP,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+    VWAP,
+)
+from src.features.feature_service import FeatureService
+from tests.fakes import FakeEncoder
+
+START = 1675209600000  # 2023-02-01 00:00:00
+MILLISECONDS_PER_HOUR = 60 * 60 * 1000
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(42)
+    n_rows = 700
+    close = 100 + rng.normal(size=n_rows).cumsum()
+    return pd.DataFrame(
+        {
+            # Hourly, so that the months change within the data
+            "open_timestamp": START
+            + MILLISECONDS_PER_HOUR * np.arange(n_rows),
+            "high": close + rng.uniform(0, 1, size=n_rows),
+            "low": close - rng.uniform(0, 1, size=n_rows),
+            "close": close,
+            "volume": rng.uniform(0, 10, size=n_rows),
+        }
+    )
+
+
+def build_feature_service(max_workers=1):
+    news = NewsSentiment(
+        interval_ms=MILLISECONDS_PER_HOUR, decay=0.5, encoder=FakeEncoder()
+    )
+    news.add_articles(
+        [
+            {"title": "Up", "published_at": "2023-02-01T05:00:00+00:00"},
+            {"title": "Down", "published_at": "2023-03-01T12:30:00+00:00"},
+        ]
+    )
+    return FeatureService(
+        EMA(input_col="close", period=10),
+        SMA(input_col="close", period=10),
+        RSI(input_col="close"),
+        MACD(input_col="close"),
+        BB(input_col="close"),
+        BBP(input_col="close", period=20),
+        ATR(high_col="high", low_col="low", close_col="close"),
+        OBV(close_col="close", volume_col="volume"),
+        VWAP(
+            high_col="high",
+            low_col="low",
+            close_col="close",
+            volume_col="volume",
+        ),
+        DateTime(timestamp_col="open_timestamp"),
+        news,
+        max_workers=max_workers,
+    )
+
+
+@pytest.fixture
+def feature_service():
+    return build_feature_service()
+
+
+def assert_latest_is_last_row(feature_service):
+    output_values = feature_service.output_values
+    latest = feature_service.latest_values()
+
+    assert feature_service.output_names == list(output_values)
+    np.testing.assert_array_equal(
+        latest,
+        [values[-1] for values in output_values.values()],
+    )
+
+
+@pytest.mark.unit
+def test_latest_values(sample_data, feature_service):
+    feature_service.initialize(sample_data.iloc[:600])
+    assert_latest_is_last_row(feature_service)
+
+    for _, row in sample_data.iloc[600:].iterrows():
+        feature_service.add_value(row, purging=True)
+        assert_latest_is_last_row(feature_service)
+
+
+@pytest.mark.unit
+def test_latest_values_reuses_buffer(sample_data, feature_service):
+    feature_service.initialize(sample_data.iloc[:100])
+    latest = feature_service.latest_values()
+
+    feature_service.add_value(sample_data.iloc[100])
+
+    assert feature_service.latest_values() is latest
+
+
+@pytest.mark.unit
+def test_latest_values_before_warmup(sample_data, feature_service):
+    feature_service.initialize(sample_data.iloc[:5])
+
+    assert_latest_is_last_row(feature_service)
+
+
+def assert_array_is_output_values(feature_service):
+    output_values = feature_service.output_values
+    array = feature_service.to_array()
+
+    assert array.dtype == np.float32
+    assert feature_service.output_names == list(output_values)
+    assert array.shape == (
+        len(output_values[feature_service.output_names[0]]),
+        len(output_values),
+    )
+    for column, values in zip(array.T, output_values.values()):
+        np.testing.assert_array_equal(
+            column, np.array(values, dtype=float).astype(np.float32)
+        )
+
+
+@pytest.mark.unit
+def test_to_array(sample_data, feature_service):
+    feature_service.initialize(sample_data.iloc[:600])
+    assert_array_is_output_values(feature_service)
+
+    for _, row in sample_data.iloc[600:].iterrows():
+        feature_service.add_value(row, purging=True)
+    assert_array_is_output_values(feature_service)
+
+
+@pytest.mark.unit
+def test_to_array_aligns_on_last_row(sample_data):
+    # VWAP has no value while there is no volume yet
+    sample_data.loc[:2, "volume"] = 0.0
+    feature_service = FeatureService(
+        OBV(close_col="close", volume_col="volume"),
+        VWAP(
+            high_col="high",
+            low_col="low",
+            close_col="close",
+            volume_col="volume",
+        ),
+    )
+    feature_service.initialize(sample_data)
+
+    array = feature_service.to_array(dtype=np.float64)
+
+    assert array.shape == (len(sample_data), 2)
+    assert np.isnan(array[:3, 1]).all()
+    np.testing.assert_array_equal(
+        array[3:, 1], feature_service.feature_generators[1].output_values
+    )
+
+
+@pytest.mark.unit
+def test_to_tensor(sample_data, feature_service):
+    torch = pytest.importorskip("torch")
+    feature_service.initialize(sample_data)
+
+    tensor = feature_service.to_tensor()
+
+    assert tensor.dtype == torch.float32
+    np.testing.assert_array_equal(tensor.numpy(), feature_service.to_array())
+
+
+@pytest.mark.unit
+def test_parallel_initialize(sample_data, feature_service):
+    parallel_feature_service = build_feature_service(max_workers=2)
+
+    feature_service.initialize(sample_data.iloc[:600])
+    parallel_feature_service.initialize(sample_data.iloc[:600])
+
+    np.testing.assert_equal(
+        parallel_feature_service.output_values, feature_service.output_values
+    )
+    for _, row in sample_data.iloc[600:].iterrows():
+        feature_service.add_value(row, purging=True)
+        parallel_feature_service.add_value(row, purging=True)
+    np.testing.assert_array_equal(
+        parallel_feature_service.to_array(), feature_service.to_array()
+    )
+
+
+@pytest.mark.unit
+def test_shared_kernel_calls(sample_data):
+    def build_feature_generators():
+        return [
+            EMA(input_col="close", period=12),
+            EMA(input_col="close", period=26),
+            MACD(input_col="close", fast_period=12, slow_period=26),
+            SMA(input_col="close", period=20),
+            BB(input_col="close", period=20),
+            BBP(input_col="close", period=20),
+        ]
+
+    feature_service = FeatureService(*build_feature_generators())
+    feature_service.initialize(sample_data)
+
+    report = feature_service.computation_report()
+    assert report == {
+        "calls": 9,
+        "computed": 4,
+        "removed": 5,
+        "shared": {
+            "ema(close, 12)": 2,
+            "ema(close, 26)": 2,
+            "sma(close, 20)": 3,
+            "std(close, 20)": 2,
+        },
+    }
+    # The same outputs as without sharing
+    for feature_generator, expected in zip(
+        feature_service.feature_generators, build_feature_generators()
+    ):
+        expected.initialize(sample_data)
+        np.testing.assert_equal(
+            feature_generator.output_values, expected.output_values
+        )
+
+
+class RowCount(FeatureGenerator):
+    """Uses the data frame interface beyond its columns."""
+
+    def initialize(self, data):
+        self.values = [float(len(data))] * len(data.iloc[:])
+
+    def add_value(self, data, purging=False):
+        self.values.append(self.values[-1] + 1)
+
+    @property
+    def output_values(self):
+        return self.values
+
+    @property
+    def name(self):
+        return "RowCount"
+
+
+@pytest.mark.unit
+def test_initialize_with_data_frame(sample_data):
+    feature_service = FeatureService(
+        EMA(input_col="close", period=10), RowCount()
+    )
+
+    feature_service.initialize(sample_data)
+
+    assert feature_service.output_values["RowCount"] == [700.0] * 700
+
+
+@pytest.mark.unit
+def test_add_values(sample_data, feature_service):
+    expected = build_feature_service()
+    feature_service.initialize(sample_data.iloc[:400])
+    expected.initialize(sample_data.iloc[:400])
+
+    feature_service.add_values(sample_data.iloc[400:], purging=True)
+    for _, row in sample_data.iloc[400:].iterrows():
+        expected.add_value(row, purging=True)
+
+    np.testing.assert_allclose(
+        feature_service.to_array(dtype=np.float64),
+        expected.to_array(dtype=np.float64),
+        rtol=1e-12,
+    )
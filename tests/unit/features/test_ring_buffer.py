@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.features.ring_buffer import RingBuffer
+
+
+@pytest.fixture
+def ring_buffer():
+    ring_buffer = RingBuffer(4)
+    ring_buffer.extend([1.0, 2.0, 3.0])
+    return ring_buffer
+
+
+@pytest.mark.unit
+def test_wraps_around(ring_buffer):
+    ring_buffer.popleft(2)
+    ring_buffer.extend([4.0, 5.0])
+    ring_buffer.append(6.0)
+
+    assert ring_buffer.capacity == 4
+    assert len(ring_buffer) == 4
+    assert ring_buffer.last() == 6.0
+    np.testing.assert_array_equal(ring_buffer.to_array(), [3.0, 4.0, 5.0, 6.0])
+
+
+@pytest.mark.unit
+def test_grows_when_full(ring_buffer):
+    ring_buffer.popleft()
+    ring_buffer.extend([4.0, 5.0, 6.0, 7.0])
+
+    assert ring_buffer.capacity == 8
+    np.testing.assert_array_equal(
+        ring_buffer.to_array(), [2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    )
+
+
+@pytest.mark.unit
+def test_popleft_more_than_size(ring_buffer):
+    ring_buffer.popleft(5)
+
+    assert len(ring_buffer) == 0
+    assert len(ring_buffer.to_array()) == 0
+
+
+@pytest.mark.unit
+def test_vectors():
+    ring_buffer = RingBuffer(2, shape=(3,))
+    ring_buffer.extend(np.arange(6.0).reshape(2, 3))
+    ring_buffer.popleft()
+    ring_buffer.append(np.array([6.0, 7.0, 8.0]))
+
+    np.testing.assert_array_equal(ring_buffer.last(), [6.0, 7.0, 8.0])
+    np.testing.assert_array_equal(
+        ring_buffer.to_array(), [[3.0, 4.0, 5.0], [6.0, 7.0, 8.0]]
+    )
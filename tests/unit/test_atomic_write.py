@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from src.atomic_write import atomic_write
+
+
+@pytest.mark.unit
+def test_atomic_write(tmp_path):
+    path = os.path.join(tmp_path, "dir", "file.txt")
+
+    with atomic_write(path) as f:
+        f.write(b"data")
+
+    with open(path, "rb") as f:
+        assert f.read() == b"data"
+    assert os.listdir(os.path.dirname(path)) == ["file.txt"]
+
+
+@pytest.mark.unit
+def test_atomic_write_error_keeps_file(tmp_path):
+    path = os.path.join(tmp_path, "file.txt")
+    with open(path, "wb") as f:
+        f.write(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write(b"new")
+            raise RuntimeError()
+
+    with open(path, "rb") as f:
+        assert f.read() == b"old"
+    assert os.listdir(tmp_path) == ["file.txt"]